@@ -3,18 +3,105 @@ FastAPI wrapper for the Disease Prediction ML Service
 Runs as a separate microservice on port 5001
 """
 
-from fastapi import FastAPI, HTTPException
+import time
+
+# Measured before the heavy imports so readiness covers the whole cold start
+IMPORT_STARTED = time.perf_counter()
+
+from anyio import from_thread
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
+import os
+import secrets
 import uvicorn
 
-from symptom_predictor import get_symptoms, predict_disease, get_predictor
+from cooccurrence import MAX_RELATED_LIMIT, RELATED_LIMIT, get_cooccurrence_index
+from hot_reload import ModelReloader, ReloadInProgress
+from inference_pool import InferencePool, PoolSaturated
+from interview import get_interview_engine
+from metrics import (CONTENT_TYPE, REQUEST_BUCKETS, STAGE_BUCKETS, MetricsMiddleware, Registry,
+                     server_timing, stage_breakdown)
+from micro_batcher import MicroBatcher
+from response_cache import Resolution, ResponseCache
+from symptom_predictor import MAX_TOP_K, predict_disease, predict_disease_batch, get_predictor, resolve_request
+
+# Maximum number of patients accepted by POST /predict/batch
+MAX_BATCH_SIZE = int(os.environ.get("ML_MAX_BATCH_SIZE", "256"))
+
+# Uvicorn worker processes; each one loads the model in its lifespan before serving
+API_WORKERS = int(os.environ.get("ML_API_WORKERS", "1"))
+
+# Prediction work runs here so it never blocks the event loop
+inference_pool = InferencePool.from_env()
+
+# Resolved symptom inputs (/predict and /symptoms/related) and serialized predictions
+response_cache = ResponseCache.from_env()
+
+# Milliseconds to load the model and from module import until every
+# startup structure was built and the service was ready
+startup_timings = {}
+
+# Token for the /admin endpoints; they are disabled when it is unset
+ADMIN_TOKEN = os.environ.get("ML_ADMIN_TOKEN")
+
+# Seconds between checks of artifacts/LATEST for a new model; 0 disables watching
+RELOAD_WATCH_SECONDS = float(os.environ.get("ML_RELOAD_WATCH", "0"))
+
+# Prometheus metrics served at /metrics
+metrics = Registry()
+REQUEST_LATENCY = metrics.histogram(
+    "ml_http_request_duration_seconds", "HTTP request latency by method, route and status",
+    REQUEST_BUCKETS, ("method", "route", "status"))
+PREDICT_STAGE_LATENCY = metrics.histogram(
+    "ml_predict_stage_duration_seconds", "Time spent in each stage of /predict",
+    STAGE_BUCKETS, ("stage",))
+PREDICTIONS = metrics.counter(
+    "ml_predictions_total", "Patients scored by /predict and /predict/batch, by outcome", ("outcome",))
+UNRESOLVED_SYMPTOMS = metrics.counter(
+    "ml_unresolved_symptoms_total", "Submitted symptoms that matched no known symptom")
+
+
+def activate_predictor(predictor):
+    """Point process workers and interview sessions at a reloaded predictor before it is swapped in"""
+    inference_pool.restart(predictor.artifact_dir)
+    get_interview_engine().use_predictor(predictor)
+    response_cache.clear()
+
+
+reloader = ModelReloader(on_activate=[activate_predictor])
+
+
+def load_model():
+    """Load the predictor and record how long the model load took"""
+    predictor = get_predictor()
+    startup_timings.setdefault('model_load_ms', round(predictor.load_seconds * 1000, 1))
+    return predictor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pre-load the model (and start process workers) before taking traffic
+    load_model()
+    get_interview_engine().dispatch = run_inference_from_thread
+    get_cooccurrence_index()
+    inference_pool.start()
+    if RELOAD_WATCH_SECONDS > 0:
+        reloader.watch(RELOAD_WATCH_SECONDS)
+    startup_timings.setdefault('import_to_ready_ms', round((time.perf_counter() - IMPORT_STARTED) * 1000, 1))
+    yield
+    reloader.stop()
+    get_interview_engine().dispatch = None
+    inference_pool.shutdown()
+
 
 app = FastAPI(
     title="HeliumDoc Symptom Checker API",
     description="AI-powered disease prediction based on symptoms using Random Forest ML model",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for the mobile app
@@ -26,11 +113,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so request latency includes every other middleware
+app.add_middleware(MetricsMiddleware, histogram=REQUEST_LATENCY)
+
 
 class PredictRequest(BaseModel):
-    symptoms: List[str]
+    symptoms: List[str] = []
+    symptom_indices: Optional[List[int]] = None
     age: Optional[int] = None
     gender: Optional[str] = None
+    top_k: int = 1
+
+
+class BatchPredictRequest(BaseModel):
+    items: List[PredictRequest]
+
+
+class SessionStartRequest(BaseModel):
+    symptoms: List[str] = []
+    symptom_indices: Optional[List[int]] = None
+    top_k: int = 5
+
+
+class SessionAnswerRequest(BaseModel):
+    symptoms: List[str] = []
+    symptom_indices: Optional[List[int]] = None
+    present: bool = True
+
+
+class ReloadRequest(BaseModel):
+    version: Optional[str] = None
+    force: bool = False
 
 
 class SymptomResponse(BaseModel):
@@ -39,67 +152,434 @@ class SymptomResponse(BaseModel):
     index: int
 
 
+class TriageInfo(BaseModel):
+    level: str
+    message: str
+
+
+class DifferentialEntry(BaseModel):
+    disease: str
+    probability: float = Field(description="Percent")
+    severity: str
+    specialist: str
+
+
+class PredictResponse(BaseModel):
+    """Body of a successful /predict response (documentation only; cached bytes are returned as is)"""
+    success: bool
+    disease: Optional[str] = Field(
+        description="Predicted disease; null only when ML_RED_FLAG_SHORTCUT=1 and red_flags is not empty")
+    confidence: Optional[float] = Field(description="Percent; null whenever disease is null")
+    severity: str = Field(description="Disease severity, or 'emergency' when the model was skipped")
+    specialist: str
+    triage: TriageInfo = Field(description="Level 'emergency' whenever red_flags is not empty")
+    description: str
+    precautions: List[str] = Field(description="Empty when the model was skipped")
+    medications: List[str] = Field(description="Empty when the model was skipped")
+    diet: List[str] = Field(description="Empty when the model was skipped")
+    workout: List[str] = Field(description="Empty when the model was skipped")
+    symptom_burden: float
+    red_flags: List[str]
+    model_version: str
+    differential: Optional[List[DifferentialEntry]] = Field(
+        default=None, description="Only when top_k > 1; empty when the model was skipped")
+    matched_symptoms: List[str]
+    invalid_symptoms: List[str]
+    patient_info: dict
+    profile: Optional[dict] = Field(default=None, description="Only with X-Profile: 1")
+
+
+async def run_inference(fn, *args):
+    """Run prediction work on the inference pool, failing fast with 503 when it is saturated"""
+    try:
+        return await inference_pool.run(fn, *args)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Inference capacity exhausted, retry shortly",
+                            headers={"Retry-After": "1"})
+
+
+def run_inference_from_thread(fn, *args):
+    """run_inference for handlers on the server's thread pool, blocking until the result is in"""
+    return from_thread.run(run_inference, fn, *args)
+
+
+async def predict_micro_batch(items):
+    """Predictions for (active indices, top_k) items with one predict_batch call on the pool"""
+    return await run_inference(predict_disease_batch, [None] * len(items),
+                               [active for active, _ in items], [top_k for _, top_k in items])
+
+
+# Coalesces concurrent /predict cache misses into one pool call; None unless
+# ML_MICRO_BATCH_WAIT_MS is set (see micro_batcher.py)
+micro_batcher = MicroBatcher.from_env(predict_micro_batch)
+
+
+def prediction_outcome(result: dict) -> str:
+    if not result['success']:
+        return "no_valid_symptoms"
+    if result['red_flags']:
+        return "red_flag"
+    return "predicted"
+
+
+def record_outcome(outcome: str, invalid_symptoms):
+    """Count a scored patient by outcome, with its unresolved symptoms"""
+    PREDICTIONS.inc(1, outcome)
+    if invalid_symptoms:
+        UNRESOLVED_SYMPTOMS.inc(len(invalid_symptoms))
+
+
+def record_prediction(result: dict):
+    record_outcome(prediction_outcome(result), result['invalid_symptoms'])
+
+
+def collect_service_metrics():
+    """Cache, pool and session figures read from the stats() of each layer at scrape time"""
+    predictor = get_predictor().stats()
+    for name, label in (("symptom_resolution", "Symptom resolution"), ("symptom_search", "Symptom search")):
+        cache = predictor[name]
+        yield (f"ml_{name}_cache_hits_total", "counter", f"{label} cache hits", [({}, cache['hits'])])
+        yield (f"ml_{name}_cache_misses_total", "counter", f"{label} cache misses", [({}, cache['misses'])])
+    lookups = predictor['symptom_resolution']['hits'] + predictor['symptom_resolution']['misses']
+    yield ("ml_symptom_resolution_cache_hit_ratio", "gauge", "Share of symptom lookups served from cache",
+           [({}, predictor['symptom_resolution']['hits'] / lookups if lookups else 0.0)])
+    pattern_cache = predictor['pattern_cache']
+    if pattern_cache:
+        yield ("ml_pattern_cache_lookups_total", "counter", "Feature rows looked up in lookup inference mode",
+               [({"result": "table_hit"}, pattern_cache['table_hits']),
+                ({"result": "lru_hit"}, pattern_cache['lru_hits']),
+                ({"result": "forest"}, pattern_cache['forest_evaluations'])])
+    pool = inference_pool.stats()
+    yield ("ml_inference_in_flight", "gauge", "Prediction calls running or queued on the inference pool",
+           [({}, pool['in_flight'])])
+    yield ("ml_inference_rejected_total", "counter", "Prediction calls rejected with 503 by the inference pool",
+           [({}, pool['rejected'])])
+    yield ("ml_sessions", "gauge", "Live interview sessions", [({}, get_interview_engine().stats()['sessions'])])
+    cache = response_cache.stats()
+    for level, name in (("resolution", "resolutions"), ("response", "responses")):
+        yield (f"ml_{level}_cache_hits_total", "counter", f"/predict {level} cache hits",
+               [({}, cache[name]['hits'])])
+        yield (f"ml_{level}_cache_misses_total", "counter", f"/predict {level} cache misses",
+               [({}, cache[name]['misses'])])
+    yield ("ml_model_info", "gauge", "Model version serving new requests", [({"version": predictor['model_version']}, 1)])
+    yield ("ml_model_reloads_total", "counter", "Model reload attempts by result",
+           [({"result": result}, count) for result, count in reloader.counts.items()])
+
+
+metrics.add_collector(collect_service_metrics)
+
+
 @app.get("/")
-def root():
+async def root():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "service": "HeliumDoc Symptom Checker ML API",
         "model": "Random Forest",
         "diseases_supported": 41,
-        "symptoms_supported": 132
+        "symptoms_supported": 132,
+        "model_version": get_predictor().version,
+        "startup": startup_timings
     }
 
 
+@app.get("/stats")
+async def stats():
+    """Cache hit rates and lookup latency of the inference layers"""
+    result = get_predictor().stats()
+    result['inference_pool'] = inference_pool.stats()
+    result['sessions'] = get_interview_engine().stats()
+    result['related_index'] = get_cooccurrence_index().stats()
+    result['response_cache'] = response_cache.stats()
+    result['micro_batching'] = micro_batcher.stats() if micro_batcher else None
+    return result
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Request and stage latency histograms, prediction counters and cache figures (Prometheus text format)"""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/symptoms", response_model=List[SymptomResponse])
-def list_symptoms():
+async def list_symptoms(if_none_match: Optional[str] = Header(default=None)):
     """Get all available symptoms that the model can recognize"""
-    return get_symptoms()
+    index = get_predictor().symptom_search
+    headers = {"ETag": index.listing_etag, "Cache-Control": "no-cache"}
+    if if_none_match and index.listing_etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=index.listing_json, media_type="application/json", headers=headers)
+
+
+@app.get("/symptoms/search", response_model=List[SymptomResponse])
+async def search_symptoms(q: str):
+    """Search symptoms by prefix, word prefix, substring or a near-miss spelling (best 20)"""
+    return Response(content=get_predictor().symptom_search.search_json(q), media_type="application/json")
+
+
+@app.get("/symptoms/related")
+async def related_symptoms(symptoms: List[str] = Query(default=[]),
+                           symptom_indices: Optional[List[int]] = Query(default=None),
+                           exclude: List[int] = Query(default=[]), limit: int = RELATED_LIMIT):
+    """
+    Symptoms that people with the given symptoms also reported, best first
+    
+    - **symptoms** / **symptom_indices**: The current symptom set (repeat the parameter per symptom)
+    - **exclude**: Symptom indices to leave out, e.g. ones the patient already denied
+    - **limit**: Number of suggestions (default 10)
+    
+    Each suggestion has a `score` (estimated share of patients with all the given
+    symptoms who also report it), its `co_occurrence` with the given symptoms one
+    by one, and the `diseases` that link it to them. Like `/predict`, a request
+    in which no symptom is recognized is rejected with 400.
+    """
+    error = validate_symptoms(PredictRequest(symptoms=symptoms, symptom_indices=symptom_indices))
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    if not 1 <= limit <= MAX_RELATED_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_RELATED_LIMIT}")
+    resolution = await resolve_symptoms(symptoms, symptom_indices)
+    if not resolution.active:
+        raise HTTPException(status_code=400, detail="No valid symptoms found")
+    return {
+        'matched_symptoms': list(resolution.matched),
+        'invalid_symptoms': list(resolution.invalid),
+        'related': get_cooccurrence_index().related(resolution.active, limit, exclude)
+    }
+
 
+async def resolve_symptoms(symptoms: List[str], symptom_indices: Optional[List[int]]) -> Resolution:
+    """Canonical symptom set of a request, through the resolution cache
+    
+    Matching an unseen spelling can take milliseconds, so names resolve on the pool.
+    """
+    key = response_cache.resolution_key(symptoms, symptom_indices)
+    resolution = response_cache.get_resolution(key)
+    if resolution is None:
+        if symptom_indices is not None:
+            active = resolve_request(None, symptom_indices)
+        else:
+            active = await run_inference(resolve_request, symptoms)
+        resolution = response_cache.canonical(*active)
+        response_cache.put_resolution(key, resolution)
+    return resolution
 
-@app.get("/symptoms/search")
-def search_symptoms(q: str):
-    """Search symptoms by partial name match"""
-    all_symptoms = get_symptoms()
-    query = q.lower()
-    matches = [s for s in all_symptoms if query in s['name'].lower()]
-    return matches[:20]  # Limit to 20 results
 
+def validate_symptoms(request: PredictRequest) -> Optional[str]:
+    """Return the validation error for a prediction request, if any"""
+    symptoms = request.symptom_indices if request.symptom_indices is not None else request.symptoms
+    if not symptoms:
+        return "At least one symptom is required"
+    if len(symptoms) > 20:
+        return "Maximum 20 symptoms allowed"
+    if not 1 <= request.top_k <= MAX_TOP_K:
+        return f"top_k must be between 1 and {MAX_TOP_K}"
+    return None
 
-@app.post("/predict")
-def predict(request: PredictRequest):
+
+@app.post("/predict", responses={200: {"model": PredictResponse}})
+async def predict(request: PredictRequest, x_profile: Optional[str] = Header(default=None)):
     """
     Predict disease based on symptoms
     
     - **symptoms**: List of symptom names (e.g., ["headache", "fever", "cough"])
+    - **symptom_indices**: Optional active symptom indices from `/symptoms`; skips name matching
     - **age**: Optional patient age for context
     - **gender**: Optional patient gender for context
+    - **top_k**: Optional differential size; above 1 the response adds a `differential`
+      list of the most likely diseases with probability, severity and specialist
     
     Returns predicted disease with confidence, severity, specialist recommendation,
     and comprehensive health information including medications, diet, and precautions.
+    Requests naming the same set of symptoms share one cached prediction.
+    
+    Send `X-Profile: 1` to get a `profile` stage breakdown and a `Server-Timing` header.
     """
-    if not request.symptoms:
-        raise HTTPException(status_code=400, detail="At least one symptom is required")
+    error = validate_symptoms(request)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
     
-    if len(request.symptoms) > 20:
-        raise HTTPException(status_code=400, detail="Maximum 20 symptoms allowed")
+    started = time.perf_counter()
+    # Level 1: the canonical symptom set of this exact input
+    resolution = await resolve_symptoms(request.symptoms, request.symptom_indices)
+    resolved = time.perf_counter()
     
-    result = predict_disease(request.symptoms)
+    if not resolution.active:
+        record_outcome("no_valid_symptoms", resolution.invalid)
+        raise HTTPException(status_code=400, detail="No valid symptoms found")
     
-    if not result['success']:
-        raise HTTPException(status_code=400, detail=result.get('error', 'Prediction failed'))
+    # Level 2: the serialized prediction of that set
+    entry = response_cache.get(get_predictor().version, resolution.active, request.top_k)
+    if entry is None:
+        if micro_batcher is not None:
+            # One stage for the collection window and the batch it joined
+            submitted = time.perf_counter()
+            result = await micro_batcher.submit((list(resolution.active), request.top_k))
+            stages = {'batch': time.perf_counter() - submitted}
+        else:
+            result = await run_inference(predict_disease, None, list(resolution.active), request.top_k, True)
+            # Stage timings come back with the result, so they are recorded here
+            # whichever process ran the prediction
+            stages = result.pop('stage_seconds')
+        entry = response_cache.put(result, resolution.active, request.top_k, prediction_outcome(result))
+    else:
+        stages = {}
+    stages['resolve'] = resolved - started
+    elapsed = time.perf_counter() - started
+    for stage, seconds in stages.items():
+        PREDICT_STAGE_LATENCY.observe(seconds, stage)
+    record_outcome(entry.outcome, resolution.invalid)
     
-    # Add age/gender context to response if provided
-    result['patient_info'] = {
-        'age': request.age,
-        'gender': request.gender
+    # Fields of this request, including age/gender context if provided
+    fields = {
+        'matched_symptoms': list(resolution.matched),
+        'invalid_symptoms': list(resolution.invalid),
+        'patient_info': {
+            'age': request.age,
+            'gender': request.gender
+        }
     }
+    headers = {"X-Model-Version": entry.version}
     
-    return result
+    if x_profile and x_profile != "0":
+        # Time outside resolution and the predictor: inference pool hand-off,
+        # queueing and cache lookups
+        stages['dispatch'] = max(elapsed - sum(stages.values()), 0.0)
+        fields['profile'] = stage_breakdown(stages, elapsed)
+        headers["Server-Timing"] = server_timing(stages)
+    
+    return Response(content=response_cache.render(entry, fields), media_type="application/json", headers=headers)
+
+
+@app.post("/predict/batch")
+async def predict_batch(request: BatchPredictRequest, response: Response):
+    """
+    Predict diseases for many patients in one call
+    
+    - **items**: List of prediction requests, same shape as `/predict`
+    
+    Valid items are scored together with one model call per chunk. Every
+    result carries its own `success` flag, so invalid or empty items report
+    their error without failing the rest of the batch. All items are scored
+    by the model version in the `X-Model-Version` header.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    
+    if len(request.items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_SIZE} items allowed per batch")
+    
+    results = [None] * len(request.items)
+    valid = []
+    for pos, item in enumerate(request.items):
+        error = validate_symptoms(item)
+        if error:
+            results[pos] = {'success': False, 'error': error, 'invalid_symptoms': []}
+        else:
+            valid.append(pos)
+    
+    predictions = await run_inference(
+        predict_disease_batch,
+        [request.items[pos].symptoms for pos in valid],
+        [request.items[pos].symptom_indices for pos in valid],
+        [request.items[pos].top_k for pos in valid]
+    )
+    for pos, result in zip(valid, predictions):
+        record_prediction(result)
+        if result['success']:
+            result['patient_info'] = {
+                'age': request.items[pos].age,
+                'gender': request.items[pos].gender
+            }
+        results[pos] = result
+    
+    versions = [result['model_version'] for result in predictions if result['success']]
+    if versions:
+        response.headers["X-Model-Version"] = versions[0]
+    return {'count': len(results), 'results': results}
+
+
+# Session state lives in this process, so these handlers run on the server's
+# thread pool; the engine sends symptom resolution and each turn's forest pass
+# and question selection to the inference pool (503 when it is saturated)
+@app.post("/session")
+def start_session(request: SessionStartRequest):
+    """
+    Start a symptom interview
+    
+    - **symptoms** / **symptom_indices**: Symptoms reported so far (may be empty)
+    - **top_k**: Differential size of the session's predictions
+    
+    Returns the session id, the current prediction (once a symptom is present)
+    and `next_question`, the unasked symptom that best separates the likely diseases.
+    """
+    symptoms = request.symptom_indices if request.symptom_indices is not None else request.symptoms
+    if len(symptoms) > 20:
+        raise HTTPException(status_code=400, detail="Maximum 20 symptoms allowed")
+    if not 1 <= request.top_k <= MAX_TOP_K:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 1 and {MAX_TOP_K}")
+    return get_interview_engine().start(request.symptoms, request.symptom_indices, request.top_k)
+
+
+@app.post("/session/{session_id}/answer")
+def answer_session(session_id: str, request: SessionAnswerRequest):
+    """
+    Add symptoms to an interview as present or absent
+    
+    - **symptoms** / **symptom_indices**: Symptoms being answered, e.g. the `next_question` index
+    - **present**: Whether the patient has them
+    
+    Only the new symptoms are resolved; the forest runs again only when the
+    set of present symptoms changed.
+    """
+    error = validate_symptoms(PredictRequest(symptoms=request.symptoms, symptom_indices=request.symptom_indices))
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    state = get_interview_engine().answer(session_id, request.symptoms, request.symptom_indices, request.present)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return state
+
+
+def check_admin_token(token: Optional[str]):
+    """Reject admin calls unless ML_ADMIN_TOKEN is set and matches the X-Admin-Token header"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not token or not secrets.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/admin/reload", status_code=202)
+async def reload_model(request: Optional[ReloadRequest] = None,
+                       x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Load a model artifact in the background and swap it in once it passes the smoke set
+    
+    - **version**: Artifact version under artifacts/ (default: the one `LATEST` names)
+    - **force**: Reload even when that version is already serving
+    
+    Requests already running finish on the old model. Poll `GET /admin/reload`
+    for the outcome. Requires the `X-Admin-Token` header.
+    """
+    check_admin_token(x_admin_token)
+    request = request or ReloadRequest()
+    try:
+        return reloader.start(request.version, request.force)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ReloadInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/admin/reload")
+async def reload_status(x_admin_token: Optional[str] = Header(default=None)):
+    """Serving model version, the reload in progress and recent reload attempts"""
+    check_admin_token(x_admin_token)
+    return reloader.stats()
 
 
 @app.get("/diseases")
-def list_diseases():
+async def list_diseases():
     """Get all diseases that the model can predict"""
     predictor = get_predictor()
     diseases = []
@@ -116,33 +596,31 @@ def list_diseases():
 
 
 @app.get("/disease/{disease_name}")
-def get_disease_info(disease_name: str):
+async def get_disease_info(disease_name: str):
     """Get detailed information about a specific disease"""
     predictor = get_predictor()
     
     # Find the disease (case-insensitive)
-    found_disease = None
-    for name in predictor.diseases_list.values():
-        if name.lower() == disease_name.lower():
-            found_disease = name
-            break
+    found_disease = predictor.disease_lookup.get(disease_name.lower())
     
     if not found_disease:
         raise HTTPException(status_code=404, detail=f"Disease '{disease_name}' not found")
     
-    info = predictor.get_disease_info(found_disease)
-    info['name'] = found_disease
-    info['severity'] = predictor.disease_severity.get(found_disease, 'moderate')
-    info['specialist'] = predictor.disease_specialist.get(found_disease, 'General Physician')
-    
-    return info
+    # Body is serialized once at load time
+    return Response(content=predictor.disease_records[found_disease].json, media_type="application/json")
 
 
 if __name__ == "__main__":
     print("Starting HeliumDoc Symptom Checker ML API...")
-    print("Loading Random Forest model...")
-    # Pre-load the model
-    get_predictor()
-    print("Model loaded successfully!")
-    print("API running on http://0.0.0.0:5001")
-    uvicorn.run(app, host="0.0.0.0", port=5001)
+    if API_WORKERS > 1:
+        # Every worker process imports the app and loads the model in its lifespan
+        print(f"Starting {API_WORKERS} workers, each loading the model before serving")
+        print("API running on http://0.0.0.0:5001")
+        uvicorn.run("api:app", host="0.0.0.0", port=5001, workers=API_WORKERS)
+    else:
+        print("Loading Random Forest model...")
+        # Pre-load the model
+        predictor = load_model()
+        print(f"Model {predictor.version} loaded in {startup_timings['model_load_ms']} ms")
+        print("API running on http://0.0.0.0:5001")
+        uvicorn.run(app, host="0.0.0.0", port=5001)
@@ -0,0 +1,66 @@
+"""
+Throughput benchmark for batch prediction
+Compares looped single predictions with predict_batch, both in-process and
+through the HTTP endpoints (POST /predict vs POST /predict/batch)
+
+Usage: python benchmarks/bench_batch.py [--patients N] [--batch-size B]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from api import app
+from benchmarks.corpus import build_corpus
+from symptom_predictor import get_predictor
+
+
+def rate(count, fn):
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patients', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=250)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(2000, args.seed)
+    patients = [[rng.choice(corpus) for _ in range(rng.randint(1, 6))] for _ in range(args.patients)]
+
+    predictor = get_predictor()
+    looped = [predictor.predict(p) for p in patients]
+    batched = predictor.predict_batch(patients)
+    mismatches = sum(a != b for a, b in zip(looped, batched))
+    print(f'Patients: {len(patients)}  mismatches: {mismatches}')
+
+    # Resolution is cached after the first pass, so both paths are measured warm
+    single = rate(len(patients), lambda: [predictor.predict(p) for p in patients])
+    batch = rate(len(patients), lambda: predictor.predict_batch(patients))
+    print(f'In-process looped predict: {single:9.1f} patients/s')
+    print(f'In-process predict_batch:  {batch:9.1f} patients/s  ({batch / single:.1f}x)')
+
+    client = TestClient(app)
+    chunks = [patients[i:i + args.batch_size] for i in range(0, len(patients), args.batch_size)]
+    http_single = rate(len(patients), lambda: [
+        client.post('/predict', json={'symptoms': p}) for p in patients])
+    http_batch = rate(len(patients), lambda: [
+        client.post('/predict/batch', json={'items': [{'symptoms': p} for p in chunk]})
+        for chunk in chunks])
+    print(f'HTTP looped /predict:      {http_single:9.1f} patients/s')
+    print(f'HTTP /predict/batch:       {http_batch:9.1f} patients/s  ({http_batch / http_single:.1f}x)')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Scaling benchmark for the bulk scoring CLI
+Writes a JSONL file of corpus requests, then scores it with bulk_score at
+increasing worker counts and reports rows/s with the speedup over one
+worker. The main process parses the input and writes the output; its
+reading rate is reported as the ceiling the workers can scale to.
+
+First checks that bulk scoring of data/Training.csv (one-hot layout, with
+its repeated fluid_overload column) matches predict_batch on the same rows
+read by pandas, and exits with status 1 on any mismatch.
+
+Usage: python benchmarks/bench_bulk.py [--rows N] [--workers 1,2,4] [--chunk-size N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.corpus import build_corpus, build_requests
+from bulk_score import DEFAULT_CHUNK_SIZE, DEFAULT_FIELDS, read_jsonl, score_file
+from symptom_predictor import DATA_DIR, get_predictor
+
+
+def check_training_set(tmp: str, chunk_size: int) -> int:
+    """Rows of Training.csv whose bulk output differs from predict_batch"""
+    path = os.path.join(DATA_DIR, 'Training.csv')
+    output = os.path.join(tmp, 'training.jsonl')
+    score_file(path, output, workers=1, chunk_size=chunk_size, report_seconds=0)
+    with open(output) as f:
+        scored = [json.loads(line) for line in f]
+
+    # pandas names the repeated column 'fluid_overload.1', matching the feature order
+    features = pd.read_csv(path).drop(columns='prognosis').to_numpy()
+    direct = get_predictor().predict_batch([None] * len(features),
+                                           [np.flatnonzero(row).tolist() for row in features])
+    mismatches = abs(len(direct) - len(scored))
+    for row, (bulk, expected) in enumerate(zip(scored, direct)):
+        if bulk['row'] != row or any(bulk[field] != expected.get(field) for field in DEFAULT_FIELDS):
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--workers', help="comma-separated worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(',')]
+    else:
+        cpus = os.cpu_count() or 1
+        counts = [n for n in (1, 2, 4, 8, 16, 32, 64) if n < cpus] + [cpus]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mismatches = check_training_set(tmp, args.chunk_size)
+        print(f'Training.csv bulk vs predict_batch mismatches: {mismatches}')
+        if mismatches:
+            return 1
+
+        source = os.path.join(tmp, 'input.jsonl')
+        with open(source, 'w') as f:
+            for i, symptoms in enumerate(build_requests(build_corpus(2000, args.seed), args.rows, args.seed)):
+                f.write(json.dumps({'id': i, 'symptoms': symptoms}) + '\n')
+
+        started = time.perf_counter()
+        rows = sum(1 for _ in read_jsonl(source))
+        reading = rows / (time.perf_counter() - started)
+        print(f'Input: {rows} rows, main process reads {reading:.0f} rows/s; {os.cpu_count()} CPUs')
+
+        base = None
+        for workers in counts:
+            summary = score_file(source, os.path.join(tmp, f'output-{workers}.jsonl'), workers=workers,
+                                 chunk_size=args.chunk_size, report_seconds=0)
+            rate = summary['rows_per_second']
+            base = base or rate
+            print(f'{workers:>3} workers: {rate:9.0f} rows/s  speedup {rate / base:5.2f}x  '
+                  f'efficiency {rate / base / workers:5.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Cold start benchmark for the ML service
+Starts fresh interpreters that import api.py and run its startup, comparing
+the compiled artifact with reading the model pickle and CSV datasets
+
+Usage: python benchmarks/bench_cold_start.py [--runs N] [--artifact DIR]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+from model_artifact import resolve_artifact_dir
+
+# Runs the app lifespan, so readiness covers every structure built at startup
+PROBE = """
+import asyncio, json, sys
+import api
+
+async def start():
+    async with api.lifespan(api.app):
+        pass
+
+asyncio.run(start())
+print(json.dumps(dict(api.startup_timings, pandas='pandas' in sys.modules)))
+"""
+
+# Same probe with the library import cost taken out, isolating data loading
+PREIMPORTED_PROBE = "import sklearn.ensemble" + PROBE
+
+
+def cold_start(artifact_dir, probe=PROBE):
+    env = dict(os.environ, ML_ARTIFACT_DIR=artifact_dir, PYTHONWARNINGS='ignore')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=SERVICE_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--artifact', help="artifact directory (default: LATEST)")
+    args = parser.parse_args()
+
+    artifact_dir = resolve_artifact_dir(args.artifact)
+    if artifact_dir is None:
+        print("No artifact found; run `python model_artifact.py build` first")
+        return 1
+
+    for label, target in (('sources (pickle + CSV)', 'none'), (f'artifact {os.path.basename(artifact_dir)}', artifact_dir)):
+        runs = [cold_start(target) for _ in range(args.runs)]
+        load = statistics.median(r['model_load_ms'] for r in runs)
+        ready = statistics.median(r['import_to_ready_ms'] for r in runs)
+        print(f'{label}:')
+        print(f'  model load:      {load:8.1f} ms (median of {args.runs})')
+        print(f'  import to ready: {ready:8.1f} ms')
+        print(f'  pandas imported: {runs[0]["pandas"]}')
+        warm = [cold_start(target, PREIMPORTED_PROBE) for _ in range(args.runs)]
+        print(f'  model load with sklearn pre-imported: '
+              f'{statistics.median(r["model_load_ms"] for r in warm):8.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
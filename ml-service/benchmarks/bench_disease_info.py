@@ -0,0 +1,74 @@
+"""
+Consistency check and microbenchmark for disease info lookup
+Compares the precomputed DiseaseRecord output with the per-request pandas
+extraction for all 41 diseases, then times both paths
+
+Usage: python benchmarks/bench_disease_info.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disease_records import extract_disease_info
+from symptom_predictor import SymptomPredictor, get_predictor
+
+
+def knowledge_frames(predictor):
+    return (predictor.description, predictor.precautions, predictor.medications,
+            predictor.diets, predictor.workout)
+
+
+def legacy_detail(predictor, disease):
+    """The original GET /disease/{name} response"""
+    info = extract_disease_info(disease, *knowledge_frames(predictor))
+    info['name'] = disease
+    info['severity'] = predictor.disease_severity.get(disease, 'moderate')
+    info['specialist'] = predictor.disease_specialist.get(disease, 'General Physician')
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    # Records come from the service's own load path (artifact when present),
+    # the reference from a predictor reading the CSV datasets directly
+    predictor = get_predictor()
+    source = SymptomPredictor()
+    diseases = list(predictor.diseases_list.values())
+
+    mismatches = []
+    for disease in diseases:
+        record = predictor.disease_records[disease]
+        expected = legacy_detail(source, disease)
+        body = json.dumps(expected, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+        if record.detail() != expected or record.json != body.encode('utf-8'):
+            mismatches.append(disease)
+    print(f'Diseases checked: {len(diseases)}  mismatches: {len(mismatches)}')
+    for disease in mismatches:
+        print(f'  {disease}')
+
+    frames = knowledge_frames(source)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for disease in diseases:
+            extract_disease_info(disease, *frames)
+    legacy = (time.perf_counter() - start) / (args.repeat * len(diseases)) * 1e6
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for disease in diseases:
+            predictor.get_disease_info(disease)
+    records = (time.perf_counter() - start) / (args.repeat * len(diseases)) * 1e6
+    print(f'pandas extraction: {legacy:9.1f} us/lookup')
+    print(f'DiseaseRecord:     {records:9.1f} us/lookup  ({legacy / records:.0f}x)')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
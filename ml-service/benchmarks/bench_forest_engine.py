@@ -0,0 +1,95 @@
+"""
+Benchmark for the flattened NumPy forest engine
+Checks that FlatForest reproduces RandomForestClassifier.predict_proba
+exactly on every row of Training.csv (and on random symptom rows), then
+compares per-call latency of both engines across batch sizes and the
+cold start of the service with each engine
+
+Usage: python benchmarks/bench_forest_engine.py [--random-rows N] [--runs N]
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+import numpy as np
+
+from forest_engine import FlatForest, mismatched_rows
+from symptom_predictor import DATA_DIR, SymptomPredictor
+
+BATCH_SIZES = (1, 8, 32, 128, 512, 2048)
+
+PROBE = (
+    "import json, sys, time; started = time.perf_counter(); "
+    "from symptom_predictor import get_predictor; get_predictor().predict(['vomiting', 'headache']); "
+    "print(json.dumps({'ready_ms': (time.perf_counter() - started) * 1000, 'sklearn': 'sklearn' in sys.modules}))"
+)
+
+
+def training_rows() -> np.ndarray:
+    with open(os.path.join(DATA_DIR, 'Training.csv'), newline='') as f:
+        reader = csv.reader(f)
+        width = len(next(reader)) - 1
+        return np.array([[int(v) for v in row[:width]] for row in reader if row], dtype=np.uint8)
+
+
+def per_call_ms(predict_proba, X, batch_size, calls):
+    batches = [X[i:i + batch_size] for i in range(0, len(X) - batch_size + 1, batch_size)][:calls]
+    predict_proba(batches[0])
+    started = time.perf_counter()
+    for batch in batches:
+        predict_proba(batch)
+    return (time.perf_counter() - started) / len(batches) * 1e3
+
+
+def cold_start(engine):
+    env = dict(os.environ, ML_FOREST_ENGINE=engine, PYTHONWARNINGS='ignore')
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=SERVICE_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--random-rows', type=int, default=20000)
+    parser.add_argument('--runs', type=int, default=3, help="cold starts per engine")
+    args = parser.parse_args()
+
+    model = SymptomPredictor().model
+    forest = FlatForest.from_sklearn(model)
+    X = training_rows()
+    rng = np.random.default_rng(0)
+    random_rows = (rng.random((args.random_rows, X.shape[1])) < 0.05).astype(np.uint8)
+
+    mismatches = mismatched_rows(model, forest, X) + mismatched_rows(model, forest, X.astype(np.float64))
+    random_mismatches = mismatched_rows(model, forest, random_rows)
+    print(f'Trees: {forest.n_estimators}  split nodes: {len(forest.feature)}  leaves: {len(forest.value)}')
+    print(f'Training.csv rows: {len(X)}  mismatches: {mismatches}')
+    print(f'Random rows: {len(random_rows)}  mismatches: {random_mismatches}')
+
+    sample = X[rng.permutation(len(X))]
+    print(f'{"batch":>6} {"sklearn ms":>11} {"numpy ms":>9}')
+    for batch_size in BATCH_SIZES:
+        calls = max(5, 2000 // batch_size)
+        sklearn_ms = per_call_ms(model.predict_proba, sample, batch_size, calls)
+        numpy_ms = per_call_ms(forest.predict_proba, sample, batch_size, calls)
+        print(f'{batch_size:>6} {sklearn_ms:11.3f} {numpy_ms:9.3f}  ({sklearn_ms / numpy_ms:.2f}x)')
+
+    for engine in ('sklearn', 'numpy'):
+        runs = [cold_start(engine) for _ in range(args.runs)]
+        print(f'Cold start to first prediction, {engine}: '
+              f'{statistics.median(r["ready_ms"] for r in runs):8.1f} ms '
+              f'(sklearn imported: {runs[0]["sklearn"]})')
+    return 1 if mismatches or random_mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
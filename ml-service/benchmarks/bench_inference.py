@@ -0,0 +1,64 @@
+"""
+Microbenchmark for model inference
+Compares the legacy predict + predict_proba double pass over a float64 row
+with the single predict_proba pass over the reused uint8 feature buffer
+
+Usage: python benchmarks/bench_inference.py [--rows N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from symptom_predictor import DATA_DIR, get_predictor
+
+
+def legacy_infer(predictor, active):
+    """The original two-pass inference"""
+    feature_vector = np.zeros(len(predictor.symptoms_list_processed))
+    feature_vector[active] = 1
+    prediction_idx = predictor.model.predict([feature_vector])[0]
+    disease = predictor.diseases_list.get(prediction_idx, 'Unknown')
+    proba = predictor.model.predict_proba([feature_vector])[0]
+    return disease, float(max(proba))
+
+
+def single_pass_infer(predictor, active):
+    features = predictor._feature_buffer()
+    features[0, active] = 1
+    return predictor._infer(features)
+
+
+def per_call_ms(fn, predictor, rows):
+    start = time.perf_counter()
+    for active in rows:
+        fn(predictor, active)
+    return (time.perf_counter() - start) / len(rows) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=300)
+    args = parser.parse_args()
+
+    predictor = get_predictor()
+    training = pd.read_csv(os.path.join(DATA_DIR, 'Training.csv')).drop(columns='prognosis')
+    rows = [np.flatnonzero(r).tolist() for r in training.sample(args.rows, random_state=0).values]
+
+    mismatches = sum(legacy_infer(predictor, a) != single_pass_infer(predictor, a) for a in rows)
+    legacy = per_call_ms(legacy_infer, predictor, rows)
+    single = per_call_ms(single_pass_infer, predictor, rows)
+    print(f'Rows: {len(rows)}  mismatches: {mismatches}')
+    print(f'Legacy predict + predict_proba: {legacy:7.2f} ms/row')
+    print(f'Single predict_proba pass:      {single:7.2f} ms/row  ({legacy / single:.2f}x)')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
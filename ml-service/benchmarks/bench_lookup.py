@@ -0,0 +1,76 @@
+"""
+Benchmark for lookup-table inference
+Replays a request mix (training patterns, partial patterns and random
+symptom sets) through 'forest' and 'lookup' inference, checking both give
+the same probabilities and reporting hit rate and latency
+
+Usage: python benchmarks/bench_lookup.py [--requests N] [--seed S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from model_artifact import resolve_artifact_dir
+from symptom_predictor import SymptomPredictor
+
+
+def request_mix(patterns, size, seed):
+    """Mostly repeated training patterns, some subsets and some random sets"""
+    rng = random.Random(seed)
+    n_features = patterns.shape[1]
+    rows = []
+    for _ in range(size):
+        kind = rng.random()
+        active = np.flatnonzero(patterns[rng.randrange(len(patterns))]).tolist()
+        if kind < 0.3 and len(active) > 1:
+            active = rng.sample(active, rng.randint(1, len(active) - 1))
+        elif kind > 0.9:
+            active = rng.sample(range(n_features), rng.randint(1, 6))
+        row = np.zeros(n_features, dtype=np.uint8)
+        row[active] = 1
+        rows.append(row)
+    return rows
+
+
+def per_row_us(predictor, rows):
+    started = time.perf_counter()
+    for row in rows:
+        predictor._predict_proba(row[np.newaxis, :])
+    return (time.perf_counter() - started) / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=5)
+    args = parser.parse_args()
+
+    artifact_dir = resolve_artifact_dir()
+    forest = SymptomPredictor(artifact_dir)
+    lookup = SymptomPredictor(artifact_dir, inference_mode='lookup')
+    rows = request_mix(lookup.training_patterns, args.requests, args.seed)
+
+    mismatches = sum(
+        not np.array_equal(forest._predict_proba(r[np.newaxis, :]), lookup._predict_proba(r[np.newaxis, :]))
+        for r in rows[:500]
+    )
+    forest_us = per_row_us(forest, rows)
+    lookup_us = per_row_us(lookup, rows)
+    stats = lookup.pattern_cache.stats()
+    print(f'Requests: {len(rows)}  probability mismatches (first 500): {mismatches}')
+    print(f'Forest inference: {forest_us:9.1f} us/request')
+    print(f'Lookup inference: {lookup_us:9.1f} us/request  ({forest_us / lookup_us:.1f}x)')
+    print(f'Hit rate: {stats["hit_rate"]:.1%}  forest evaluations: {stats["forest_evaluations"]} '
+          f'of {stats["lookups"]} lookups  mean lookup: {stats["mean_lookup_us"]} us')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Overhead benchmark for the latency instrumentation
+Measures predict() with and without per-stage timings (in lookup inference
+mode, where predict is cheapest and the overhead most visible), the cost of
+one histogram observation and counter increment, and MetricsMiddleware
+around a trivial ASGI app
+
+Usage: python benchmarks/bench_metrics.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from metrics import STAGE_BUCKETS, MetricsMiddleware, Registry
+from model_artifact import resolve_artifact_dir
+from symptom_predictor import DATA_DIR, SymptomPredictor
+
+
+def per_call_us(fn, calls):
+    fn()
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def empty_app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def asgi_calls_us(app, calls):
+    scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = SymptomPredictor(resolve_artifact_dir(), inference_mode='lookup')
+    training = pd.read_csv(os.path.join(DATA_DIR, 'Training.csv')).drop(columns='prognosis')
+    rows = [np.flatnonzero(r).tolist() for r in training.sample(args.rows, random_state=0).values]
+
+    def run(timings):
+        for active in rows:
+            predictor.predict(symptom_indices=active, timings=timings)
+
+    # Interleaved rounds, best of each, to keep machine noise out of a small difference
+    plain, timed = [], []
+    for _ in range(args.repeat):
+        plain.append(per_call_us(lambda: run(False), 1) / len(rows))
+        timed.append(per_call_us(lambda: run(True), 1) / len(rows))
+    print(f'predict() without timings: {min(plain):8.2f} us/call')
+    print(f'predict() with timings:    {min(timed):8.2f} us/call  '
+          f'(+{min(timed) - min(plain):.2f} us, {(min(timed) / min(plain) - 1) * 100:+.2f}%)')
+
+    registry = Registry()
+    histogram = registry.histogram('bench_seconds', 'benchmark', STAGE_BUCKETS, ('stage',))
+    counter = registry.counter('bench_total', 'benchmark', ('outcome',))
+    print(f'Histogram.observe:         {per_call_us(lambda: histogram.observe(0.0003, "inference"), 200000):8.3f} us')
+    print(f'Counter.inc:               {per_call_us(lambda: counter.inc(1, "predicted"), 200000):8.3f} us')
+
+    bare = asyncio.run(asgi_calls_us(empty_app, 50000))
+    wrapped = asyncio.run(asgi_calls_us(MetricsMiddleware(empty_app, registry.histogram(
+        'bench_request_seconds', 'benchmark', STAGE_BUCKETS, ('method', 'route', 'status'))), 50000))
+    print(f'Trivial ASGI app:          {bare:8.3f} us/request')
+    print(f'With MetricsMiddleware:    {wrapped:8.3f} us/request  (+{wrapped - bare:.3f} us)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
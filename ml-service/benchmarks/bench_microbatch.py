@@ -0,0 +1,104 @@
+"""
+Benchmark for micro-batched /predict
+Sends the same concurrent /predict load through the ASGI app with and
+without the event-loop micro-batcher (response cache off, so every request
+reaches the model), checking both give the same responses and reporting
+throughput, latency percentiles and the batch-size histogram
+
+Requests wait for their batch on the event loop, so batches are bounded by
+--max-batch and by the number of requests in flight (--concurrency), not by
+ML_INFERENCE_WORKERS.
+
+Usage: python benchmarks/bench_microbatch.py [--concurrency C] [--requests N] [--wait-ms W] [--max-batch B]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import numpy as np
+
+import api
+from micro_batcher import MicroBatcher
+from response_cache import ResponseCache
+
+
+def build_requests(names, size, seed):
+    """Request symptom lists of 1 to 8 dataset symptom names"""
+    rng = random.Random(seed)
+    return [[names[idx] for idx in rng.sample(range(len(names)), rng.randint(1, 8))] for _ in range(size)]
+
+
+async def run_load(client, requests, concurrency):
+    """Response bodies in request order, per-request latencies and wall time"""
+    bodies = [None] * len(requests)
+    latencies = [0.0] * len(requests)
+    pending = iter(enumerate(requests))
+
+    async def worker():
+        for i, symptoms in pending:
+            started = time.perf_counter()
+            response = await client.post('/predict', json={'symptoms': symptoms})
+            latencies[i] = time.perf_counter() - started
+            bodies[i] = (response.status_code, response.json())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return bodies, np.array(latencies) * 1000, time.perf_counter() - started
+
+
+async def compare(requests, concurrency, batcher):
+    """(direct run, micro-batched run), each as run_load's results"""
+    saved = api.response_cache, api.micro_batcher
+    api.response_cache = ResponseCache(0, 0)
+    runs = []
+    try:
+        async with api.lifespan(api.app):
+            transport = httpx.ASGITransport(app=api.app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+                for micro_batcher in (None, batcher):
+                    api.micro_batcher = micro_batcher
+                    runs.append(await run_load(client, requests, concurrency))
+    finally:
+        api.response_cache, api.micro_batcher = saved
+    return runs
+
+
+def report(name, latencies, wall, count):
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f'{name:<14} {count / wall:9.0f} req/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--wait-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    requests = build_requests(api.get_predictor().symptom_names, args.requests, args.seed)
+    batcher = MicroBatcher(api.predict_micro_batch, args.wait_ms, args.max_batch)
+    (expected, direct_ms, direct_wall), (actual, batched_ms, batched_wall) = asyncio.run(
+        compare(requests, args.concurrency, batcher))
+    mismatches = sum(a != b for a, b in zip(expected, actual))
+
+    print(f'Requests: {len(requests)}  concurrency: {args.concurrency}  mismatches: {mismatches}')
+    report('direct', direct_ms, direct_wall, len(requests))
+    report('micro-batched', batched_ms, batched_wall, len(requests))
+    stats = batcher.stats()
+    print(f'Batches: {stats["batches"]}  mean size: {stats["mean_batch_size"]}  '
+          f'mean queue: {stats["mean_queue_ms"]} ms  max queue: {stats["max_queue_ms"]} ms')
+    print(f'Batch sizes: {stats["batch_size_histogram"]}')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
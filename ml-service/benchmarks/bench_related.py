@@ -0,0 +1,75 @@
+"""
+Benchmark for the related-symptom index
+Reports the build time and memory of the sparse co-occurrence index against
+dense matrices, then times CooccurrenceIndex.related against computing
+"also reported" shares per request with pandas (rows of Training.csv having
+every given symptom), on seeded symptom sets
+
+Usage: python benchmarks/bench_related.py [--queries N] [--limit N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from cooccurrence import CooccurrenceIndex
+from symptom_predictor import DATA_DIR, SymptomPredictor
+
+
+def pandas_related(frame: pd.DataFrame, columns, limit):
+    """Per-request scan: share of the rows with every given symptom that report each other symptom"""
+    rows = frame[frame[columns].all(axis=1)]
+    if rows.empty:
+        return []
+    return rows.drop(columns=columns).mean().nlargest(limit).index.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    predictor = SymptomPredictor()
+    started = time.perf_counter()
+    index = CooccurrenceIndex.from_predictor(predictor)
+    build_ms = (time.perf_counter() - started) * 1000
+    stats = index.stats()
+    dense = sum(matrix['dense_nbytes'] for matrix in stats['matrices'].values())
+    print(f'Index build: {build_ms:.1f} ms (including reading Training.csv)')
+    print(f'Index memory: {stats["nbytes"]} bytes (dense int64 matrices: {dense} bytes)')
+    for name, matrix in stats['matrices'].items():
+        print(f'  {name:<16} {matrix["shape"]}  nnz {matrix["nnz"]:>5}  density {matrix["density"]:.3f}  '
+              f'{matrix["nbytes"]:>6} bytes')
+
+    # Symptom sets taken from real training rows, so they have matching patients
+    frame = pd.read_csv(os.path.join(DATA_DIR, 'Training.csv')).drop(columns='prognosis')
+    rng = random.Random(7)
+    queries = []
+    for row in frame.sample(args.queries, random_state=7).values:
+        present = [int(i) for i in row.nonzero()[0]]
+        queries.append(rng.sample(present, min(len(present), rng.randint(1, 3))))
+
+    started = time.perf_counter()
+    for active in queries:
+        index.related(active, args.limit)
+    index_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+    started = time.perf_counter()
+    for active in queries:
+        pandas_related(frame, frame.columns[active].tolist(), args.limit)
+    pandas_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+    print(f'CooccurrenceIndex.related: {index_us:10.1f} us/query')
+    print(f'pandas per-request scan:   {pandas_us:10.1f} us/query  ({pandas_us / index_us:.0f}x slower)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
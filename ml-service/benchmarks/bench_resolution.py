@@ -0,0 +1,64 @@
+"""
+Microbenchmark for symptom resolution
+Compares the legacy per-symptom fuzzywuzzy scan with SymptomResolver and
+checks that both return the same match for every input
+
+Usage: python benchmarks/bench_resolution.py [--size N] [--seed S]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzywuzzy import process
+
+from benchmarks.corpus import build_corpus
+from symptom_predictor import SYMPTOMS_LIST
+from symptom_resolver import MATCH_THRESHOLD, SymptomResolver
+
+CHOICES = [s.replace('_', ' ').lower() for s in SYMPTOMS_LIST]
+def legacy_match(symptom):
+    """The original correct_spelling implementation"""
+    closest_match, score = process.extractOne(symptom, CHOICES)
+    return closest_match if score >= MATCH_THRESHOLD else None
+
+
+def per_call_us(fn, inputs):
+    start = time.perf_counter()
+    for text in inputs:
+        fn(text)
+    return (time.perf_counter() - start) / len(inputs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size, args.seed)
+    resolver = SymptomResolver(CHOICES)
+
+    mismatches = [(q, legacy_match(q), resolver.match(q)) for q in corpus
+                  if legacy_match(q) != resolver.match(q)]
+    print(f'Inputs checked:  {len(corpus)}')
+    print(f'Mismatches:      {len(mismatches)}')
+    for query, old, new in mismatches[:10]:
+        print(f'  {query!r}: legacy={old!r} resolver={new!r}')
+
+    legacy = per_call_us(legacy_match, corpus)
+    uncached = per_call_us(resolver.match, corpus)
+    resolver.resolve.cache_clear()
+    cached = per_call_us(resolver.resolve, corpus)
+    print(f'Legacy extractOne:     {legacy:8.1f} us/symptom')
+    print(f'Resolver (uncached):   {uncached:8.1f} us/symptom  ({legacy / uncached:.1f}x)')
+    print(f'Resolver (LRU cached): {cached:8.1f} us/symptom  ({legacy / cached:.1f}x)')
+    print(f'Cache: {resolver.cache_info()}')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark for the /predict response cache
+Replays a production-like trace through the ASGI app with the response cache
+on and off. Patients pick symptom sets with Zipf popularity (a few common
+presentations, a long tail); each request spells its set its own way:
+shuffled order, varying case, underscores or spaces and occasional typos.
+Reports throughput, latency percentiles and the hit rate of both levels.
+
+Usage: python benchmarks/bench_response_cache.py [--requests N] [--sets N] [--zipf S] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import numpy as np
+
+import api
+from benchmarks.corpus import add_typo
+from benchmarks.suite import load_test
+from response_cache import ResponseCache
+from train_model import read_training_set
+
+
+def build_sets(count, seed):
+    """Distinct symptom sets of 2 to 4 symptoms taken from Training.csv rows"""
+    rng = random.Random(seed)
+    rows = [np.flatnonzero(row).tolist() for row in read_training_set().X]
+    sets = set()
+    while len(sets) < count:
+        present = rng.choice(rows)
+        sets.add(tuple(sorted(rng.sample(present, min(len(present), rng.randint(2, 4))))))
+    return sorted(sets)
+
+
+def spell(rng, name, typo_rate):
+    """One way a patient or client might send a dataset symptom name"""
+    text = name.replace('_', ' ') if rng.random() < 0.5 else name
+    text = rng.choice((str.lower, str.title, str.upper))(text) if rng.random() < 0.3 else text
+    return add_typo(rng, text) if rng.random() < typo_rate else text
+
+
+def build_trace(sets, names, size, zipf, typo_rate, seed):
+    """Request bodies for sets drawn with Zipf popularity, each spelled afresh"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** zipf for rank in range(len(sets))]
+    order = list(sets)
+    rng.shuffle(order)
+    trace = []
+    for chosen in rng.choices(order, weights, k=size):
+        symptoms = [spell(rng, names[idx], typo_rate) for idx in chosen]
+        rng.shuffle(symptoms)
+        trace.append(symptoms)
+    return trace
+
+
+async def replay(trace, concurrency, cache):
+    api.response_cache = cache
+    calls = [lambda c, s=s: c.post('/predict', json={'symptoms': s}) for s in trace]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url='http://bench') as client:
+        await load_test(client, calls[:50], concurrency)
+        cache.clear()
+        return await load_test(client, calls, concurrency)
+
+
+async def run(trace, concurrency):
+    results = {}
+    async with api.lifespan(api.app):
+        for label, cache in (('uncached', ResponseCache(0, 0)), ('cached', ResponseCache())):
+            results[label] = (await replay(trace, concurrency, cache), cache.stats())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--sets', type=int, default=2000, help="distinct symptom sets in the population")
+    parser.add_argument('--zipf', type=float, default=1.1, help="popularity skew of the symptom sets")
+    parser.add_argument('--typo-rate', type=float, default=0.1, help="share of symptom names sent with a typo")
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    names = api.get_predictor().symptom_names
+    trace = build_trace(build_sets(args.sets, 3), names, args.requests, args.zipf, args.typo_rate, 5)
+    distinct_inputs = len({tuple(symptoms) for symptoms in trace})
+    print(f'Trace: {len(trace)} requests, {distinct_inputs} distinct inputs, zipf {args.zipf}, '
+          f'typo rate {args.typo_rate}, concurrency {args.concurrency}')
+
+    results = asyncio.run(run(trace, args.concurrency))
+    for label, (load, stats) in results.items():
+        levels = '  '.join(f'{level} hit rate {stats[level]["hit_rate"]:.2f}'
+                           for level in ('resolutions', 'responses') if stats[level]['max_size'])
+        print(f'{label:<9} {load["rps"]:8.0f} req/s  p50 {load["p50_ms"]:6.2f} ms  '
+              f'p99 {load["p99_ms"]:6.2f} ms  {levels}')
+    speedup = results['cached'][0]['rps'] / results['uncached'][0]['rps']
+    print(f'Throughput with the cache: {speedup:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
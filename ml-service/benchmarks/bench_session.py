@@ -0,0 +1,75 @@
+"""
+Benchmark for the incremental symptom interview
+Simulates interviews for patients drawn from Training.csv: each starts with
+two of the patient's symptoms and truthfully answers the suggested question
+every turn. Reports per-turn latency of the session engine against
+re-sending the growing symptom list to predict(), and how often the top
+prediction matches the patient's disease after the interview.
+
+Usage: python benchmarks/bench_session.py [--interviews N] [--turns T] [--seed S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from interview import InterviewEngine
+from model_artifact import resolve_artifact_dir
+from symptom_predictor import DISEASES_LIST, SymptomPredictor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--interviews', type=int, default=300)
+    parser.add_argument('--turns', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    predictor = SymptomPredictor(resolve_artifact_dir())
+    engine = InterviewEngine(predictor)
+    names = predictor.symptom_names
+    rng = random.Random(args.seed)
+
+    session_turns, stateless_turns = [], []
+    correct = 0
+    for _ in range(args.interviews):
+        row = rng.randrange(len(engine.labels))
+        has = engine.patterns[row]
+        disease = DISEASES_LIST[int(engine.labels[row])]
+        reported = [names[i] for i in rng.sample(np.flatnonzero(has).tolist(), 2)]
+
+        state = engine.start(reported)
+        for _ in range(args.turns):
+            question = state['next_question']
+            if question is None:
+                break
+            present = bool(has[question['index']])
+
+            started = time.perf_counter()
+            state = engine.answer(state['session_id'], symptom_indices=[question['index']], present=present)
+            session_turns.append(time.perf_counter() - started)
+
+            # The stateless flow re-sends every present symptom as text
+            started = time.perf_counter()
+            predictor.predict(state['present_symptoms'], top_k=5)
+            stateless_turns.append(time.perf_counter() - started)
+        correct += state['prediction']['disease'] == disease
+
+    session_ms = np.array(session_turns) * 1000
+    stateless_ms = np.array(stateless_turns) * 1000
+    print(f'Interviews: {args.interviews}  turns: {len(session_turns)}')
+    for name, ms in (('session answer', session_ms), ('stateless predict', stateless_ms)):
+        p50, p99 = np.percentile(ms, [50, 99])
+        print(f'{name:<18} mean {ms.mean():6.3f} ms   p50 {p50:6.3f} ms   p99 {p99:6.3f} ms')
+    print(f'Top prediction matches the patient after the interview: {correct / args.interviews:.1%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Equivalence checks for the optimized code paths
+Each check runs an optimized path and the implementation it replaced (or
+the plain path it must agree with) on seeded inputs and counts the inputs
+on which they differ:
+
+    resolver        SymptomResolver vs fuzzywuzzy extractOne
+    inference       single predict_proba pass vs predict + predict_proba
+    lookup          lookup inference (pattern table + LRU) vs the forest
+    forest_engine   FlatForest vs the scikit-learn model
+    disease_records precomputed records vs extraction from the CSVs
+    batch           predict_batch vs looped predict
+    micro_batch     micro-batched vs direct /predict under concurrent requests
+    response_cache  /predict through both cache levels vs predict_disease
+    bulk            bulk_score on Training.csv vs predict_batch
+
+suite.py runs them before timing anything and fails on any mismatch; run
+this file alone as the CI gate. Exits with status 1 when a check fails.
+
+Usage: python benchmarks/checks.py [--quick] [--only NAME[,NAME]]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.corpus import build_corpus, build_requests
+
+SEED = 11
+
+# (inputs checked, mismatches)
+CheckResult = Tuple[int, int]
+
+
+def check_resolver(size: int) -> CheckResult:
+    from benchmarks.bench_resolution import CHOICES, legacy_match
+    from symptom_resolver import SymptomResolver
+
+    resolver = SymptomResolver(CHOICES)
+    corpus = build_corpus(size, SEED)
+    return len(corpus), sum(legacy_match(text) != resolver.match(text) for text in corpus)
+
+
+def _training_rows(size: int) -> List[List[int]]:
+    from benchmarks.bench_forest_engine import training_rows
+
+    X = training_rows()
+    picked = np.random.default_rng(SEED).choice(len(X), min(size, len(X)), replace=False)
+    return [np.flatnonzero(X[i]).tolist() for i in picked]
+
+
+def check_inference(size: int) -> CheckResult:
+    from benchmarks.bench_inference import legacy_infer, single_pass_infer
+    from symptom_predictor import get_predictor
+
+    predictor = get_predictor()
+    rows = _training_rows(size)
+    return len(rows), sum(legacy_infer(predictor, a) != single_pass_infer(predictor, a) for a in rows)
+
+
+def check_lookup(size: int) -> CheckResult:
+    from benchmarks.bench_lookup import request_mix
+    from model_artifact import resolve_artifact_dir
+    from symptom_predictor import SymptomPredictor
+
+    artifact_dir = resolve_artifact_dir()
+    forest = SymptomPredictor(artifact_dir)
+    lookup = SymptomPredictor(artifact_dir, inference_mode='lookup')
+    rows = request_mix(lookup.training_patterns, size, SEED)
+    return len(rows), sum(
+        not np.array_equal(forest._predict_proba(r[np.newaxis, :]), lookup._predict_proba(r[np.newaxis, :]))
+        for r in rows
+    )
+
+
+def check_forest_engine(size: int) -> CheckResult:
+    from benchmarks.bench_forest_engine import training_rows
+    from forest_engine import FlatForest, mismatched_rows
+    from symptom_predictor import SymptomPredictor
+
+    model = SymptomPredictor().model
+    forest = FlatForest.from_sklearn(model)
+    X = training_rows()
+    random_rows = (np.random.default_rng(SEED).random((size, X.shape[1])) < 0.05).astype(np.uint8)
+    return len(X) + size, mismatched_rows(model, forest, X) + mismatched_rows(model, forest, random_rows)
+
+
+def check_disease_records(size: int) -> CheckResult:
+    from benchmarks.bench_disease_info import legacy_detail
+    from serialization import dumps
+    from symptom_predictor import SymptomPredictor, get_predictor
+
+    predictor = get_predictor()
+    source = SymptomPredictor()
+    diseases = list(predictor.diseases_list.values())
+    mismatches = 0
+    for disease in diseases:
+        record = predictor.disease_records[disease]
+        expected = legacy_detail(source, disease)
+        mismatches += record.detail() != expected or record.json != dumps(expected)
+    return len(diseases), mismatches
+
+
+def check_batch(size: int) -> CheckResult:
+    from symptom_predictor import get_predictor
+
+    predictor = get_predictor()
+    requests = build_requests(build_corpus(600, SEED), size, SEED)
+    looped = [predictor.predict(symptoms, top_k=3) for symptoms in requests]
+    batched = predictor.predict_batch(requests, top_k_batch=[3] * len(requests))
+    return len(requests), sum(a != b for a, b in zip(looped, batched))
+
+
+def check_micro_batch(size: int) -> CheckResult:
+    import api
+    from benchmarks.bench_microbatch import build_requests, compare
+    from micro_batcher import MicroBatcher
+
+    requests = build_requests(api.get_predictor().symptom_names, size, SEED)
+    batcher = MicroBatcher(api.predict_micro_batch, 2.0, 32)
+    (expected, _, _), (actual, _, _) = asyncio.run(compare(requests, 16, batcher))
+    return len(requests), sum(a != b for a, b in zip(expected, actual))
+
+
+async def _response_cache_mismatches(requests: List[List[str]]) -> int:
+    import httpx
+
+    import api
+    from symptom_predictor import predict_disease
+
+    mismatches = 0
+    async with api.lifespan(api.app):
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://checks') as client:
+            # The second pass is served from the cache
+            for _ in range(2):
+                for symptoms in requests:
+                    response = await client.post('/predict', json={'symptoms': symptoms, 'top_k': 3})
+                    expected = predict_disease(symptoms, top_k=3)
+                    if not expected['success']:
+                        mismatches += response.status_code != 400
+                        continue
+                    body = response.json()
+                    body.pop('patient_info', None)
+                    mismatches += body != expected
+    return mismatches
+
+
+def check_response_cache(size: int) -> CheckResult:
+    # Repeated requests, so level 2 entries are shared between spellings
+    requests = build_requests(build_corpus(200, SEED), size, SEED)
+    return 2 * len(requests), asyncio.run(_response_cache_mismatches(requests))
+
+
+def check_bulk(size: int) -> CheckResult:
+    from benchmarks.bench_bulk import check_training_set
+    from symptom_predictor import DATA_DIR
+
+    with open(os.path.join(DATA_DIR, 'Training.csv')) as f:
+        rows = sum(1 for line in f if line.strip()) - 1
+    with tempfile.TemporaryDirectory() as tmp:
+        return rows, check_training_set(tmp, 1000)
+
+
+# name -> (check, input size, input size with --quick)
+CHECKS: Dict[str, Tuple[Callable[[int], CheckResult], int, int]] = {
+    'resolver': (check_resolver, 2000, 300),
+    'inference': (check_inference, 300, 100),
+    'lookup': (check_lookup, 1000, 300),
+    'forest_engine': (check_forest_engine, 20000, 2000),
+    'disease_records': (check_disease_records, 0, 0),
+    'batch': (check_batch, 500, 150),
+    'micro_batch': (check_micro_batch, 500, 150),
+    'response_cache': (check_response_cache, 300, 100),
+    'bulk': (check_bulk, 0, 0),
+}
+
+
+def run_checks(names: List[str] = None, quick: bool = False) -> List[str]:
+    """Run the named checks (default: all), printing each; names of the ones that failed"""
+    failed = []
+    print(f'{"check":<16} {"inputs":>7} {"mismatches":>11} {"seconds":>8}')
+    for name in names or list(CHECKS):
+        check, size, quick_size = CHECKS[name]
+        started = time.perf_counter()
+        checked, mismatches = check(quick_size if quick else size)
+        flag = '  FAILED' if mismatches else ''
+        print(f'{name:<16} {checked:>7} {mismatches:>11} {time.perf_counter() - started:>8.1f}{flag}')
+        if mismatches:
+            failed.append(name)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help="fewer inputs per check")
+    parser.add_argument('--only', help="comma-separated checks to run: " + ', '.join(CHECKS))
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.only.split(',')] if args.only else None
+    unknown = [name for name in names or [] if name not in CHECKS]
+    if unknown:
+        print(f"Unknown checks: {', '.join(unknown)}")
+        return 2
+    failed = run_checks(names, args.quick)
+    if failed:
+        print(f'\n{len(failed)} check(s) failed: {", ".join(failed)}')
+        return 1
+    print('\nAll checks passed')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Shared benchmark inputs
+Symptom strings as patients type them, generated from data/symptoms_df.csv:
+exact dataset names, names with typos, partial words and random noise
+"""
+
+import csv
+import os
+import random
+from typing import List
+
+from symptom_predictor import DATA_DIR
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz '
+
+
+def add_typo(rng, text):
+    """Apply one random insertion, deletion, substitution or transposition"""
+    if len(text) < 2:
+        return text + rng.choice(ALPHABET)
+    i = rng.randrange(len(text) - 1)
+    op = rng.randrange(4)
+    if op == 0:
+        return text[:i] + rng.choice(ALPHABET) + text[i:]
+    if op == 1:
+        return text[:i] + text[i + 1:]
+    if op == 2:
+        return text[:i] + rng.choice(ALPHABET) + text[i + 1:]
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def build_corpus(size, seed):
+    """Realistic inputs: dataset symptoms with typos, partial words and noise"""
+    rng = random.Random(seed)
+    seen = []
+    with open(os.path.join(DATA_DIR, 'symptoms_df.csv'), newline='') as f:
+        for row in csv.DictReader(f):
+            for col in ('Symptom_1', 'Symptom_2', 'Symptom_3', 'Symptom_4'):
+                if row.get(col):
+                    seen.append(row[col].strip().replace('_', ' '))
+    corpus = []
+    while len(corpus) < size:
+        kind = rng.random()
+        text = rng.choice(seen)
+        if kind < 0.4:
+            corpus.append(text)
+        elif kind < 0.8:
+            for _ in range(rng.randint(1, 3)):
+                text = add_typo(rng, text)
+            corpus.append(text)
+        elif kind < 0.9:
+            words = text.split()
+            corpus.append(' '.join(rng.sample(words, rng.randint(1, len(words)))))
+        else:
+            corpus.append(''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 20))))
+    return corpus
+
+
+def build_requests(corpus: List[str], size: int, seed: int, max_symptoms: int = 6) -> List[List[str]]:
+    """Prediction requests of 1 to max_symptoms corpus entries each"""
+    rng = random.Random(seed)
+    return [[rng.choice(corpus) for _ in range(rng.randint(1, max_symptoms))] for _ in range(size)]
@@ -0,0 +1,341 @@
+"""
+Benchmark and load-test suite for the symptom predictor
+Two levels, both driven by seeded inputs generated from data/symptoms_df.csv
+(see benchmarks/corpus.py):
+
+    micro   correct_spelling, cached symptom resolution, feature vector
+            building, model.predict_proba (single row and batched),
+            get_disease_info, related-symptom queries and the whole predict() call
+    macro   in-process load tests of POST /predict, GET /symptoms/search,
+            GET /symptoms/related and GET /disease/{name} through the ASGI app,
+            at each concurrency level. /predict and /symptoms/related run with
+            the response cache disabled, on requests no earlier run has sent,
+            and /symptoms/search without its result memo; predict_cached and
+            symptoms_search_cached replay one input set through the caches
+
+The equivalence checks of benchmarks/checks.py run first: any mismatch
+fails the run before anything is timed (--skip-checks to leave them out).
+
+Results are compared against a JSON baseline (benchmarks/baseline.json by
+default): a metric that got worse by more than its level's threshold fails
+the run. Micro figures are the best of several rounds; in-process load tests
+swing more with whatever else the machine runs, so macro metrics get a
+looser threshold. Baselines are machine-specific; the environment they were
+recorded on is stored with them and a mismatch is reported.
+
+To show the effect of a change, record a baseline on the parent commit,
+then run the suite on the change. A run without a baseline fails rather
+than passing unchecked:
+    python benchmarks/suite.py --update-baseline
+    python benchmarks/suite.py [--level micro|macro|all] [--quick] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+
+import numpy as np
+
+from benchmarks.checks import run_checks
+from benchmarks.corpus import build_corpus, build_requests
+
+DEFAULT_BASELINE = os.path.join(SERVICE_DIR, 'benchmarks', 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MACRO_THRESHOLD = 0.5
+CONCURRENCY_LEVELS = (1, 8, 32)
+SEED = 11
+
+# Environment variables that change what the suite measures
+CONFIG_VARS = ('ML_ARTIFACT_DIR', 'ML_INFERENCE_MODE', 'ML_FOREST_ENGINE', 'ML_MICRO_BATCH_WAIT_MS',
+               'ML_MICRO_BATCH_SIZE', 'ML_INFERENCE_EXECUTOR', 'ML_INFERENCE_WORKERS', 'ML_RED_FLAG_SHORTCUT',
+               'ML_RESOLUTION_CACHE_SIZE', 'ML_RESPONSE_CACHE_SIZE')
+
+
+def metric(value: float, unit: str, better: str = 'lower') -> Dict[str, Any]:
+    """A result entry; better is 'lower', 'higher' or None for figures that are only reported"""
+    return {'value': round(value, 3), 'unit': unit, 'better': better}
+
+
+def environment() -> Dict[str, Any]:
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'config': {name: os.environ[name] for name in CONFIG_VARS if name in os.environ},
+    }
+
+
+def best_us(fn: Callable[[], int], rounds: int, min_seconds: float = 0.05) -> float:
+    """Fastest per-operation time of fn (which returns its operation count) over rounds
+
+    Each round repeats fn for at least min_seconds; the minimum is the figure
+    least disturbed by other work on the machine.
+    """
+    fn()
+    samples = []
+    for _ in range(rounds):
+        count = 0
+        started = time.perf_counter()
+        while True:
+            count += fn()
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_seconds:
+                break
+        samples.append(elapsed / count * 1e6)
+    return min(samples)
+
+
+def run_micro(predictor, related_index, corpus: List[str], requests: List[List[str]],
+              rounds: int) -> Dict[str, Any]:
+    active_sets = [predictor._active_symptoms(request, None)[0] for request in requests]
+    rows = np.zeros((len(active_sets), len(predictor.symptom_names)), dtype=np.uint8)
+    for row, active in enumerate(active_sets):
+        rows[row, active] = 1
+    diseases = sorted(predictor.disease_records)
+
+    def spelling():
+        for text in corpus:
+            predictor.correct_spelling(text)
+        return len(corpus)
+
+    def resolve_cached():
+        predictor.resolve_symptoms(corpus)
+        return len(corpus)
+
+    def feature_vector():
+        for active in active_sets:
+            features = predictor._feature_buffer()
+            features[0, active] = 1
+        return len(active_sets)
+
+    def proba_row():
+        for row in range(min(len(rows), 200)):
+            predictor.model.predict_proba(rows[row:row + 1])
+        return min(len(rows), 200)
+
+    def proba_batch():
+        for start in range(0, len(rows), 256):
+            predictor.model.predict_proba(rows[start:start + 256])
+        return len(rows)
+
+    def disease_info():
+        for disease in diseases:
+            predictor.get_disease_info(disease)
+        return len(diseases)
+
+    def related():
+        for active in active_sets[:200]:
+            related_index.related(active)
+        return min(len(active_sets), 200)
+
+    def predict():
+        for request in requests[:200]:
+            predictor.predict(request)
+        return min(len(requests), 200)
+
+    return {
+        'micro.correct_spelling': metric(best_us(spelling, rounds), 'us/symptom'),
+        'micro.resolve_symptoms_cached': metric(best_us(resolve_cached, rounds), 'us/symptom'),
+        'micro.feature_vector': metric(best_us(feature_vector, rounds), 'us/request'),
+        'micro.predict_proba_row': metric(best_us(proba_row, rounds), 'us/row'),
+        'micro.predict_proba_batch256': metric(best_us(proba_batch, rounds), 'us/row'),
+        'micro.get_disease_info': metric(best_us(disease_info, rounds), 'us/disease'),
+        'micro.related_symptoms': metric(best_us(related, rounds), 'us/request'),
+        'micro.predict': metric(best_us(predict, rounds), 'us/request'),
+    }
+
+
+async def load_test(client, calls: Sequence[Callable], concurrency: int) -> Dict[str, float]:
+    """Run the calls with at most concurrency in flight; throughput and latency percentiles"""
+    latencies: List[float] = []
+    pending = iter(calls)
+
+    async def worker():
+        for call in pending:
+            started = time.perf_counter()
+            response = await call(client)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{response.request.url} returned {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    return {'rps': len(latencies) / wall, 'p50_ms': p50, 'p99_ms': p99}
+
+
+def fresh_requests(run: int, size: int) -> List[List[str]]:
+    """Requests built from a corpus of their own for each load-test run
+
+    The resolver memoizes raw strings, so replaying the same requests would
+    time cache hits after the first pass instead of symptom resolution.
+    """
+    return build_requests(build_corpus(600, SEED + 1 + run), size, SEED + 1 + run)
+
+
+async def run_macro(corpus: List[str], requests: List[List[str]], size: int, rounds: int) -> Dict[str, Any]:
+    import httpx
+
+    import api
+    from response_cache import ResponseCache
+    from symptom_search import SymptomSearchIndex
+
+    predictor = api.get_predictor()
+    queries = [text[:max(1, len(text) // 2)] for text in corpus]
+    diseases = [name.replace(' ', '%20') for name in sorted(predictor.disease_records)]
+    # Call lists per load-test run; the uncached ones run with the response cache and
+    # the search memo disabled, the cached ones replay through the configured caches
+    uncached = {
+        'predict': lambda run: [lambda c, r=r: c.post('/predict', json={'symptoms': r})
+                                for r in fresh_requests(run, size)],
+        'symptoms_search': lambda run: [lambda c, q=q: c.get('/symptoms/search', params={'q': q})
+                                        for q in queries[:size]],
+        'symptoms_related': lambda run: [lambda c, r=r: c.get('/symptoms/related', params={'symptoms': r})
+                                         for r in fresh_requests(run, size)],
+        'disease': lambda run: [lambda c, d=diseases[i % len(diseases)]: c.get(f'/disease/{d}')
+                                for i in range(size)],
+    }
+    cached = {
+        'predict_cached': lambda run: [lambda c, r=r: c.post('/predict', json={'symptoms': r})
+                                       for r in requests[:size]],
+        'symptoms_search_cached': lambda run: [lambda c, q=q: c.get('/symptoms/search', params={'q': q})
+                                               for q in queries[:size]],
+    }
+
+    results = {}
+    runs = itertools.count()
+
+    async def measure(client, name: str, calls: Callable[[int], List[Callable]], warmup: int):
+        await load_test(client, calls(next(runs))[:warmup], 4)
+        for concurrency in CONCURRENCY_LEVELS:
+            samples = [await load_test(client, calls(next(runs)), concurrency) for _ in range(rounds)]
+            prefix = f'macro.{name}.c{concurrency}'
+            results[f'{prefix}.rps'] = metric(statistics.median(r['rps'] for r in samples), 'req/s', 'higher')
+            results[f'{prefix}.p50_ms'] = metric(statistics.median(r['p50_ms'] for r in samples), 'ms')
+            # Tail latency of a short in-process run is too noisy to gate on
+            results[f'{prefix}.p99_ms'] = metric(statistics.median(r['p99_ms'] for r in samples), 'ms', None)
+
+    async with api.lifespan(api.app):
+        configured_cache, configured_search = api.response_cache, predictor.symptom_search
+        phases = (
+            (ResponseCache(0, 0), SymptomSearchIndex(configured_search.entries, cache_size=0), uncached, 20),
+            # The cached warmup sends every request once, so each timed call is a hit
+            (configured_cache, configured_search, cached, size),
+        )
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://suite') as client:
+            for cache, search, endpoints, warmup in phases:
+                api.response_cache, predictor.symptom_search = cache, search
+                try:
+                    for name, calls in endpoints.items():
+                        await measure(client, name, calls, warmup)
+                finally:
+                    api.response_cache, predictor.symptom_search = configured_cache, configured_search
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    """Print every metric against the baseline; names of the ones that regressed"""
+    regressions = []
+    print(f'\n{"metric":<42} {"baseline":>11} {"current":>11} {"change":>8}')
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base['value']:
+            print(f'{name:<42} {"-":>11} {current["value"]:>11.3f}  (new)')
+            continue
+        change = current['value'] / base['value'] - 1
+        threshold = thresholds[name.split('.')[0]]
+        worse = {'lower': change > threshold, 'higher': change < -threshold}.get(current['better'], False)
+        if worse:
+            regressions.append(name)
+        flag = '  REGRESSION' if worse else ''
+        print(f'{name:<42} {base["value"]:>11.3f} {current["value"]:>11.3f} {change:>+8.1%}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--level', choices=('micro', 'macro', 'all'), default='all')
+    parser.add_argument('--quick', action='store_true', help="fewer rounds and requests, for a smoke run")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change beyond which a micro metric counts as a regression (default 0.25)")
+    parser.add_argument('--macro-threshold', type=float, default=DEFAULT_MACRO_THRESHOLD,
+                        help="the same for load-test metrics (default 0.5)")
+    parser.add_argument('--update-baseline', action='store_true', help="write this run as the new baseline")
+    parser.add_argument('--output', help="also write this run's results to a JSON file")
+    parser.add_argument('--skip-checks', action='store_true', help="do not run the equivalence checks first")
+    args = parser.parse_args()
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; record one with --update-baseline')
+        return 1
+
+    if not args.skip_checks:
+        failed = run_checks(quick=args.quick)
+        if failed:
+            print(f'\n{len(failed)} equivalence check(s) failed: {", ".join(failed)}; not benchmarking')
+            return 1
+        print()
+
+    from cooccurrence import get_cooccurrence_index
+    from symptom_predictor import get_predictor
+
+    rounds, macro_rounds, macro_size = (3, 1, 200) if args.quick else (5, 3, 300)
+    corpus = build_corpus(600, SEED)
+    requests = build_requests(corpus, 600, SEED)
+
+    results: Dict[str, Any] = {}
+    if args.level in ('micro', 'all'):
+        results.update(run_micro(get_predictor(), get_cooccurrence_index(), corpus, requests, rounds))
+    if args.level in ('macro', 'all'):
+        results.update(asyncio.run(run_macro(corpus, requests, macro_size, macro_rounds)))
+
+    run = {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'environment': environment(),
+        'thresholds': {'micro': args.threshold, 'macro': args.macro_threshold},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        for name, entry in results.items():
+            print(f'{name:<42} {entry["value"]:>11.3f} {entry["unit"]}')
+        print(f'\nBaseline written to {args.baseline}')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != run['environment']:
+        print(f'Note: baseline was recorded on a different environment: {baseline.get("environment")}')
+    regressions = compare(results, baseline['results'], run['thresholds'])
+    if regressions:
+        print(f'\n{len(regressions)} metric(s) regressed beyond the threshold: {", ".join(regressions)}')
+        return 1
+    print('\nNo regressions beyond the thresholds')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""
+Bulk scoring CLI for the ML service
+Streams symptom records from a CSV or JSONL file (optionally gzipped) in
+chunks, scores the chunks on a process pool whose workers each load the
+model once, and writes one prediction per input row, in input order.
+At most a few chunks per worker are in memory at once.
+
+Input layouts:
+    JSONL   one object per line with 'symptoms' (names) or 'symptom_indices'
+    CSV     a 'symptoms' column of names separated by --separator, the
+            Symptom_1..Symptom_N columns of symptoms_df.csv, or one-hot
+            columns named after the symptoms as in Training.csv
+An --id-field column or key, when present, is copied to the output.
+
+Output:
+    JSONL   one object per line: row (0-based input record), id, then the
+            prediction fields
+    Parquet a directory of part files, one per chunk, named by first row
+
+Progress is checkpointed to <output>.progress after every chunk written in
+order; --resume continues from the last checkpoint.
+
+Usage: python bulk_score.py INPUT OUTPUT [--workers N] [--chunk-size N] [--top-k K] [--resume]
+"""
+
+import argparse
+import collections
+import csv
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from symptom_predictor import MAX_TOP_K, SYMPTOMS_LIST, create_predictor, get_predictor, swap_predictor
+from train_model import mangle_duplicates
+
+INPUT_FORMATS = ('csv', 'jsonl')
+OUTPUT_FORMATS = ('jsonl', 'parquet')
+
+# Rows per task sent to a worker
+DEFAULT_CHUNK_SIZE = 2000
+
+# Chunks submitted ahead of the one being written, per worker
+CHUNKS_PER_WORKER = 2
+
+# Prediction fields written by default; the disease information (description,
+# precautions, ...) is the same for every row of a disease and is left out
+DEFAULT_FIELDS = ('success', 'error', 'disease', 'confidence', 'severity', 'specialist', 'triage',
+                  'matched_symptoms', 'invalid_symptoms', 'symptom_burden', 'red_flags', 'differential',
+                  'model_version')
+ALL_FIELDS = DEFAULT_FIELDS + ('description', 'precautions', 'medications', 'diet', 'workout')
+
+# Parquet column types; other fields are written as JSON strings
+PARQUET_TYPES = {'row': 'int64', 'success': 'bool', 'confidence': 'float64', 'symptom_burden': 'float64'}
+
+SYMPTOM_COLUMN = re.compile(r'Symptom_\d+$')
+
+
+class Record(NamedTuple):
+    """One input row: symptom names or indices, or the reason it cannot be scored"""
+    id: Optional[str]
+    symptoms: Optional[List[str]] = None
+    indices: Optional[List[int]] = None
+    error: Optional[str] = None
+
+
+def detect_format(path: str, formats: Sequence[str]) -> str:
+    name = path[:-3] if path.endswith('.gz') else path
+    extension = os.path.splitext(name)[1].lstrip('.').lower()
+    extension = {'ndjson': 'jsonl', 'pq': 'parquet'}.get(extension, extension)
+    if extension not in formats:
+        raise ValueError(f"Cannot tell the format of {path}; pass one of {formats}")
+    return extension
+
+
+def _open_text(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def read_jsonl(path: str, id_field: str = 'id') -> Iterator[Record]:
+    """Records of a JSONL file; blank lines are skipped"""
+    with _open_text(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                yield Record(None, error=f"Invalid JSON: {e}")
+                continue
+            if not isinstance(item, dict):
+                yield Record(None, error="Record is not an object")
+                continue
+            record_id = item.get(id_field)
+            record_id = None if record_id is None else str(record_id)
+            indices = item.get('symptom_indices')
+            if indices is not None:
+                if not isinstance(indices, list) or not all(isinstance(i, int) for i in indices):
+                    yield Record(record_id, error="symptom_indices must be a list of integers")
+                else:
+                    yield Record(record_id, indices=indices)
+                continue
+            symptoms = item.get('symptoms')
+            if not isinstance(symptoms, list) or not all(isinstance(s, str) for s in symptoms):
+                yield Record(record_id, error="symptoms must be a list of strings")
+            else:
+                yield Record(record_id, symptoms=symptoms)
+
+
+def read_csv(path: str, id_field: str = 'id', separator: str = ';') -> Iterator[Record]:
+    """Records of a CSV file in any of the layouts in the module docstring"""
+    with _open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        id_col = header.index(id_field) if id_field in header else None
+        if 'symptoms' in header:
+            col = header.index('symptoms')
+            def parse(row):
+                return Record(None, symptoms=[s for s in (part.strip() for part in row[col].split(separator)) if s])
+        elif any(SYMPTOM_COLUMN.match(name) for name in header):
+            cols = [i for i, name in enumerate(header) if SYMPTOM_COLUMN.match(name)]
+            def parse(row):
+                return Record(None, symptoms=[row[i].strip() for i in cols if row[i].strip()])
+        else:
+            # Repeated columns are told apart the way training read them ('fluid_overload.1')
+            one_hot = [(i, SYMPTOMS_LIST[name]) for i, name in enumerate(mangle_duplicates(header))
+                       if name in SYMPTOMS_LIST]
+            if not one_hot:
+                raise ValueError(f"{path} has no 'symptoms', Symptom_N or one-hot symptom columns")
+            def parse(row):
+                return Record(None, indices=[idx for i, idx in one_hot if row[i].strip() not in ('', '0')])
+
+        for row in reader:
+            if not row:
+                continue
+            record_id = row[id_col] if id_col is not None and id_col < len(row) else None
+            if len(row) < len(header):
+                yield Record(record_id, error=f"Row has {len(row)} fields, header {len(header)}")
+                continue
+            yield parse(row)._replace(id=record_id)
+
+
+def read_records(path: str, input_format: str, id_field: str = 'id', separator: str = ';') -> Iterator[Record]:
+    if input_format == 'csv':
+        return read_csv(path, id_field, separator)
+    return read_jsonl(path, id_field)
+
+
+def chunked(records: Iterator[Record], size: int, skip: int = 0) -> Iterator[Tuple[int, List[Record]]]:
+    """(first row, records) chunks, leaving out the first skip records"""
+    chunk: List[Record] = []
+    start = row = 0
+    for record in records:
+        if row >= skip:
+            if not chunk:
+                start = row
+            chunk.append(record)
+            if len(chunk) == size:
+                yield start, chunk
+                chunk = []
+        row += 1
+    if chunk:
+        yield start, chunk
+
+
+def _init_worker(artifact_dir: Optional[str]):
+    """Process initializer: load the model once per worker"""
+    if artifact_dir is None:
+        get_predictor()
+    else:
+        swap_predictor(create_predictor(artifact_dir))
+
+
+def score_records(start: int, records: List[Record], top_k: int = 1,
+                  fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Output rows for a chunk whose first record is input row start, and how many failed"""
+    scored = [pos for pos, record in enumerate(records) if record.error is None]
+    results = get_predictor().predict_batch(
+        [records[pos].symptoms for pos in scored], [records[pos].indices for pos in scored],
+        top_k_batch=[top_k] * len(scored))
+    by_pos = dict(zip(scored, results))
+    rows = []
+    failed = 0
+    for pos, record in enumerate(records):
+        result = by_pos.get(pos) or {'success': False, 'error': record.error}
+        failed += not result['success']
+        row = {'row': start + pos, 'id': record.id}
+        if fields is None:
+            row.update(result)
+        else:
+            row.update((field, result.get(field)) for field in fields)
+        rows.append(row)
+    return rows, failed
+
+
+def _dumps(row: Dict[str, Any]) -> str:
+    return json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+
+
+def _parquet_table(rows: List[Dict[str, Any]], fields: Sequence[str]):
+    import pyarrow as pa
+
+    columns = {}
+    schema = []
+    for name in ('row', 'id', *fields):
+        kind = PARQUET_TYPES.get(name, 'string')
+        values = [row.get(name) for row in rows]
+        if kind == 'string':
+            values = [value if value is None or isinstance(value, str) else _dumps(value) for value in values]
+        columns[name] = values
+        schema.append(pa.field(name, pa.type_for_alias(kind)))
+    return pa.Table.from_pydict(columns, schema=pa.schema(schema))
+
+
+def part_path(output: str, start: int) -> str:
+    return os.path.join(output, f'part-{start:012d}.parquet')
+
+
+def _score_chunk(start: int, records: List[Record], top_k: int, fields: Optional[Sequence[str]],
+                 output_format: str, output: str) -> Tuple[int, int, Optional[bytes]]:
+    """Worker task: (rows, failed rows, JSONL bytes); Parquet chunks are written here as part files"""
+    rows, failed = score_records(start, records, top_k, fields)
+    if output_format == 'jsonl':
+        return len(rows), failed, ''.join(_dumps(row) + '\n' for row in rows).encode('utf-8')
+
+    import pyarrow.parquet as pq
+
+    # Written under a temporary name so a part file is always complete
+    path = part_path(output, start)
+    pq.write_table(_parquet_table(rows, fields or ALL_FIELDS), path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return len(rows), failed, None
+
+
+class Progress:
+    """Checkpoint of the rows written, in <output>.progress"""
+
+    def __init__(self, output: str, settings: Dict[str, Any]):
+        self.path = output.rstrip(os.sep) + '.progress'
+        self.settings = settings
+        self.rows = 0
+        self.failed = 0
+        self.offset = 0
+
+    def load(self) -> bool:
+        """Restore a checkpoint written with the same settings; False when there is none"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            saved = json.load(f)
+        if saved['settings'] != self.settings:
+            changed = sorted(k for k in self.settings if saved['settings'].get(k) != self.settings[k])
+            raise ValueError(f"Cannot resume: {', '.join(changed)} changed since {self.path} was written")
+        self.rows, self.failed, self.offset = saved['rows'], saved['failed'], saved['offset']
+        return True
+
+    def save(self, complete: bool = False):
+        state = {'settings': self.settings, 'rows': self.rows, 'failed': self.failed,
+                 'offset': self.offset, 'complete': complete}
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(self.path + '.tmp', self.path)
+
+
+def score_file(input_path: str, output: str, input_format: Optional[str] = None,
+               output_format: Optional[str] = None, workers: Optional[int] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, top_k: int = 1, fields: Optional[Sequence[str]] = DEFAULT_FIELDS,
+               id_field: str = 'id', separator: str = ';', artifact_dir: Optional[str] = None,
+               resume: bool = False, overwrite: bool = False, report_seconds: float = 10.0) -> Dict[str, Any]:
+    """
+    Score every record of input_path into output
+
+    Args:
+        input_format, output_format: Default from the file extensions
+        workers: Scoring processes (default: CPU count)
+        chunk_size: Rows per worker task, and per Parquet part file
+        top_k: Differential size of every prediction (see SymptomPredictor.predict)
+        fields: Prediction fields to write; None writes the full result
+        artifact_dir: Model artifact the workers load (default: resolve_artifact_dir)
+        resume: Continue from <output>.progress instead of starting over
+        overwrite: Replace an existing output when not resuming
+        report_seconds: Interval of the progress lines on stderr; 0 disables them
+
+    Returns:
+        Summary with the rows written, failed rows and rows per second
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+    input_format = input_format or detect_format(input_path, INPUT_FORMATS)
+    output_format = output_format or detect_format(output, OUTPUT_FORMATS)
+    workers = workers or os.cpu_count() or 1
+    stat = os.stat(input_path)
+    progress = Progress(output, {
+        'input': os.path.abspath(input_path), 'input_size': stat.st_size, 'input_mtime_ns': stat.st_mtime_ns,
+        'input_format': input_format, 'output_format': output_format, 'chunk_size': chunk_size,
+        'top_k': top_k, 'fields': list(fields) if fields is not None else None,
+        'id_field': id_field, 'separator': separator,
+    })
+
+    if resume and progress.load():
+        if output_format == 'jsonl':
+            # Drop anything written after the checkpoint
+            with open(output, 'r+b') as f:
+                f.truncate(progress.offset)
+    elif os.path.exists(output) or os.path.exists(progress.path):
+        if not overwrite:
+            if resume:
+                raise ValueError(f"Cannot resume: {output} exists but {progress.path} does not; "
+                                 f"pass --overwrite to start over")
+            raise ValueError(f"{output} exists; pass --resume to continue it or --overwrite to replace it")
+        if os.path.isdir(output):
+            shutil.rmtree(output)
+        elif os.path.exists(output):
+            os.remove(output)
+    if output_format == 'parquet':
+        os.makedirs(output, exist_ok=True)
+    resumed_rows = progress.rows
+
+    started = last_report = time.perf_counter()
+    sink = open(output, 'ab') if output_format == 'jsonl' else None
+    pending: Deque[Future] = collections.deque()
+
+    def write_oldest():
+        nonlocal last_report
+        rows, failed, payload = pending.popleft().result()
+        if sink is not None:
+            sink.write(payload)
+            sink.flush()
+            progress.offset += len(payload)
+        progress.rows += rows
+        progress.failed += failed
+        progress.save()
+        now = time.perf_counter()
+        if report_seconds and now - last_report >= report_seconds:
+            last_report = now
+            print(f"{progress.rows} rows, {(progress.rows - resumed_rows) / (now - started):.0f} rows/s",
+                  file=sys.stderr, flush=True)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(artifact_dir,)) as pool:
+            records = read_records(input_path, input_format, id_field, separator)
+            for start, chunk in chunked(records, chunk_size, skip=progress.rows):
+                pending.append(pool.submit(_score_chunk, start, chunk, top_k, fields, output_format, output))
+                if len(pending) >= workers * CHUNKS_PER_WORKER:
+                    write_oldest()
+            while pending:
+                write_oldest()
+    finally:
+        if sink is not None:
+            sink.close()
+    progress.save(complete=True)
+
+    seconds = time.perf_counter() - started
+    scored = progress.rows - resumed_rows
+    return {
+        'rows': progress.rows,
+        'failed': progress.failed,
+        'resumed_from': resumed_rows,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(scored / seconds, 1) if seconds else 0.0,
+        'workers': workers,
+        'output': output,
+    }
+
+
+def _bounded_int(low: int, high: Optional[int] = None):
+    """argparse type for an integer between low and high"""
+    def parse(text: str) -> int:
+        value = int(text)
+        if value < low or (high is not None and value > high):
+            bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+            raise argparse.ArgumentTypeError(f"must be {bounds}, got {value}")
+        return value
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV or JSONL file of symptom records in bulk")
+    parser.add_argument('input', help="CSV or JSONL file, optionally .gz")
+    parser.add_argument('output', help=".jsonl file or .parquet directory")
+    parser.add_argument('--input-format', choices=INPUT_FORMATS, help="default: from the input extension")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, help="default: from the output extension")
+    parser.add_argument('--workers', type=_bounded_int(1), help="scoring processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=_bounded_int(1), default=DEFAULT_CHUNK_SIZE,
+                        help="rows per worker task")
+    parser.add_argument('--top-k', type=_bounded_int(1, MAX_TOP_K), default=1,
+                        help=f"differential size, 1 to {MAX_TOP_K} (default 1: none)")
+    parser.add_argument('--fields', help="comma-separated prediction fields, or 'all' (default: "
+                                         + ','.join(DEFAULT_FIELDS) + ")")
+    parser.add_argument('--id-field', default='id', help="input column or key copied to the output")
+    parser.add_argument('--separator', default=';', help="separator of a CSV 'symptoms' column")
+    parser.add_argument('--artifact', help="model artifact directory (default: LATEST)")
+    parser.add_argument('--resume', action='store_true', help="continue from <output>.progress")
+    parser.add_argument('--overwrite', action='store_true', help="replace an existing output")
+    parser.add_argument('--report-seconds', type=float, default=10.0, help="progress interval, 0 for none")
+    args = parser.parse_args()
+
+    if args.fields == 'all':
+        fields = None
+    elif args.fields:
+        fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+    else:
+        fields = DEFAULT_FIELDS
+    try:
+        summary = score_file(args.input, args.output, args.input_format, args.output_format, args.workers,
+                             args.chunk_size, args.top_k, fields, args.id_field, args.separator,
+                             args.artifact, args.resume, args.overwrite, args.report_seconds)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    print(f"Scored {summary['rows']} rows ({summary['failed']} failed) into {summary['output']}")
+    if summary['resumed_from']:
+        print(f"Resumed after row {summary['resumed_from']}")
+    print(f"{summary['seconds']:.1f} s, {summary['rows_per_second']:.0f} rows/s on {summary['workers']} workers")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Symptom co-occurrence index for the ML service
+Counts from Training.csv are compressed once at load time into two sparse
+matrices: disease x symptom (rows of each disease reporting a symptom) and
+symptom x symptom (rows reporting both). /symptoms/related sums a few rows
+of them per request instead of scanning the dataset.
+
+symptoms_df.csv holds the same records cut to their first four symptoms,
+so Training.csv alone is counted, as the deduplicated rows the predictor
+loads with its artifact.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from symptom_predictor import SymptomPredictor, get_predictor
+from train_model import TrainingSet, check_feature_order
+
+# Default and largest number of suggestions returned by /symptoms/related
+RELATED_LIMIT = 10
+MAX_RELATED_LIMIT = 50
+
+# Diseases named as the context of each suggestion
+DISEASES_PER_SUGGESTION = 3
+
+
+class CSRMatrix:
+    """Compressed sparse rows: row i is indices[indptr[i]:indptr[i + 1]] with data alongside"""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: Sequence[int]):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = tuple(shape)
+        # Row of every stored entry, so a vector-matrix product is one bincount
+        self.row_ids = np.repeat(np.arange(self.shape[0], dtype=_index_dtype(self.shape[0])), np.diff(indptr))
+
+    @classmethod
+    def from_dense(cls, dense: np.ndarray) -> 'CSRMatrix':
+        """Compress a dense matrix of non-negative counts with the smallest dtypes that hold it"""
+        rows, cols = np.nonzero(dense)
+        values = dense[rows, cols]
+        indptr = np.zeros(dense.shape[0] + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=dense.shape[0]), out=indptr[1:])
+        return cls(indptr, cols.astype(_index_dtype(dense.shape[1])),
+                   values.astype(np.min_scalar_type(int(values.max(initial=0)))), dense.shape)
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(column indices, values) of row i"""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def vecmat(self, vector: np.ndarray, data: Optional[np.ndarray] = None) -> np.ndarray:
+        """vector @ matrix as a dense row; data replaces the stored values (same entries) when given"""
+        values = self.data if data is None else data
+        return np.bincount(self.indices, weights=values * vector[self.row_ids], minlength=self.shape[1])
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes + self.row_ids.nbytes
+
+
+def _index_dtype(size: int) -> np.dtype:
+    return np.min_scalar_type(max(size - 1, 0))
+
+
+class CooccurrenceIndex:
+    """Sparse disease/symptom counts answering related-symptom queries"""
+
+    def __init__(self, data: TrainingSet, disease_names: Dict[int, str], symptom_entries: List[Dict[str, Any]]):
+        problems = check_feature_order(data.features)
+        if problems:
+            raise ValueError("Training data does not match SYMPTOMS_LIST:\n  " + "\n  ".join(problems))
+        n_classes = int(data.y.max()) + 1
+        X = data.X.astype(np.int64)
+        counts = data.counts.astype(np.int64)
+
+        # Every count is over Training.csv rows, so patterns are weighted by occurrences
+        weighted = X * counts[:, np.newaxis]
+        disease_symptom = np.zeros((n_classes, X.shape[1]), dtype=np.int64)
+        np.add.at(disease_symptom, data.y, weighted)
+        cooccurrence = weighted.T @ X
+        self.symptom_counts = np.diag(cooccurrence).copy()
+        np.fill_diagonal(cooccurrence, 0)
+        self.disease_counts = np.bincount(data.y, weights=counts, minlength=n_classes)
+
+        self.disease_symptom = CSRMatrix.from_dense(disease_symptom)
+        # The same counts by symptom, for the diseases behind given symptoms
+        self.symptom_disease = CSRMatrix.from_dense(disease_symptom.T)
+        self.cooccurrence = CSRMatrix.from_dense(cooccurrence)
+        self._log_counts = np.log1p(self.symptom_disease.data)
+        self.disease_names = [disease_names.get(code, 'Unknown') for code in range(n_classes)]
+        self.symptom_entries = {entry['index']: entry for entry in symptom_entries}
+
+    @classmethod
+    def from_predictor(cls, predictor: SymptomPredictor) -> 'CooccurrenceIndex':
+        return cls(predictor.load_training_set(), predictor.diseases_list, predictor.symptom_search.entries)
+
+    def disease_weights(self, active: Sequence[int]) -> np.ndarray:
+        """P(disease | active symptoms), treating symptoms as independent given the disease"""
+        # Add-one smoothing keeps a disease missing one symptom possible:
+        # P(s | d) = (count + 1) / (rows + 2)
+        selected = np.zeros(self.symptom_disease.shape[0])
+        selected[active] = 1.0
+        log_weight = (np.log(self.disease_counts + 1.0) - len(active) * np.log(self.disease_counts + 2.0)
+                      + self.symptom_disease.vecmat(selected, self._log_counts))
+        weight = np.exp(log_weight - log_weight.max())
+        return weight / weight.sum()
+
+    def related(self, active: Sequence[int], limit: int = RELATED_LIMIT,
+                exclude: Sequence[int] = ()) -> List[Dict[str, Any]]:
+        """Symptoms most likely reported along with all the active ones, best first
+
+        score estimates P(symptom | active symptoms) as the disease-weighted
+        mean of P(symptom | disease). Only symptoms that Training.csv rows
+        report together with an active one are suggested; co_occurrence is
+        the mean over the active symptoms s of P(symptom | s). Each
+        suggestion names the diseases contributing most to its score.
+        """
+        active = sorted(set(active))
+        if not active:
+            return []
+        weight = self.disease_weights(active)
+        per_row = weight / np.maximum(self.disease_counts, 1)
+        score = self.disease_symptom.vecmat(per_row)
+
+        inverse = np.zeros(self.cooccurrence.shape[0])
+        inverse[active] = 1.0 / np.maximum(self.symptom_counts[active], 1)
+        direct = self.cooccurrence.vecmat(inverse) / len(active)
+        score[direct == 0] = 0.0
+        score[active] = 0.0
+        score[[idx for idx in exclude if 0 <= idx < len(score)]] = 0.0
+        ranked = np.lexsort((-direct, -score))[:limit]
+        ranked = ranked[score[ranked] > 0]
+
+        # Disease contributions of every suggestion at once: entries of the
+        # suggested symptom rows, best first within each suggestion
+        matrix = self.symptom_disease
+        rank_of = np.full(matrix.shape[0], -1)
+        rank_of[ranked] = np.arange(len(ranked))
+        entries = np.flatnonzero(rank_of[matrix.row_ids] >= 0)
+        owner = rank_of[matrix.row_ids[entries]]
+        diseases = matrix.indices[entries]
+        share = per_row[diseases] * matrix.data[entries]
+        order = np.lexsort((-share, owner))
+        owner, diseases, share = owner[order], diseases[order], share[order]
+        position = np.arange(len(owner)) - np.searchsorted(owner, owner)
+        keep = (position < DISEASES_PER_SUGGESTION) & (share > 1e-6)
+        named: List[List[str]] = [[] for _ in ranked]
+        for rank, disease in zip(owner[keep].tolist(), diseases[keep].tolist()):
+            named[rank].append(self.disease_names[disease])
+
+        return [
+            {**self.symptom_entries[idx], 'score': round(value, 4), 'co_occurrence': round(together, 4),
+             'diseases': names}
+            for idx, value, together, names in zip(ranked.tolist(), score[ranked].tolist(),
+                                                   direct[ranked].tolist(), named)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the sparse matrices next to their dense equivalents"""
+        matrices = {'disease_symptom': self.disease_symptom, 'symptom_disease': self.symptom_disease,
+                    'cooccurrence': self.cooccurrence}
+        nbytes = sum(matrix.nbytes for matrix in matrices.values())
+        nbytes += self.symptom_counts.nbytes + self.disease_counts.nbytes + self._log_counts.nbytes
+        return {
+            'nbytes': nbytes,
+            'matrices': {
+                name: {
+                    'shape': list(matrix.shape),
+                    'nnz': matrix.nnz,
+                    'density': round(matrix.nnz / (matrix.shape[0] * matrix.shape[1]), 4),
+                    'nbytes': matrix.nbytes,
+                    'dense_nbytes': matrix.shape[0] * matrix.shape[1] * 8,
+                }
+                for name, matrix in matrices.items()
+            },
+        }
+
+
+# Create singleton instance
+_index = None
+_index_lock = threading.Lock()
+
+def get_cooccurrence_index() -> CooccurrenceIndex:
+    """Get or create the co-occurrence index over the shared predictor's vocabulary"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CooccurrenceIndex.from_predictor(get_predictor())
+    return _index
@@ -0,0 +1,153 @@
+"""
+Precomputed disease knowledge for the ML service
+Every supported disease is materialized once at load time into an immutable
+record, so building a response is a dict lookup instead of DataFrame scans
+"""
+
+import ast
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Set, Tuple
+
+from serialization import dumps
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NO_DESCRIPTION = "No description available."
+
+
+class DiseaseRecord:
+    """Immutable description, care advice and triage data for one disease"""
+
+    __slots__ = ('name', 'description', 'precautions', 'medications', 'diet',
+                 'workout', 'specialist', 'severity', 'json')
+
+    def __init__(self, name: str, description: str, precautions: Iterable[str],
+                 medications: Iterable[Any], diet: Iterable[Any], workout: Iterable[str],
+                 specialist: str, severity: str):
+        values = {
+            'name': name,
+            'description': description,
+            'precautions': tuple(precautions),
+            'medications': tuple(medications),
+            'diet': tuple(diet),
+            'workout': tuple(workout),
+            'specialist': specialist,
+            'severity': severity,
+        }
+        for slot, value in values.items():
+            object.__setattr__(self, slot, value)
+        # Pre-serialized GET /disease/{name} body, byte-identical to JSONResponse
+        object.__setattr__(self, 'json', dumps(self.detail()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"DiseaseRecord({self.name!r})"
+
+    def info(self) -> Dict[str, Any]:
+        """Fresh get_disease_info() dict (lists are copies, safe to mutate)"""
+        return {
+            'description': self.description,
+            'precautions': list(self.precautions),
+            'medications': list(self.medications),
+            'diet': list(self.diet),
+            'workout': list(self.workout)
+        }
+
+    def detail(self) -> Dict[str, Any]:
+        """Fresh GET /disease/{name} response dict"""
+        detail = self.info()
+        detail['name'] = self.name
+        detail['severity'] = self.severity
+        detail['specialist'] = self.specialist
+        return detail
+
+
+def extract_disease_info(disease: str, description: 'pd.DataFrame', precautions: 'pd.DataFrame',
+                         medications: 'pd.DataFrame', diets: 'pd.DataFrame',
+                         workout: 'pd.DataFrame') -> Dict[str, Any]:
+    """Get comprehensive information about a disease from the raw datasets"""
+    import pandas as pd
+
+    # Description
+    desc_row = description[description['Disease'] == disease]
+    desc = desc_row['Description'].values[0] if len(desc_row) > 0 else NO_DESCRIPTION
+
+    # Precautions
+    prec_row = precautions[precautions['Disease'] == disease]
+    prec = []
+    if len(prec_row) > 0:
+        for col in ['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']:
+            if col in prec_row.columns and pd.notna(prec_row[col].values[0]):
+                prec.append(prec_row[col].values[0])
+
+    # Medications
+    med_row = medications[medications['Disease'] == disease]
+    meds = []
+    if len(med_row) > 0:
+        try:
+            med_list = ast.literal_eval(med_row['Medication'].values[0])
+            meds = med_list if isinstance(med_list, list) else [med_list]
+        except (ValueError, SyntaxError):
+            meds = []
+
+    # Diet
+    diet_row = diets[diets['Disease'] == disease]
+    diet = []
+    if len(diet_row) > 0:
+        try:
+            diet_list = ast.literal_eval(diet_row['Diet'].values[0])
+            diet = diet_list if isinstance(diet_list, list) else [diet_list]
+        except (ValueError, SyntaxError):
+            diet = []
+
+    # Workout
+    workout_row = workout[workout['disease'] == disease]
+    workouts = workout_row['workout'].tolist() if len(workout_row) > 0 else []
+
+    return {
+        'description': desc,
+        'precautions': prec,
+        'medications': meds,
+        'diet': diet,
+        'workout': workouts
+    }
+
+
+def build_disease_records(diseases: Iterable[str], specialists: Dict[str, str],
+                          severities: Dict[str, str],
+                          frames: Tuple['pd.DataFrame', ...]) -> Dict[str, DiseaseRecord]:
+    """Materialize a record per disease from (description, precautions, medications, diets, workout)"""
+    records = {}
+    for disease in diseases:
+        info = extract_disease_info(disease, *frames)
+        records[disease] = DiseaseRecord(
+            name=disease,
+            description=str(info['description']),
+            precautions=[str(p) for p in info['precautions']],
+            medications=info['medications'],
+            diet=info['diet'],
+            workout=[str(w) for w in info['workout']],
+            specialist=specialists.get(disease, 'General Physician'),
+            severity=severities.get(disease, 'moderate')
+        )
+    return records
+
+
+def knowledge_names(frames: Tuple['pd.DataFrame', ...]) -> Set[str]:
+    """Every disease name that appears in (description, precautions, medications, diets, workout)"""
+    description, precautions, medications, diets, workout = frames
+    names = set()
+    for frame, column in ((description, 'Disease'), (precautions, 'Disease'), (medications, 'Disease'),
+                          (diets, 'Disease'), (workout, 'disease')):
+        names.update(str(name) for name in frame[column].dropna())
+    return names
+
+
+def empty_record(disease: str) -> DiseaseRecord:
+    """Record for a disease that has no entry in the knowledge datasets"""
+    return DiseaseRecord(disease, NO_DESCRIPTION, [], [], [], [], 'General Physician', 'moderate')
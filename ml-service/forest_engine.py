@@ -0,0 +1,169 @@
+"""
+Compiled Random Forest evaluator for the ML service
+Flattens every tree of a fitted RandomForestClassifier into contiguous NumPy
+node arrays and evaluates all trees for a batch of rows with vectorized
+gathers, skipping sklearn's input validation and per-tree dispatch.
+Probabilities are summed in tree order exactly like
+RandomForestClassifier.predict_proba, so both engines agree bit for bit.
+
+Node layout (split nodes of all trees share one index):
+    feature    feature tested by each split node
+    threshold  go right when x[feature] > threshold
+    children   [left, right] per split node, flattened; a negative entry ~i
+               is leaf i
+    value      class probabilities of every leaf
+    roots      root of every tree, encoded like children
+"""
+
+import os
+from typing import Any, List, Optional
+
+import numpy as np
+
+# 'sklearn' calls the fitted model; 'numpy' evaluates the flattened node arrays
+FOREST_ENGINES = ('sklearn', 'numpy')
+
+# Batches up to this size gather every leaf row at once; larger ones
+# accumulate tree by tree to keep the working set small
+SMALL_BATCH = 64
+
+_ARRAYS = ('feature', 'threshold', 'children', 'value', 'roots', 'classes_')
+
+
+class FlatForest:
+    """A fitted forest as flat node arrays, exposing the model's predict_proba/predict"""
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, classes_: np.ndarray, n_features: int):
+        # asarray keeps memory-mapped arrays of the right dtype mapped
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.children = np.asarray(children, dtype=np.intp)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.classes_ = np.asarray(classes_)
+        self.n_features_in_ = n_features
+        self.n_estimators = len(roots)
+        # With 0/1 features every threshold lies strictly between 0 and 1, so
+        # the feature bit itself selects the child
+        self.binary_splits = bool(np.all((self.threshold > 0) & (self.threshold < 1)))
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> 'FlatForest':
+        """Flatten the estimators_ of a fitted single-output forest classifier"""
+        n_classes = len(model.classes_)
+        feature, threshold, children, values, roots = [], [], [], [], []
+        n_splits = n_leaves = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            # Split nodes continue the shared index, leaves become ~leaf
+            ids = np.empty(tree.node_count, dtype=np.intp)
+            ids[~is_leaf] = np.arange(n_splits, n_splits + int((~is_leaf).sum()))
+            ids[is_leaf] = ~np.arange(n_leaves, n_leaves + int(is_leaf.sum()))
+            n_splits += int((~is_leaf).sum())
+            n_leaves += int(is_leaf.sum())
+
+            feature.append(tree.feature[~is_leaf])
+            threshold.append(tree.threshold[~is_leaf])
+            children.append(np.column_stack([ids[tree.children_left[~is_leaf]],
+                                             ids[tree.children_right[~is_leaf]]]).ravel())
+            roots.append(ids[0])
+
+            proba = np.array(tree.value[is_leaf, 0, :n_classes], dtype=np.float64)
+            if not np.allclose(proba.sum(axis=1), 1.0):
+                # Older scikit-learn keeps class weights in the leaves and
+                # normalizes them in DecisionTreeClassifier.predict_proba
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                proba /= normalizer
+            values.append(proba)
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            children=np.concatenate(children),
+            value=np.concatenate(values),
+            roots=np.array(roots),
+            classes_=np.asarray(model.classes_),
+            n_features=int(model.n_features_in_),
+        )
+
+    def save(self, path: str) -> List[str]:
+        """Write every node array to its own .npy file in directory path; the file names"""
+        os.makedirs(path, exist_ok=True)
+        arrays = {'n_features': np.array(self.n_features_in_), **{name: getattr(self, name) for name in _ARRAYS}}
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + '.npy'), array)
+        return [name + '.npy' for name in arrays]
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r') -> 'FlatForest':
+        """Load a directory written by save, memory-mapping the node arrays
+
+        Mapped read-only, the pages are shared by every process that loads
+        the same files. A .npz file (older artifacts) is read into memory.
+        """
+        if path.endswith('.npz'):
+            with np.load(path, allow_pickle=False) as data:
+                return cls(n_features=int(data['n_features']), **{name: data[name] for name in _ARRAYS})
+        arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in _ARRAYS}
+        n_features = int(np.load(os.path.join(path, 'n_features.npy'), allow_pickle=False))
+        return cls(n_features=n_features, **arrays)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf (row of value) reached in every tree, shape (n_rows, n_trees)"""
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected rows of {self.n_features_in_} features, got shape {X.shape}")
+        bitwise = (self.binary_splits and X.dtype in (np.uint8, np.bool_)
+                   and X.view(np.uint8).max(initial=0) <= 1)
+        flat = (X.view(np.uint8) if bitwise else X.astype(np.float32)).ravel()
+
+        # Walk all (row, tree) pairs down together, dropping pairs as they
+        # reach a leaf so only the rows that go deep pay for deep trees
+        n_rows, n_trees = len(X), self.n_estimators
+        node = np.tile(self.roots, n_rows)
+        offset = np.repeat(np.arange(n_rows, dtype=np.intp) * X.shape[1], n_trees)
+        pair = np.arange(n_rows * n_trees)
+        leaves = np.empty(n_rows * n_trees, dtype=np.intp)
+        while len(node):
+            done = node < 0
+            if done.any():
+                leaves[pair[done]] = ~node[done]
+                active = ~done
+                node, offset, pair = node[active], offset[active], pair[active]
+                if not len(node):
+                    break
+            step = flat[offset + self.feature[node]]
+            if not bitwise:
+                step = step > self.threshold[node]
+            node = self.children[2 * node + step]
+        return leaves.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Mean leaf probabilities over the trees, summed in tree order like scikit-learn"""
+        leaves = self.apply(X)
+        if len(leaves) <= SMALL_BATCH:
+            # Reducing over the tree axis (not the innermost one) adds the
+            # trees one after another, the same order as the loop below
+            proba = self.value[leaves].sum(axis=1)
+        else:
+            proba = np.zeros((len(leaves), self.value.shape[1]), dtype=np.float64)
+            for tree in range(self.n_estimators):
+                proba += self.value[leaves[:, tree]]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def mismatched_rows(model: Any, forest: FlatForest, X: np.ndarray, chunk_size: int = 1024) -> int:
+    """Rows of X on which the flattened forest's probabilities differ from the model's"""
+    mismatches = 0
+    for start in range(0, len(X), chunk_size):
+        chunk = X[start:start + chunk_size]
+        mismatches += int(np.any(model.predict_proba(chunk) != forest.predict_proba(chunk), axis=1).sum())
+    return mismatches
@@ -0,0 +1,216 @@
+"""
+Hot model reload for the ML service
+Loads a new artifact (model plus data bundle) next to the one serving,
+checks it against a smoke set and swaps it in as the shared predictor.
+Requests that already fetched the old predictor finish on it; new ones get
+the new version. The cost depends on the forest engine: with
+ML_FOREST_ENGINE=numpy the forest arrays are memory-mapped, so loading costs
+little more than parsing tables.json; the default sklearn engine unpickles
+every tree, and with the process executor each restarted worker does so
+again. Validation then scores the smoke set once.
+
+A reload is started by POST /admin/reload or, in watch mode, by
+artifacts/LATEST naming a new version. Each uvicorn worker process holds
+its own predictor: with several workers, use watch mode so every worker
+follows LATEST.
+
+Configuration (environment, read by api.py):
+    ML_RELOAD_WATCH     seconds between checks of artifacts/LATEST; unset or 0 disables watching
+    ML_ADMIN_TOKEN      token the admin endpoints expect in X-Admin-Token; unset disables them
+"""
+
+import collections
+import datetime
+import os
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model_artifact import ARTIFACT_ROOT, latest_version, verify_artifact
+from symptom_predictor import SymptomPredictor, create_predictor, get_predictor, swap_predictor
+
+# Share of the smoke set a new model must classify correctly
+SMOKE_MIN_ACCURACY = 0.95
+
+# Reload attempts kept for GET /admin/reload
+HISTORY_SIZE = 20
+
+
+class ReloadInProgress(Exception):
+    """Raised when a reload is requested while another one is running"""
+
+
+def load_smoke_set(predictor: SymptomPredictor) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct Training.csv symptom patterns with their class codes, as the predictor loaded them"""
+    data = predictor.load_training_set()
+    return data.X, data.y
+
+
+def validate_predictor(predictor: SymptomPredictor, smoke: Tuple[np.ndarray, np.ndarray],
+                       reference: Optional[SymptomPredictor] = None,
+                       min_accuracy: float = SMOKE_MIN_ACCURACY) -> Dict[str, Any]:
+    """Check a freshly loaded predictor before it serves traffic
+
+    The model must classify at least min_accuracy of the smoke patterns and
+    every pattern must come back as a complete prediction through
+    predict_batch. Against the serving predictor (reference) the symptom list
+    must be unchanged, since clients and sessions hold symptom indices; the
+    share of smoke patterns on which both models agree is reported for
+    canary comparison.
+    """
+    started = time.perf_counter()
+    X, y = smoke
+    report: Dict[str, Any] = {'cases': len(X), 'accuracy': None, 'agreement': None, 'problems': []}
+    problems = report['problems']
+    if len(predictor.symptom_names) != X.shape[1]:
+        problems.append(f"model has {len(predictor.symptom_names)} symptoms, smoke set {X.shape[1]}")
+    elif reference is not None and predictor.symptom_names != reference.symptom_names:
+        problems.append("symptom list differs from the serving model")
+    else:
+        codes = np.asarray(predictor.model.predict(X))
+        report['accuracy'] = round(float(np.mean(codes == y)), 4)
+        if report['accuracy'] < min_accuracy:
+            problems.append(f"smoke accuracy {report['accuracy']} below {min_accuracy}")
+        if reference is not None:
+            report['agreement'] = round(float(np.mean(codes == np.asarray(reference.model.predict(X)))), 4)
+        results = predictor.predict_batch([None] * len(X), [np.flatnonzero(row).tolist() for row in X])
+        failed = sum(not result['success'] for result in results)
+        if failed:
+            problems.append(f"{failed} smoke patterns returned no prediction")
+    report['passed'] = not problems
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+
+class ModelReloader:
+    """Loads, validates and swaps in new artifacts, one reload at a time
+
+    on_activate callbacks get the validated predictor before it replaces the
+    shared one (e.g. to restart process workers on it); one that raises
+    fails the reload and leaves the serving predictor in place.
+    """
+
+    def __init__(self, root: str = ARTIFACT_ROOT, min_accuracy: float = SMOKE_MIN_ACCURACY,
+                 on_activate: Optional[List[Callable[[SymptomPredictor], None]]] = None):
+        self.root = root
+        self.min_accuracy = min_accuracy
+        self.on_activate = list(on_activate or [])
+        self.history: Deque[Dict[str, Any]] = collections.deque(maxlen=HISTORY_SIZE)
+        self.current: Optional[Dict[str, Any]] = None
+        self.counts: Dict[str, int] = {'swapped': 0, 'rejected': 0, 'failed': 0, 'unchanged': 0}
+        self._smoke: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._running = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.watch_seconds: Optional[float] = None
+
+    def resolve(self, version: Optional[str] = None) -> str:
+        """Directory of an artifact version under root (default: the one LATEST names)"""
+        version = version or latest_version(self.root)
+        if not version:
+            raise ValueError(f"No artifact version given and {self.root} has no LATEST")
+        if os.path.basename(version) != version or version in ('.', '..'):
+            raise ValueError(f"Invalid artifact version {version!r}")
+        path = os.path.join(self.root, version)
+        if not os.path.isdir(path):
+            raise ValueError(f"Artifact {version} not found")
+        return path
+
+    def start(self, version: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Begin a reload on a background thread; the attempt record it fills in"""
+        path = self.resolve(version)
+        if not self._running.acquire(blocking=False):
+            raise ReloadInProgress("Another reload is in progress")
+        attempt = self._attempt(path)
+        threading.Thread(target=self._reload, args=(attempt, force), name='model-reload', daemon=True).start()
+        return dict(attempt)
+
+    def reload(self, version: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Reload on the calling thread and return the finished attempt"""
+        path = self.resolve(version)
+        if not self._running.acquire(blocking=False):
+            raise ReloadInProgress("Another reload is in progress")
+        attempt = self._attempt(path)
+        self._reload(attempt, force)
+        return dict(attempt)
+
+    def _attempt(self, path: str) -> Dict[str, Any]:
+        self.current = {
+            'version': os.path.basename(path),
+            'path': path,
+            'status': 'loading',
+            'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        return self.current
+
+    def _reload(self, attempt: Dict[str, Any], force: bool):
+        """Load, validate and swap; the lock is held by the caller and released here"""
+        started = time.perf_counter()
+        try:
+            serving = get_predictor()
+            if attempt['version'] == serving.version and not force:
+                attempt['status'] = 'unchanged'
+                return
+            problems = verify_artifact(attempt['path'])
+            if problems:
+                attempt.update(status='rejected', problems=problems)
+                return
+            predictor = create_predictor(attempt['path'])
+            attempt['load_seconds'] = round(predictor.load_seconds, 3)
+            if self._smoke is None:
+                self._smoke = load_smoke_set(serving)
+            attempt['smoke'] = validate_predictor(predictor, self._smoke, serving, self.min_accuracy)
+            if not attempt['smoke']['passed']:
+                attempt['status'] = 'rejected'
+                return
+            for callback in self.on_activate:
+                callback(predictor)
+            previous = swap_predictor(predictor)
+            attempt.update(status='swapped', previous_version=previous.version if previous else None)
+        except Exception as e:
+            attempt.update(status='failed', error=f"{type(e).__name__}: {e}")
+        finally:
+            attempt['seconds'] = round(time.perf_counter() - started, 3)
+            self.counts[attempt['status']] += 1
+            self.history.appendleft(attempt)
+            self.current = None
+            self._running.release()
+
+    def watch(self, interval: float):
+        """Reload whenever LATEST names a version other than the serving one, checking every interval seconds"""
+        if self._watcher is not None:
+            return
+        self.watch_seconds = interval
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name='model-watch', daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval: float):
+        # A version that failed is retried only once LATEST changes again
+        tried = None
+        while not self._stop.wait(interval):
+            version = latest_version(self.root)
+            if not version or version in (tried, get_predictor().version):
+                continue
+            tried = version
+            try:
+                self.reload(version)
+            except (ReloadInProgress, ValueError):
+                tried = None
+
+    def stop(self):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'serving_version': get_predictor().version,
+            'in_progress': dict(self.current) if self.current else None,
+            'watch_seconds': self.watch_seconds,
+            'results': dict(self.counts),
+            'history': list(self.history),
+        }
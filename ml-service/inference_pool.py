@@ -0,0 +1,138 @@
+"""
+Bounded inference executor for the ML service
+Runs CPU-bound prediction work off the event loop on a thread or process
+pool, and rejects new work immediately once the pool and its queue are full
+
+Configuration (environment):
+    ML_INFERENCE_EXECUTOR   'thread' (default) or 'process'
+    ML_INFERENCE_WORKERS    pool size (default: min(4, CPU count))
+    ML_INFERENCE_QUEUE      requests allowed to wait for a free worker (default 64)
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+EXECUTOR_KINDS = ('thread', 'process')
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the queue is full"""
+
+
+def _load_predictor(artifact_dir: Optional[str] = None):
+    """Process worker initializer: load the model once before taking work
+
+    artifact_dir is given when the workers are restarted after a reload.
+    """
+    from symptom_predictor import create_predictor, get_predictor, swap_predictor
+    if artifact_dir is None:
+        get_predictor()
+    else:
+        swap_predictor(create_predictor(artifact_dir))
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+class InferencePool:
+    """Thread or process pool with a bounded number of in-flight requests"""
+
+    def __init__(self, kind: str = 'thread', workers: Optional[int] = None, queue_size: int = 64):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Executor kind must be one of {EXECUTOR_KINDS}")
+        self.kind = kind
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.queue_size = queue_size
+        self._executor: Optional[Executor] = None
+        # Guards replacing the executor against submits to the old one
+        self._lock = threading.Lock()
+
+        # Only touched from the event loop thread
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> 'InferencePool':
+        workers = os.environ.get('ML_INFERENCE_WORKERS')
+        return cls(
+            kind=os.environ.get('ML_INFERENCE_EXECUTOR', 'thread'),
+            workers=int(workers) if workers else None,
+            queue_size=int(os.environ.get('ML_INFERENCE_QUEUE', '64'))
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Requests that may be running or waiting at once"""
+        return self.workers + self.queue_size
+
+    def _process_executor(self, artifact_dir: Optional[str] = None) -> Executor:
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_load_predictor,
+                                       initargs=(artifact_dir,))
+        # Each submit spawns a worker until the pool is full; the
+        # initializer runs before a worker accepts its first task
+        try:
+            for future in wait([executor.submit(_worker_ready) for _ in range(self.workers)]).done:
+                future.result()
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor
+
+    def start(self):
+        """Create the executor; process workers load the model before this returns"""
+        if self._executor is not None:
+            return
+        if self.kind == 'process':
+            self._executor = self._process_executor()
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='inference')
+
+    def restart(self, artifact_dir: str):
+        """Replace process workers with ones serving artifact_dir
+
+        The new workers load before the swap; calls already submitted finish
+        on the old workers. Thread workers share the process's predictor, so
+        they need no restart.
+        """
+        if self.kind != 'process' or self._executor is None:
+            return
+        executor = self._process_executor(artifact_dir)
+        with self._lock:
+            previous, self._executor = self._executor, executor
+        previous.shutdown(wait=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool, raising PoolSaturated instead of queueing past capacity"""
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.in_flight} inference requests in flight")
+        self.start()
+        self.in_flight += 1
+        try:
+            with self._lock:
+                future = self._executor.submit(fn, *args)
+            return await asyncio.wrap_future(future)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'executor': self.kind,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,296 @@
+"""
+Incremental symptom interview for the ML service
+A session keeps the resolved present/absent symptom bitsets, its current
+prediction and a weight per distinct Training.csv pattern. Each answer only
+resolves the new symptoms, rescales the pattern weights and re-runs the
+forest when the present set changed. The next question is the unasked
+symptom with the highest expected information gain about the disease,
+computed in one vectorized pass over the weighted training matrix.
+
+Sessions live in the memory of one API process; with several uvicorn
+workers, clients must be routed to the same worker for a session. The
+engine can hand symptom resolution and each turn's evaluation (forest pass
+and question selection) to another executor, as the API does with its
+inference pool; they only read the evidence, so a turn whose evaluation
+fails leaves the session unchanged.
+
+Configuration (environment, read by get_interview_engine):
+    ML_SESSION_TTL      idle seconds before a session expires (default 1800)
+    ML_MAX_SESSIONS     sessions kept before the least recently used is evicted (default 10000)
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from symptom_predictor import SymptomPredictor, get_predictor, resolve_request
+from train_model import TrainingSet, check_feature_order
+
+# Weight kept by a training pattern that contradicts one answer, so a single
+# unusual answer lowers a disease instead of ruling it out
+ANSWER_NOISE = 0.05
+
+# Questions with less expected information gain (bits) are not worth asking
+MIN_INFORMATION_GAIN = 1e-6
+
+DEFAULT_TTL_SECONDS = 1800.0
+DEFAULT_MAX_SESSIONS = 10000
+
+
+def _entropy(mass: np.ndarray) -> np.ndarray:
+    """Entropy in bits of each row of unnormalized class masses"""
+    total = mass.sum(axis=-1, keepdims=True)
+    p = np.divide(mass, total, out=np.zeros_like(mass), where=total > 0)
+    logs = np.log2(p, out=np.zeros_like(p), where=p > 0)
+    return -(p * logs).sum(axis=-1)
+
+
+class InterviewSession:
+    """Evidence and cached prediction of one interview"""
+
+    def __init__(self, session_id: str, n_symptoms: int, weights: np.ndarray, top_k: int):
+        self.id = session_id
+        self.present = np.zeros(n_symptoms, dtype=np.bool_)
+        self.absent = np.zeros(n_symptoms, dtype=np.bool_)
+        self.weights = weights
+        self.top_k = top_k
+        self.prediction: Optional[Dict[str, Any]] = None
+        self.turn = 0
+        self.expires_at = 0.0
+        self.lock = threading.Lock()
+
+
+class SessionStore:
+    """Bounded in-memory sessions with idle expiry and LRU eviction"""
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self._sessions: 'OrderedDict[str, InterviewSession]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _purge(self, now: float):
+        # Least recently used first, so expired sessions sit at the front
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.expires_at > now:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+
+    def add(self, session: InterviewSession):
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            session.expires_at = now + self.ttl
+            self._sessions[session.id] = session
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        """Live session by id, refreshing its expiry"""
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.expires_at = now + self.ttl
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._purge(time.monotonic())
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted,
+            }
+
+
+class InterviewEngine:
+    """Session-aware prediction with information-gain question selection"""
+
+    def __init__(self, predictor: SymptomPredictor, store: Optional[SessionStore] = None,
+                 data: Optional[TrainingSet] = None, answer_noise: float = ANSWER_NOISE,
+                 dispatch: Optional[Callable[..., Any]] = None):
+        """
+        Args:
+            data: Training rows to weigh (default: the predictor's training set)
+            dispatch: dispatch(fn, *args) runs resolve_request and
+                evaluate_session elsewhere and returns their result; by
+                default the engine resolves and evaluates inline
+        """
+        self.predictor = predictor
+        self.store = store or SessionStore()
+        self.answer_noise = answer_noise
+        self.dispatch = dispatch
+
+        if data is None:
+            data = predictor.load_training_set()
+        problems = check_feature_order(data.features)
+        if problems:
+            raise ValueError("Training data does not match SYMPTOMS_LIST:\n  " + "\n  ".join(problems))
+        # Distinct (pattern, label) rows weighted by how often they occur
+        self.patterns = data.X.astype(np.bool_)
+        self.pattern_features = data.X.astype(np.float64)
+        self.counts = np.array(data.counts)
+        self.labels = np.array(data.y)
+        self.n_classes = int(data.y.max()) + 1
+        self.class_onehot = (data.y[:, np.newaxis] == np.arange(self.n_classes)).astype(np.float64)
+
+        # Symptom entries indexed by feature, for suggested questions
+        self.symptom_entries = {entry['index']: entry for entry in predictor.symptom_search.entries}
+
+    def _class_mass(self, weights: np.ndarray) -> np.ndarray:
+        return np.bincount(self.labels, weights=weights, minlength=self.n_classes)
+
+    def information_gain(self, weights: np.ndarray) -> np.ndarray:
+        """Expected entropy reduction (bits) of asking about each symptom"""
+        mass = self._class_mass(weights)
+        # with_symptom[s, c]: weight of class c patterns that have symptom s
+        with_symptom = self.pattern_features.T @ (weights[:, np.newaxis] * self.class_onehot)
+        without_symptom = mass - with_symptom
+        total = mass.sum()
+        p_present = with_symptom.sum(axis=1) / total if total > 0 else np.zeros(len(with_symptom))
+        expected = p_present * _entropy(with_symptom) + (1 - p_present) * _entropy(without_symptom)
+        return _entropy(mass) - expected
+
+    def _next_question(self, weights: np.ndarray, asked: np.ndarray) -> Optional[Dict[str, Any]]:
+        gain = self.information_gain(weights)
+        gain[asked] = -np.inf
+        best = int(np.argmax(gain))
+        if not gain[best] > MIN_INFORMATION_GAIN:
+            return None
+        entry = self.symptom_entries[best]
+        return {**entry, 'information_gain': round(float(gain[best]), 4)}
+
+    def _apply(self, session: InterviewSession, indices: List[int],
+               present: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+        """(present, absent, weights) of the session with the answers recorded, and
+        whether the present set changed; the session itself is left as is"""
+        has, lacks, weights = session.present.copy(), session.absent.copy(), session.weights
+        changed = False
+        for idx in set(indices):
+            previous = bool(has[idx]) if has[idx] or lacks[idx] else None
+            if previous == present:
+                continue
+            factor = np.where(self.patterns[:, idx] == present, 1.0, self.answer_noise)
+            if previous is not None:
+                # A changed answer undoes the scaling of the earlier one
+                factor = factor / np.where(self.patterns[:, idx] == previous, 1.0, self.answer_noise)
+            weights = weights * factor
+            has[idx] = present
+            lacks[idx] = not present
+            changed = changed or present or previous is True
+        return has, lacks, weights, changed
+
+    def evaluate(self, present: np.ndarray, absent: np.ndarray, weights: np.ndarray, top_k: int,
+                 predict: bool) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """(prediction if predict else None, next question) for a session's evidence"""
+        prediction = None
+        if predict:
+            # One predictor for the whole prediction, even if a reload swaps it meanwhile
+            predictor = self.predictor
+            present_idx = np.flatnonzero(present).tolist()
+            prediction = predictor._predict_active(
+                present_idx, [predictor.symptom_names[i] for i in present_idx], [], top_k)
+        return prediction, self._next_question(weights, present | absent)
+
+    def _state(self, session: InterviewSession, invalid_symptoms: List[str],
+               question: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        names = self.predictor.symptom_names
+        return {
+            'session_id': session.id,
+            'turn': session.turn,
+            'present_symptoms': [names[i] for i in np.flatnonzero(session.present).tolist()],
+            'absent_symptoms': [names[i] for i in np.flatnonzero(session.absent).tolist()],
+            'invalid_symptoms': invalid_symptoms,
+            'prediction': session.prediction,
+            'next_question': question,
+            'expires_in': self.store.ttl,
+        }
+
+    def _update(self, session: InterviewSession, symptoms: Optional[List[str]],
+                symptom_indices: Optional[List[int]], present: bool) -> Dict[str, Any]:
+        if self.dispatch is None:
+            active, _, invalid_symptoms = self.predictor._active_symptoms(symptoms, symptom_indices)
+        else:
+            active, _, invalid_symptoms = self.dispatch(resolve_request, symptoms, symptom_indices)
+        has, lacks, weights, changed = self._apply(session, active, present)
+        # Absent answers leave the forest input unchanged, so only new or
+        # withdrawn present symptoms cost a forest pass
+        predict = bool(has.any()) and (changed or session.prediction is None)
+        evidence = (has, lacks, weights, session.top_k, predict)
+        if self.dispatch is None:
+            prediction, question = self.evaluate(*evidence)
+        else:
+            prediction, question = self.dispatch(evaluate_session, *evidence)
+        session.present, session.absent, session.weights = has, lacks, weights
+        if predict or not has.any():
+            session.prediction = prediction
+        session.turn += 1
+        return self._state(session, invalid_symptoms, question)
+
+    def start(self, symptoms: Optional[List[str]] = None, symptom_indices: Optional[List[int]] = None,
+              top_k: int = 5) -> Dict[str, Any]:
+        """Open a session with the initially reported symptoms"""
+        session = InterviewSession(secrets.token_urlsafe(16), len(self.predictor.symptom_names),
+                                   self.counts.copy(), top_k)
+        with session.lock:
+            state = self._update(session, symptoms, symptom_indices, present=True)
+        self.store.add(session)
+        return state
+
+    def answer(self, session_id: str, symptoms: Optional[List[str]] = None,
+               symptom_indices: Optional[List[int]] = None, present: bool = True) -> Optional[Dict[str, Any]]:
+        """Record present or absent symptoms for a session; None when it does not exist or expired"""
+        session = self.store.get(session_id)
+        if session is None:
+            return None
+        with session.lock:
+            return self._update(session, symptoms, symptom_indices, present)
+
+    def use_predictor(self, predictor: SymptomPredictor):
+        """Answer sessions with a reloaded predictor; it must keep the symptom indices"""
+        if predictor.symptom_names != self.predictor.symptom_names:
+            raise ValueError("Reloaded predictor has a different symptom list")
+        self.predictor = predictor
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+
+# Create singleton instance
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_interview_engine() -> InterviewEngine:
+    """Get or create the interview engine over the shared predictor"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = InterviewEngine(get_predictor(), SessionStore(
+                max_sessions=int(os.environ.get('ML_MAX_SESSIONS', DEFAULT_MAX_SESSIONS)),
+                ttl_seconds=float(os.environ.get('ML_SESSION_TTL', DEFAULT_TTL_SECONDS))
+            ))
+    return _engine
+
+
+def evaluate_session(present: np.ndarray, absent: np.ndarray, weights: np.ndarray, top_k: int,
+                     predict: bool) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """InterviewEngine.evaluate on the shared engine, for inference pool workers"""
+    return get_interview_engine().evaluate(present, absent, weights, top_k, predict)
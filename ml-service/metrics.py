@@ -0,0 +1,192 @@
+"""
+Latency and cache metrics for the ML service in Prometheus text format
+Counters and histograms are plain Python objects behind one lock each, so an
+observation costs a bisect and a few integer increments. Gauges read from
+the existing stats() dictionaries are collected only when /metrics is
+scraped. MetricsMiddleware times every HTTP request by route template.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Request latency buckets (seconds)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Predict stage latency buckets (seconds), from 5 µs up
+STAGE_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # An unlabelled counter is exported as 0 before its first increment
+        self._values: Dict[Tuple[str, ...], float] = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels"""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][slot] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+# (name, type, help, [(labels dict, value), ...]) produced at scrape time
+Sample = Tuple[str, str, str, Iterable[Tuple[Dict[str, str], float]]]
+
+
+class Registry:
+    """Metrics rendered together by /metrics"""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float],
+                  labelnames: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(name, documentation, buckets, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """Register a callable yielding samples computed when the metrics are scraped"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(list(labels), list(labels.values()))} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """ASGI middleware observing request latency by method, route template and status"""
+
+    def __init__(self, app: Any, histogram: Histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = ['500']
+
+        async def send_wrapper(message: Dict[str, Any]):
+            if message['type'] == 'http.response.start':
+                status[0] = str(message['status'])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The matched route's template keeps label cardinality bounded
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            self.histogram.observe(time.perf_counter() - started, scope['method'], path, status[0])
+
+
+def server_timing(stages: Dict[str, float]) -> str:
+    """Server-Timing header value for stage durations in seconds"""
+    return ', '.join(f'{stage};dur={seconds * 1000:.3f}' for stage, seconds in stages.items())
+
+
+def stage_breakdown(stages: Dict[str, float], total: Optional[float] = None) -> Dict[str, Any]:
+    """Stage durations in milliseconds with each stage's share of the total"""
+    total = sum(stages.values()) if total is None else total
+    return {
+        'total_ms': round(total * 1000, 3),
+        'stages': {
+            stage: {'ms': round(seconds * 1000, 3), 'share': round(seconds / total, 4) if total else 0.0}
+            for stage, seconds in stages.items()
+        },
+    }
@@ -0,0 +1,119 @@
+"""
+Dynamic micro-batching for /predict
+Concurrent requests that miss the response cache are collected on the event
+loop for up to max_wait_ms (or until max_batch are pending) and handed to
+the inference pool as one batched call; every request then gets its own
+result. Waiting for the window holds no pool worker, so a batch is bounded
+by ML_MICRO_BATCH_SIZE rather than by ML_INFERENCE_WORKERS, and batching
+works the same with the thread and process executors. A batch takes one
+slot of the pool, so when the pool is saturated all its requests get 503.
+
+Configuration (environment, read by MicroBatcher.from_env):
+    ML_MICRO_BATCH_WAIT_MS   collection window in ms; unset or 0 disables batching
+    ML_MICRO_BATCH_SIZE      maximum requests per batch (default 32)
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+DEFAULT_MAX_BATCH = 32
+
+
+def _bucket(size: int) -> str:
+    """Power-of-two histogram bucket label for a batch size ('1', '2-3', '4-7', ...)"""
+    low = 1 << (size.bit_length() - 1)
+    high = 2 * low - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item awaits into one run_batch call
+
+    Only used from the event loop thread, so it needs no locking.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_wait_ms: float = 2.0, max_batch: int = DEFAULT_MAX_BATCH):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.run_batch = run_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Running batches, referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.requests = 0
+        self.histogram: Dict[int, int] = {}
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, run_batch: Callable[[List[Any]], Awaitable[List[Any]]]) -> Optional['MicroBatcher']:
+        """A batcher configured from the environment, or None when batching is disabled"""
+        wait_ms = float(os.environ.get('ML_MICRO_BATCH_WAIT_MS', 0))
+        if wait_ms <= 0:
+            return None
+        return cls(run_batch, wait_ms, int(os.environ.get('ML_MICRO_BATCH_SIZE', DEFAULT_MAX_BATCH)))
+
+    async def submit(self, item: Any) -> Any:
+        """Result of item, computed in the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: List[Tuple[Any, asyncio.Future, float]]):
+        started = time.perf_counter()
+        waits = [started - queued for _, _, queued in pending]
+        self.batches += 1
+        self.requests += len(pending)
+        self.histogram[len(pending)] = self.histogram.get(len(pending), 0) + 1
+        self.queue_seconds += sum(waits)
+        self.max_queue_seconds = max(self.max_queue_seconds, max(waits))
+        try:
+            results = await self.run_batch([item for item, _, _ in pending])
+        except Exception as e:
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(pending, results):
+            # A request whose client went away has its future cancelled
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Configured limits, batch-size histogram and queueing delay"""
+        buckets: Dict[str, int] = {}
+        for size in sorted(self.histogram):
+            label = _bucket(size)
+            buckets[label] = buckets.get(label, 0) + self.histogram[size]
+        return {
+            'max_wait_ms': round(self.max_wait * 1000, 3),
+            'max_batch': self.max_batch,
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_batch_size': round(self.requests / self.batches, 2) if self.batches else 0.0,
+            'batch_size_histogram': buckets,
+            'mean_queue_ms': round(self.queue_seconds / self.requests * 1000, 3) if self.requests else 0.0,
+            'max_queue_ms': round(self.max_queue_seconds * 1000, 3),
+        }
@@ -0,0 +1,322 @@
+"""
+Compiled model artifact for the ML service
+Bundles the trained model, lookup tables and disease knowledge into one
+versioned directory that loads without pandas or CSV parsing
+
+Layout of artifacts/<version>/:
+    manifest.json   artifact version, library versions, file sizes and checksums,
+                    and the same for the model pickle and CSVs it was built from
+    model.joblib    Random Forest, stored uncompressed
+    tables.json     symptom/disease lookup tables, symptom severity weights and
+                    precomputed disease records
+    patterns.npy    distinct Training.csv symptom patterns (uint8), for lookup inference
+    training/       distinct Training.csv (pattern, label) rows as X.npy (uint8), y.npy
+                    (class codes) and counts.npy (occurrences), with the labels and row
+                    count in tables.json; the related-symptom index and the interview
+                    engine are built from them
+    forest/         the forest flattened into node arrays (forest_engine.py), one
+                    .npy file each, checked against the model on every training
+                    pattern at build time
+
+patterns.npy, the training arrays and the forest arrays are memory-mapped read-only, so worker
+processes serving the same artifact with the numpy engine
+(ML_FOREST_ENGINE=numpy) share one copy of their pages. The sklearn engine
+gets no such sharing: unpickling a tree copies its node arrays, so every
+process holds its own copy of the model.
+
+artifacts/LATEST names the version the service loads by default. When the
+model pickle or a CSV has changed since that artifact was built (e.g. after
+retraining without --build-artifact), a warning is issued and the sources
+are loaded instead. Set ML_ARTIFACT_DIR to load a specific artifact
+regardless, or to "none" to always read the model pickle and CSV datasets.
+
+Usage:
+    python model_artifact.py build [--version V] [--root DIR]
+    python model_artifact.py verify [DIR]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACT_ROOT = os.path.join(BASE_DIR, 'artifacts')
+LATEST_FILE = 'LATEST'
+MANIFEST_FILE = 'manifest.json'
+MODEL_FILE = 'model.joblib'
+TABLES_FILE = 'tables.json'
+PATTERNS_FILE = 'patterns.npy'
+TRAINING_DIR = 'training'
+TRAINING_ARRAYS = ('X', 'y', 'counts')
+FOREST_DIR = 'forest'
+# Single-file forest of artifacts built before FOREST_DIR
+FOREST_FILE = 'forest.npz'
+
+# Files an artifact is compiled from, relative to BASE_DIR
+SOURCE_FILES = (
+    'model/RandomForest.pkl', 'data/Training.csv', 'data/symptoms_df.csv', 'data/precautions_df.csv',
+    'data/workout_df.csv', 'data/description.csv', 'data/medications.csv', 'data/diets.csv',
+    'data/Symptom-severity.csv',
+)
+
+# Bumped whenever the artifact layout changes
+FORMAT_VERSION = 1
+
+
+class ModelArtifact:
+    """A loaded artifact: manifest, model and lookup tables"""
+
+    def __init__(self, path: str, manifest: Dict[str, Any], model: Any,
+                 tables: Dict[str, Any], patterns: Any, load_seconds: float, training: Any = None):
+        self.path = path
+        self.manifest = manifest
+        self.model = model
+        self.tables = tables
+        self.patterns = patterns
+        self.load_seconds = load_seconds
+        # train_model.TrainingSet, absent from artifacts built before TRAINING_DIR
+        self.training = training
+
+    @property
+    def version(self) -> str:
+        return self.manifest['version']
+
+
+def latest_version(root: str = ARTIFACT_ROOT) -> Optional[str]:
+    """Version named by root/LATEST, if any"""
+    try:
+        with open(os.path.join(root, LATEST_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_artifact_dir(path: Optional[str] = None, root: str = ARTIFACT_ROOT) -> Optional[str]:
+    """Artifact directory to load: explicit path, $ML_ARTIFACT_DIR, then artifacts/LATEST"""
+    path = path or os.environ.get('ML_ARTIFACT_DIR')
+    if path:
+        return None if path.lower() == 'none' else path
+    version = latest_version(root)
+    if not version:
+        return None
+    path = os.path.join(root, version)
+    changed = stale_sources(path)
+    if changed:
+        warnings.warn(f"Artifact {version} is older than {', '.join(changed)}; loading the sources instead. "
+                      f"Rebuild it with: python model_artifact.py build", stacklevel=2)
+        return None
+    return path
+
+
+def _source_entry(path: str) -> Dict[str, Any]:
+    return {**_file_entry(path), 'mtime_ns': os.stat(path).st_mtime_ns}
+
+
+def stale_sources(path: str) -> List[str]:
+    """Source files that differ from the ones the artifact was built from
+
+    Sources missing here are not reported, since a deployment may ship the
+    artifact alone. Files are hashed only when their size or mtime changed.
+    """
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            sources = json.load(f).get('sources', {})
+    except (OSError, ValueError):
+        return []
+    changed = []
+    for name, expected in sources.items():
+        source = os.path.join(BASE_DIR, name)
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            continue
+        if stat.st_size == expected['bytes'] and stat.st_mtime_ns == expected['mtime_ns']:
+            continue
+        if _file_entry(source)['sha256'] != expected['sha256']:
+            changed.append(name)
+    return changed
+
+
+def load_artifact(path: str, engine: str = 'sklearn') -> ModelArtifact:
+    """Load an artifact directory, memory-mapping the patterns and forest arrays
+
+    With engine='numpy' the flattened forest is loaded instead of the model,
+    so scikit-learn is never imported (older artifacts without a flattened
+    forest load the model, which the caller flattens).
+    """
+    started = time.perf_counter()
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format {manifest.get('format')!r} in {path}")
+    with open(os.path.join(path, TABLES_FILE)) as f:
+        tables = json.load(f)
+    forest_files = [name for name in manifest['files'] if name.startswith(FOREST_DIR + '/')]
+    if engine == 'numpy' and (forest_files or FOREST_FILE in manifest['files']):
+        from forest_engine import FlatForest
+        model = FlatForest.load(os.path.join(path, FOREST_DIR if forest_files else FOREST_FILE))
+    else:
+        import joblib
+        # Trees copy their node arrays when unpickled, so this model is private to the process
+        model = joblib.load(os.path.join(path, MODEL_FILE), mmap_mode='r')
+    patterns = None
+    if PATTERNS_FILE in manifest['files']:
+        import numpy as np
+        patterns = np.load(os.path.join(path, PATTERNS_FILE), mmap_mode='r')
+    training = None
+    if 'training' in tables:
+        training = _load_training_set(path, tables)
+    return ModelArtifact(path, manifest, model, tables, patterns, time.perf_counter() - started, training)
+
+
+def _load_training_set(path: str, tables: Dict[str, Any]):
+    import numpy as np
+
+    from train_model import TrainingSet
+
+    arrays = {name: np.load(os.path.join(path, TRAINING_DIR, f'{name}.npy'), mmap_mode='r')
+              for name in TRAINING_ARRAYS}
+    meta = tables['training']
+    return TrainingSet(tables['symptoms'], arrays['X'], arrays['y'], arrays['counts'],
+                       meta['labels'], meta['rows'], meta['digest'])
+
+
+def _file_entry(path: str) -> Dict[str, Any]:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {'sha256': digest.hexdigest(), 'bytes': os.path.getsize(path)}
+
+
+def build_artifact(root: str = ARTIFACT_ROOT, version: Optional[str] = None,
+                   set_latest: bool = True) -> str:
+    """Compile model/RandomForest.pkl and the CSV datasets into a new artifact directory"""
+    import joblib
+    import numpy as np
+    import sklearn
+
+    from forest_engine import FlatForest, mismatched_rows
+    from pattern_cache import load_training_patterns
+    from symptom_predictor import DATA_DIR, SymptomPredictor
+    from train_model import TRAINING_FILE, read_training_set
+
+    predictor = SymptomPredictor()
+    if version is None:
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%d-%H%M%S')
+        version = f"{stamp}-{joblib.hash(predictor.model)[:8]}"
+    path = os.path.join(root, version)
+    if os.path.exists(path):
+        raise FileExistsError(f"Artifact {path} already exists")
+    os.makedirs(path)
+
+    training = read_training_set(TRAINING_FILE)
+    tables = {
+        'symptoms': sorted(predictor.symptoms_list, key=predictor.symptoms_list.get),
+        'diseases': {str(idx): name for idx, name in predictor.diseases_list.items()},
+        'specialists': predictor.disease_specialist,
+        'severities': predictor.disease_severity,
+        'symptom_weights': predictor.symptom_weights.tolist(),
+        'records': [record.detail() for record in predictor.disease_records.values()],
+        'other_records': [record.detail() for record in predictor.other_records.values()],
+        'training': {'labels': training.labels, 'rows': training.rows, 'digest': training.digest},
+    }
+    if training.features != tables['symptoms']:
+        raise ValueError(f"{TRAINING_FILE} columns do not match the model's symptom list")
+    with open(os.path.join(path, TABLES_FILE), 'w') as f:
+        json.dump(tables, f, ensure_ascii=False)
+    joblib.dump(predictor.model, os.path.join(path, MODEL_FILE), compress=0)
+    patterns = load_training_patterns(os.path.join(DATA_DIR, 'Training.csv'))
+    np.save(os.path.join(path, PATTERNS_FILE), patterns)
+    os.makedirs(os.path.join(path, TRAINING_DIR))
+    training_files = [f'{TRAINING_DIR}/{name}.npy' for name in TRAINING_ARRAYS]
+    for name, file_name in zip(TRAINING_ARRAYS, training_files):
+        np.save(os.path.join(path, file_name), getattr(training, name))
+
+    forest = FlatForest.from_sklearn(predictor.model)
+    mismatches = mismatched_rows(predictor.model, forest, patterns)
+    if mismatches:
+        raise ValueError(f"Flattened forest disagrees with the model on {mismatches} training patterns")
+    forest_files = [f'{FOREST_DIR}/{name}' for name in forest.save(os.path.join(path, FOREST_DIR))]
+
+    manifest = {
+        'format': FORMAT_VERSION,
+        'version': version,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'n_features': len(tables['symptoms']),
+        'n_classes': len(predictor.class_diseases),
+        'files': {name: _file_entry(os.path.join(path, name))
+                  for name in [MODEL_FILE, TABLES_FILE, PATTERNS_FILE] + training_files + forest_files},
+        'sources': {name: _source_entry(os.path.join(BASE_DIR, name)) for name in SOURCE_FILES},
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    if set_latest:
+        with open(os.path.join(root, LATEST_FILE), 'w') as f:
+            f.write(version + '\n')
+    return path
+
+
+def verify_artifact(path: str) -> List[str]:
+    """Problems found in an artifact directory (empty when it is intact)"""
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        return [f"manifest: {e}"]
+    problems = []
+    if manifest.get('format') != FORMAT_VERSION:
+        problems.append(f"format {manifest.get('format')!r} != {FORMAT_VERSION}")
+    for name, expected in manifest.get('files', {}).items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            problems.append(f"{name}: missing")
+        elif _file_entry(file_path) != expected:
+            problems.append(f"{name}: checksum mismatch")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or verify the compiled model artifact")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="compile model and datasets into a new artifact")
+    build.add_argument('--version', help="artifact version (default: UTC timestamp + model hash)")
+    build.add_argument('--root', default=ARTIFACT_ROOT, help="directory holding the artifacts")
+    build.add_argument('--no-latest', action='store_true', help="do not point LATEST at the new artifact")
+    verify = commands.add_parser('verify', help="check an artifact against its manifest")
+    verify.add_argument('path', nargs='?', help="artifact directory (default: LATEST)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        path = build_artifact(args.root, args.version, set_latest=not args.no_latest)
+        artifact = load_artifact(path)
+        print(f"Built artifact {artifact.version} at {path}")
+        print(f"Load time: {artifact.load_seconds * 1000:.1f} ms")
+        return 0
+
+    path = resolve_artifact_dir(args.path)
+    if path is None:
+        print("No artifact found")
+        return 1
+    problems = verify_artifact(path)
+    for problem in problems:
+        print(f"  {problem}")
+    for name in stale_sources(path):
+        print(f"  note: {name} changed since this artifact was built")
+    print(f"{path}: {'FAILED' if problems else 'OK'}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Exact-match lookup table inference for the finite symptom space
+The active-symptom bitset of a request is packed into a 132-bit integer and
+looked up in a table of precomputed forest probabilities. Patterns seen in
+training are precomputed at load; unseen patterns fall back to the forest
+and are kept in a bounded LRU cache.
+"""
+
+import csv
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Default number of unseen patterns kept after a forest fallback
+DEFAULT_LRU_SIZE = 10000
+
+
+def pattern_key(row: np.ndarray) -> int:
+    """Pack a 0/1 feature row into a single integer"""
+    return int.from_bytes(np.packbits(row.astype(np.bool_)).tobytes(), 'big')
+
+
+def load_training_patterns(path: str) -> np.ndarray:
+    """Distinct symptom patterns of Training.csv as a uint8 matrix, streamed row by row"""
+    patterns = {}
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        width = len(next(reader)) - 1
+        for row in reader:
+            if row:
+                patterns.setdefault(bytes(int(v) for v in row[:width]), None)
+    return np.array([np.frombuffer(bits, dtype=np.uint8) for bits in patterns], dtype=np.uint8)
+
+
+class PatternCache:
+    """Probability vectors keyed by packed symptom bitsets"""
+
+    def __init__(self, model: Any, patterns: Optional[np.ndarray] = None,
+                 lru_size: int = DEFAULT_LRU_SIZE):
+        self.model = model
+        self.lru_size = lru_size
+        self._table: Dict[int, np.ndarray] = {}
+        self._lru: 'OrderedDict[int, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        if patterns is not None and len(patterns):
+            proba = model.predict_proba(patterns)
+            proba.setflags(write=False)
+            for row, vector in zip(patterns, proba):
+                self._table[pattern_key(row)] = vector
+
+        self.table_hits = 0
+        self.lru_hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+        self.lookups = 0
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Same result as model.predict_proba, evaluating the forest only for unknown patterns"""
+        started = time.perf_counter()
+        rows = [None] * len(features)
+        missing = []
+        keys = [pattern_key(row) for row in features]
+        table_hits = lru_hits = 0
+        with self._lock:
+            for pos, key in enumerate(keys):
+                vector = self._table.get(key)
+                if vector is not None:
+                    table_hits += 1
+                else:
+                    vector = self._lru.get(key)
+                    if vector is not None:
+                        self._lru.move_to_end(key)
+                        lru_hits += 1
+                    else:
+                        missing.append(pos)
+                rows[pos] = vector
+            self.table_hits += table_hits
+            self.lru_hits += lru_hits
+            self.misses += len(missing)
+            self.lookups += len(keys)
+            self.lookup_seconds += time.perf_counter() - started
+
+        if missing:
+            proba = self.model.predict_proba(features[missing])
+            proba.setflags(write=False)
+            with self._lock:
+                for pos, vector in zip(missing, proba):
+                    rows[pos] = vector
+                    self._lru[keys[pos]] = vector
+                    self._lru.move_to_end(keys[pos])
+                while len(self._lru) > self.lru_size:
+                    self._lru.popitem(last=False)
+        return np.vstack(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates, table sizes and mean lookup latency"""
+        with self._lock:
+            lookups = self.lookups
+            return {
+                'precomputed_patterns': len(self._table),
+                'lru_patterns': len(self._lru),
+                'lru_size': self.lru_size,
+                'lookups': lookups,
+                'table_hits': self.table_hits,
+                'lru_hits': self.lru_hits,
+                'forest_evaluations': self.misses,
+                'hit_rate': round((self.table_hits + self.lru_hits) / lookups, 4) if lookups else 0.0,
+                'mean_lookup_us': round(self.lookup_seconds / lookups * 1e6, 2) if lookups else 0.0,
+            }
@@ -0,0 +1,150 @@
+"""
+Two-level response cache for /predict
+Level 1 maps the raw symptom input, exactly as sent, to its resolution: the
+canonical sorted set of symptom indices with the matched and invalid
+symptoms. Level 2 maps (model version, canonical set, top_k) to the
+prediction serialized as JSON without the per-request fields. Requests that
+differ only in order, case, underscores or typos share one level 2 entry.
+The fields that depend on the exact input (matched_symptoms,
+invalid_symptoms) and patient_info are serialized per request and spliced
+into the cached bytes.
+
+Both levels are bounded LRUs living in the API process; clear() empties
+them when a model is reloaded, and level 2 keys carry the model version so
+results of the old model that finish after a reload are never served.
+
+Configuration (environment, read by ResponseCache.from_env):
+    ML_RESOLUTION_CACHE_SIZE   raw inputs kept by level 1 (default 16384; 0 disables it)
+    ML_RESPONSE_CACHE_SIZE     serialized predictions kept by level 2 (default 4096; 0 disables it)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from serialization import dumps
+
+DEFAULT_RESOLUTION_CACHE_SIZE = 16384
+DEFAULT_RESPONSE_CACHE_SIZE = 4096
+
+# Result fields that depend on the exact input rather than the symptom set
+PER_REQUEST_FIELDS = ('matched_symptoms', 'invalid_symptoms')
+
+
+class LRUCache:
+    """Bounded mapping with least-recently-used eviction and hit/miss counters"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class Resolution(NamedTuple):
+    """Canonical symptom set of one raw input"""
+    active: Tuple[int, ...]
+    matched: Tuple[str, ...]
+    invalid: Tuple[str, ...]
+
+
+class CachedPrediction(NamedTuple):
+    """A prediction serialized without its per-request fields"""
+    body: bytes
+    outcome: str
+    version: str
+
+
+class ResponseCache:
+    """Resolution (level 1) and serialized prediction (level 2) caches for /predict"""
+
+    def __init__(self, resolution_size: int = DEFAULT_RESOLUTION_CACHE_SIZE,
+                 response_size: int = DEFAULT_RESPONSE_CACHE_SIZE):
+        self.resolutions = LRUCache(resolution_size)
+        self.responses = LRUCache(response_size)
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCache':
+        return cls(
+            resolution_size=int(os.environ.get('ML_RESOLUTION_CACHE_SIZE', DEFAULT_RESOLUTION_CACHE_SIZE)),
+            response_size=int(os.environ.get('ML_RESPONSE_CACHE_SIZE', DEFAULT_RESPONSE_CACHE_SIZE))
+        )
+
+    @staticmethod
+    def resolution_key(symptoms: List[str], symptom_indices: Optional[List[int]]) -> Hashable:
+        if symptom_indices is not None:
+            return 'indices', tuple(symptom_indices)
+        return 'symptoms', tuple(symptoms)
+
+    @staticmethod
+    def canonical(active: List[int], matched: List[str], invalid: List[str]) -> Resolution:
+        """Resolution of a request from SymptomPredictor._active_symptoms output"""
+        return Resolution(tuple(sorted(set(active))), tuple(matched), tuple(invalid))
+
+    def get_resolution(self, key: Hashable) -> Optional[Resolution]:
+        return self.resolutions.get(key)
+
+    def put_resolution(self, key: Hashable, resolution: Resolution):
+        self.resolutions.put(key, resolution)
+
+    def get(self, version: str, active: Tuple[int, ...], top_k: int) -> Optional[CachedPrediction]:
+        return self.responses.get((version, active, top_k))
+
+    def put(self, result: Dict[str, Any], active: Tuple[int, ...], top_k: int, outcome: str) -> CachedPrediction:
+        """Serialize a prediction of the canonical set active, keeping it for later requests"""
+        payload = {key: value for key, value in result.items() if key not in PER_REQUEST_FIELDS}
+        # The closing brace is added back after the per-request fields
+        entry = CachedPrediction(dumps(payload)[:-1], outcome, result['model_version'])
+        self.responses.put((entry.version, active, top_k), entry)
+        return entry
+
+    @staticmethod
+    def render(entry: CachedPrediction, fields: Dict[str, Any]) -> bytes:
+        """JSON body of a cached prediction merged with this request's fields (at least one)"""
+        return entry.body + b',' + dumps(fields)[1:]
+
+    def clear(self):
+        self.resolutions.clear()
+        self.responses.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'resolutions': self.resolutions.stats(), 'responses': self.responses.stats()}
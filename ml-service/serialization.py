@@ -0,0 +1,14 @@
+"""
+JSON serialization for pre-rendered response bodies
+Bodies built ahead of time (disease records, the symptom listing and
+search results, cached predictions) are sent as raw bytes, so they must be
+byte-identical to what FastAPI's JSONResponse would have produced.
+"""
+
+import json
+from typing import Any
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize the way FastAPI's JSONResponse does"""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
@@ -5,21 +5,282 @@ Random Forest model with 100% accuracy on 41 diseases and 132 symptoms
 """
 
 import numpy as np
-import pandas as pd
 import pickle
 import os
-from fuzzywuzzy import process
-import ast
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from disease_records import DiseaseRecord, build_disease_records, empty_record, knowledge_names
+from forest_engine import FOREST_ENGINES, FlatForest
+from model_artifact import load_artifact, resolve_artifact_dir
+from pattern_cache import DEFAULT_LRU_SIZE, PatternCache, load_training_patterns
+from symptom_resolver import SymptomResolver
+from symptom_search import SymptomSearchIndex
+from triage import RED_FLAG_MESSAGE, TriageScorer, load_severity_weights
 
 # Get the directory where this script is located
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 MODEL_DIR = os.path.join(BASE_DIR, 'model')
 
+# Maximum rows per model call in predict_batch
+BATCH_CHUNK_SIZE = 512
+
+# Largest differential size (top_k) accepted by the API and bulk scoring
+MAX_TOP_K = 10
+
+# Stages timed by predict(timings=True), in order
+PREDICT_STAGES = ('resolve', 'triage', 'features', 'inference', 'info')
+
+# Inference modes: 'forest' evaluates the model on every request, 'lookup'
+# serves known symptom patterns from a precomputed table (see pattern_cache.py)
+INFERENCE_MODES = ('forest', 'lookup')
+
+# Symptom to index mapping (132 symptoms)
+SYMPTOMS_LIST = {
+    'itching': 0, 'skin_rash': 1, 'nodal_skin_eruptions': 2, 'continuous_sneezing': 3,
+    'shivering': 4, 'chills': 5, 'joint_pain': 6, 'stomach_pain': 7, 'acidity': 8,
+    'ulcers_on_tongue': 9, 'muscle_wasting': 10, 'vomiting': 11, 'burning_micturition': 12,
+    'spotting_ urination': 13, 'fatigue': 14, 'weight_gain': 15, 'anxiety': 16,
+    'cold_hands_and_feets': 17, 'mood_swings': 18, 'weight_loss': 19, 'restlessness': 20,
+    'lethargy': 21, 'patches_in_throat': 22, 'irregular_sugar_level': 23, 'cough': 24,
+    'high_fever': 25, 'sunken_eyes': 26, 'breathlessness': 27, 'sweating': 28,
+    'dehydration': 29, 'indigestion': 30, 'headache': 31, 'yellowish_skin': 32,
+    'dark_urine': 33, 'nausea': 34, 'loss_of_appetite': 35, 'pain_behind_the_eyes': 36,
+    'back_pain': 37, 'constipation': 38, 'abdominal_pain': 39, 'diarrhoea': 40,
+    'mild_fever': 41, 'yellow_urine': 42, 'yellowing_of_eyes': 43, 'acute_liver_failure': 44,
+    'fluid_overload': 45, 'swelling_of_stomach': 46, 'swelled_lymph_nodes': 47, 'malaise': 48,
+    'blurred_and_distorted_vision': 49, 'phlegm': 50, 'throat_irritation': 51,
+    'redness_of_eyes': 52, 'sinus_pressure': 53, 'runny_nose': 54, 'congestion': 55,
+    'chest_pain': 56, 'weakness_in_limbs': 57, 'fast_heart_rate': 58,
+    'pain_during_bowel_movements': 59, 'pain_in_anal_region': 60, 'bloody_stool': 61,
+    'irritation_in_anus': 62, 'neck_pain': 63, 'dizziness': 64, 'cramps': 65,
+    'bruising': 66, 'obesity': 67, 'swollen_legs': 68, 'swollen_blood_vessels': 69,
+    'puffy_face_and_eyes': 70, 'enlarged_thyroid': 71, 'brittle_nails': 72,
+    'swollen_extremeties': 73, 'excessive_hunger': 74, 'extra_marital_contacts': 75,
+    'drying_and_tingling_lips': 76, 'slurred_speech': 77, 'knee_pain': 78,
+    'hip_joint_pain': 79, 'muscle_weakness': 80, 'stiff_neck': 81, 'swelling_joints': 82,
+    'movement_stiffness': 83, 'spinning_movements': 84, 'loss_of_balance': 85,
+    'unsteadiness': 86, 'weakness_of_one_body_side': 87, 'loss_of_smell': 88,
+    'bladder_discomfort': 89, 'foul_smell_of urine': 90, 'continuous_feel_of_urine': 91,
+    'passage_of_gases': 92, 'internal_itching': 93, 'toxic_look_(typhos)': 94,
+    'depression': 95, 'irritability': 96, 'muscle_pain': 97, 'altered_sensorium': 98,
+    'red_spots_over_body': 99, 'belly_pain': 100, 'abnormal_menstruation': 101,
+    'dischromic _patches': 102, 'watering_from_eyes': 103, 'increased_appetite': 104,
+    'polyuria': 105, 'family_history': 106, 'mucoid_sputum': 107, 'rusty_sputum': 108,
+    'lack_of_concentration': 109, 'visual_disturbances': 110, 'receiving_blood_transfusion': 111,
+    'receiving_unsterile_injections': 112, 'coma': 113, 'stomach_bleeding': 114,
+    'distention_of_abdomen': 115, 'history_of_alcohol_consumption': 116, 'fluid_overload.1': 117,
+    'blood_in_sputum': 118, 'prominent_veins_on_calf': 119, 'palpitations': 120,
+    'painful_walking': 121, 'pus_filled_pimples': 122, 'blackheads': 123, 'scurring': 124,
+    'skin_peeling': 125, 'silver_like_dusting': 126, 'small_dents_in_nails': 127,
+    'inflammatory_nails': 128, 'blister': 129, 'red_sore_around_nose': 130, 'yellow_crust_ooze': 131
+}
+
+# Disease index to name mapping (41 diseases)
+DISEASES_LIST = {
+    15: 'Fungal infection', 4: 'Allergy', 16: 'GERD', 9: 'Chronic cholestasis',
+    14: 'Drug Reaction', 33: 'Peptic ulcer disease', 1: 'AIDS', 12: 'Diabetes',
+    17: 'Gastroenteritis', 6: 'Bronchial Asthma', 23: 'Hypertension', 30: 'Migraine',
+    7: 'Cervical spondylosis', 32: 'Paralysis (brain hemorrhage)', 28: 'Jaundice',
+    29: 'Malaria', 8: 'Chicken pox', 11: 'Dengue', 37: 'Typhoid', 40: 'hepatitis A',
+    19: 'Hepatitis B', 20: 'Hepatitis C', 21: 'Hepatitis D', 22: 'Hepatitis E',
+    3: 'Alcoholic hepatitis', 36: 'Tuberculosis', 10: 'Common Cold', 34: 'Pneumonia',
+    13: 'Dimorphic hemmorhoids(piles)', 18: 'Heart attack', 39: 'Varicose veins',
+    26: 'Hypothyroidism', 24: 'Hyperthyroidism', 25: 'Hypoglycemia', 31: 'Osteoarthritis',
+    5: 'Arthritis', 0: 'Vertigo (Paroxysmal Positional)', 2: 'Acne',
+    38: 'Urinary tract infection', 35: 'Psoriasis', 27: 'Impetigo'
+}
+
+# Disease to specialist mapping
+DISEASE_SPECIALIST = {
+    'Fungal infection': 'Dermatologist',
+    'Allergy': 'Allergist/Immunologist',
+    'GERD': 'Gastroenterologist',
+    'Chronic cholestasis': 'Hepatologist',
+    'Drug Reaction': 'Allergist/Immunologist',
+    'Peptic ulcer disease': 'Gastroenterologist',
+    'AIDS': 'Infectious Disease Specialist',
+    'Diabetes': 'Endocrinologist',
+    'Gastroenteritis': 'Gastroenterologist',
+    'Bronchial Asthma': 'Pulmonologist',
+    'Hypertension': 'Cardiologist',
+    'Migraine': 'Neurologist',
+    'Cervical spondylosis': 'Orthopedic Surgeon',
+    'Paralysis (brain hemorrhage)': 'Neurologist',
+    'Jaundice': 'Hepatologist',
+    'Malaria': 'Infectious Disease Specialist',
+    'Chicken pox': 'General Physician',
+    'Dengue': 'Infectious Disease Specialist',
+    'Typhoid': 'Infectious Disease Specialist',
+    'hepatitis A': 'Hepatologist',
+    'Hepatitis B': 'Hepatologist',
+    'Hepatitis C': 'Hepatologist',
+    'Hepatitis D': 'Hepatologist',
+    'Hepatitis E': 'Hepatologist',
+    'Alcoholic hepatitis': 'Hepatologist',
+    'Tuberculosis': 'Pulmonologist',
+    'Common Cold': 'General Physician',
+    'Pneumonia': 'Pulmonologist',
+    'Dimorphic hemmorhoids(piles)': 'Proctologist',
+    'Heart attack': 'Cardiologist',
+    'Varicose veins': 'Vascular Surgeon',
+    'Hypothyroidism': 'Endocrinologist',
+    'Hyperthyroidism': 'Endocrinologist',
+    'Hypoglycemia': 'Endocrinologist',
+    'Osteoarthritis': 'Rheumatologist',
+    'Arthritis': 'Rheumatologist',
+    'Vertigo (Paroxysmal Positional)': 'ENT Specialist',
+    'Acne': 'Dermatologist',
+    'Urinary tract infection': 'Urologist',
+    'Psoriasis': 'Dermatologist',
+    'Impetigo': 'Dermatologist'
+}
+
+# Disease severity levels (for triage)
+DISEASE_SEVERITY = {
+    'Heart attack': 'emergency',
+    'Paralysis (brain hemorrhage)': 'emergency',
+    'AIDS': 'high',
+    'Tuberculosis': 'high',
+    'Pneumonia': 'high',
+    'Dengue': 'high',
+    'Malaria': 'high',
+    'Typhoid': 'high',
+    'Hepatitis B': 'high',
+    'Hepatitis C': 'high',
+    'Hepatitis D': 'high',
+    'Diabetes': 'moderate',
+    'Hypertension': 'moderate',
+    'Bronchial Asthma': 'moderate',
+    'GERD': 'moderate',
+    'Chronic cholestasis': 'moderate',
+    'Jaundice': 'moderate',
+    'hepatitis A': 'moderate',
+    'Hepatitis E': 'moderate',
+    'Alcoholic hepatitis': 'moderate',
+    'Peptic ulcer disease': 'moderate',
+    'Gastroenteritis': 'low',
+    'Common Cold': 'low',
+    'Allergy': 'low',
+    'Fungal infection': 'low',
+    'Acne': 'low',
+    'Migraine': 'low',
+    'Urinary tract infection': 'low',
+    'Psoriasis': 'low',
+    'Impetigo': 'low',
+    'Chicken pox': 'low',
+    'Drug Reaction': 'moderate',
+    'Cervical spondylosis': 'low',
+    'Dimorphic hemmorhoids(piles)': 'low',
+    'Varicose veins': 'low',
+    'Hypothyroidism': 'moderate',
+    'Hyperthyroidism': 'moderate',
+    'Hypoglycemia': 'moderate',
+    'Osteoarthritis': 'low',
+    'Arthritis': 'low',
+    'Vertigo (Paroxysmal Positional)': 'low'
+}
+
+
 class SymptomPredictor:
-    def __init__(self):
-        """Initialize the symptom predictor with model and datasets"""
+    def __init__(self, artifact_dir: Optional[str] = None, inference_mode: str = 'forest',
+                 lookup_cache_size: int = DEFAULT_LRU_SIZE, red_flag_shortcut: bool = False,
+                 forest_engine: str = 'sklearn'):
+        """
+        Initialize the symptom predictor with model and datasets
+        
+        Args:
+            artifact_dir: Compiled artifact to load (see model_artifact.py); when
+                None the model pickle and CSV datasets are read directly
+            inference_mode: 'forest' or 'lookup' (precomputed training patterns
+                plus an LRU cache of unseen ones in front of the forest)
+            lookup_cache_size: Unseen patterns kept in 'lookup' mode
+            red_flag_shortcut: Answer requests with red-flag symptoms as
+                emergencies without running the model; their disease and
+                confidence are then None and the care fields empty. Off by
+                default: red flags only set the triage to emergency
+            forest_engine: 'sklearn' calls the fitted model, 'numpy' evaluates
+                the forest flattened into node arrays (see forest_engine.py)
+        """
+        if inference_mode not in INFERENCE_MODES:
+            raise ValueError(f"inference_mode must be one of {INFERENCE_MODES}")
+        if forest_engine not in FOREST_ENGINES:
+            raise ValueError(f"forest_engine must be one of {FOREST_ENGINES}")
+        started = time.perf_counter()
+        self.artifact_dir = artifact_dir
+        self.training_patterns = None
+        self.training_set = None
+        self._training_lock = threading.Lock()
+        self.symptom_weights = None
+        if artifact_dir:
+            self._load_artifact(artifact_dir, forest_engine)
+        else:
+            self._load_sources()
+        self.forest_engine = forest_engine
+        if forest_engine == 'numpy' and not isinstance(self.model, FlatForest):
+            self.model = FlatForest.from_sklearn(self.model)
+        
+        # Create processed symptoms list for fuzzy matching
+        self.symptoms_list_processed = {
+            symptom.replace('_', ' ').lower(): value 
+            for symptom, value in self.symptoms_list.items()
+        }
+        
+        # Processed symptom name for each feature index
+        self.symptom_names = [None] * len(self.symptoms_list_processed)
+        for symptom, idx in self.symptoms_list_processed.items():
+            self.symptom_names[idx] = symptom
+        
+        # Precompiled resolution index (exact map, trigram candidates, LRU cache)
+        self.resolver = SymptomResolver(self.symptoms_list_processed.keys())
+        
+        # /symptoms entries in display order, with the autocomplete index over them
+        self.symptom_search = SymptomSearchIndex(sorted(
+            ({'id': symptom, 'name': symptom.replace('_', ' ').title(), 'index': idx}
+             for symptom, idx in self.symptoms_list.items()),
+            key=lambda x: x['name']
+        ))
+        
+        # Disease name for each column of predict_proba
+        self.class_diseases = [
+            self.diseases_list.get(label, 'Unknown') for label in getattr(self.model, 'classes_', np.array([])).tolist()
+        ]
+        
+        # (disease, severity, specialist) for each column of predict_proba
+        self.class_summaries = []
+        for disease in self.class_diseases:
+            record = self.disease_records.get(disease) or empty_record(disease)
+            self.class_summaries.append((disease, record.severity, record.specialist))
+        
+        # Case-insensitive index of the supported diseases
+        self.disease_lookup = {name.lower(): name for name in self.disease_records}
+        
+        # Symptom-severity weights aligned with the feature indices, and red flags
+        if self.symptom_weights is None:
+            self.symptom_weights = load_severity_weights(
+                os.path.join(DATA_DIR, 'Symptom-severity.csv'), self.symptoms_list)
+        self.triage = TriageScorer(self.symptom_weights, self.symptoms_list)
+        self.red_flag_shortcut = red_flag_shortcut
+        
+        # Per-thread reusable feature rows
+        self._local = threading.local()
+        
+        # Exact-match probability table for known symptom patterns
+        self.inference_mode = inference_mode
+        self.pattern_cache = None
+        if inference_mode == 'lookup':
+            if self.training_patterns is None:
+                self.training_patterns = load_training_patterns(os.path.join(DATA_DIR, 'Training.csv'))
+            self.pattern_cache = PatternCache(self.model, self.training_patterns, lookup_cache_size)
+        
+        self.load_seconds = time.perf_counter() - started
+    
+    def _load_sources(self):
+        """Load the model pickle and CSV datasets, building the disease records"""
+        import pandas as pd
+        
         # Load datasets
         self.sym_des = pd.read_csv(os.path.join(DATA_DIR, 'symptoms_df.csv'))
         self.precautions = pd.read_csv(os.path.join(DATA_DIR, 'precautions_df.csv'))
@@ -30,273 +291,199 @@ class SymptomPredictor:
         self.severity = pd.read_csv(os.path.join(DATA_DIR, 'Symptom-severity.csv'))
         
         # Load the trained Random Forest model
-        self.model = pickle.load(open(os.path.join(MODEL_DIR, 'RandomForest.pkl'), 'rb'))
+        with open(os.path.join(MODEL_DIR, 'RandomForest.pkl'), 'rb') as f:
+            self.model = pickle.load(f)
+        self.version = 'source'
         
-        # Symptom to index mapping (132 symptoms)
-        self.symptoms_list = {
-            'itching': 0, 'skin_rash': 1, 'nodal_skin_eruptions': 2, 'continuous_sneezing': 3,
-            'shivering': 4, 'chills': 5, 'joint_pain': 6, 'stomach_pain': 7, 'acidity': 8,
-            'ulcers_on_tongue': 9, 'muscle_wasting': 10, 'vomiting': 11, 'burning_micturition': 12,
-            'spotting_ urination': 13, 'fatigue': 14, 'weight_gain': 15, 'anxiety': 16,
-            'cold_hands_and_feets': 17, 'mood_swings': 18, 'weight_loss': 19, 'restlessness': 20,
-            'lethargy': 21, 'patches_in_throat': 22, 'irregular_sugar_level': 23, 'cough': 24,
-            'high_fever': 25, 'sunken_eyes': 26, 'breathlessness': 27, 'sweating': 28,
-            'dehydration': 29, 'indigestion': 30, 'headache': 31, 'yellowish_skin': 32,
-            'dark_urine': 33, 'nausea': 34, 'loss_of_appetite': 35, 'pain_behind_the_eyes': 36,
-            'back_pain': 37, 'constipation': 38, 'abdominal_pain': 39, 'diarrhoea': 40,
-            'mild_fever': 41, 'yellow_urine': 42, 'yellowing_of_eyes': 43, 'acute_liver_failure': 44,
-            'fluid_overload': 45, 'swelling_of_stomach': 46, 'swelled_lymph_nodes': 47, 'malaise': 48,
-            'blurred_and_distorted_vision': 49, 'phlegm': 50, 'throat_irritation': 51,
-            'redness_of_eyes': 52, 'sinus_pressure': 53, 'runny_nose': 54, 'congestion': 55,
-            'chest_pain': 56, 'weakness_in_limbs': 57, 'fast_heart_rate': 58,
-            'pain_during_bowel_movements': 59, 'pain_in_anal_region': 60, 'bloody_stool': 61,
-            'irritation_in_anus': 62, 'neck_pain': 63, 'dizziness': 64, 'cramps': 65,
-            'bruising': 66, 'obesity': 67, 'swollen_legs': 68, 'swollen_blood_vessels': 69,
-            'puffy_face_and_eyes': 70, 'enlarged_thyroid': 71, 'brittle_nails': 72,
-            'swollen_extremeties': 73, 'excessive_hunger': 74, 'extra_marital_contacts': 75,
-            'drying_and_tingling_lips': 76, 'slurred_speech': 77, 'knee_pain': 78,
-            'hip_joint_pain': 79, 'muscle_weakness': 80, 'stiff_neck': 81, 'swelling_joints': 82,
-            'movement_stiffness': 83, 'spinning_movements': 84, 'loss_of_balance': 85,
-            'unsteadiness': 86, 'weakness_of_one_body_side': 87, 'loss_of_smell': 88,
-            'bladder_discomfort': 89, 'foul_smell_of urine': 90, 'continuous_feel_of_urine': 91,
-            'passage_of_gases': 92, 'internal_itching': 93, 'toxic_look_(typhos)': 94,
-            'depression': 95, 'irritability': 96, 'muscle_pain': 97, 'altered_sensorium': 98,
-            'red_spots_over_body': 99, 'belly_pain': 100, 'abnormal_menstruation': 101,
-            'dischromic _patches': 102, 'watering_from_eyes': 103, 'increased_appetite': 104,
-            'polyuria': 105, 'family_history': 106, 'mucoid_sputum': 107, 'rusty_sputum': 108,
-            'lack_of_concentration': 109, 'visual_disturbances': 110, 'receiving_blood_transfusion': 111,
-            'receiving_unsterile_injections': 112, 'coma': 113, 'stomach_bleeding': 114,
-            'distention_of_abdomen': 115, 'history_of_alcohol_consumption': 116, 'fluid_overload.1': 117,
-            'blood_in_sputum': 118, 'prominent_veins_on_calf': 119, 'palpitations': 120,
-            'painful_walking': 121, 'pus_filled_pimples': 122, 'blackheads': 123, 'scurring': 124,
-            'skin_peeling': 125, 'silver_like_dusting': 126, 'small_dents_in_nails': 127,
-            'inflammatory_nails': 128, 'blister': 129, 'red_sore_around_nose': 130, 'yellow_crust_ooze': 131
-        }
+        # Lookup tables
+        self.symptoms_list = SYMPTOMS_LIST
+        self.diseases_list = DISEASES_LIST
+        self.disease_specialist = DISEASE_SPECIALIST
+        self.disease_severity = DISEASE_SEVERITY
         
-        # Disease index to name mapping (41 diseases)
-        self.diseases_list = {
-            15: 'Fungal infection', 4: 'Allergy', 16: 'GERD', 9: 'Chronic cholestasis',
-            14: 'Drug Reaction', 33: 'Peptic ulcer disease', 1: 'AIDS', 12: 'Diabetes',
-            17: 'Gastroenteritis', 6: 'Bronchial Asthma', 23: 'Hypertension', 30: 'Migraine',
-            7: 'Cervical spondylosis', 32: 'Paralysis (brain hemorrhage)', 28: 'Jaundice',
-            29: 'Malaria', 8: 'Chicken pox', 11: 'Dengue', 37: 'Typhoid', 40: 'hepatitis A',
-            19: 'Hepatitis B', 20: 'Hepatitis C', 21: 'Hepatitis D', 22: 'Hepatitis E',
-            3: 'Alcoholic hepatitis', 36: 'Tuberculosis', 10: 'Common Cold', 34: 'Pneumonia',
-            13: 'Dimorphic hemmorhoids(piles)', 18: 'Heart attack', 39: 'Varicose veins',
-            26: 'Hypothyroidism', 24: 'Hyperthyroidism', 25: 'Hypoglycemia', 31: 'Osteoarthritis',
-            5: 'Arthritis', 0: 'Vertigo (Paroxysmal Positional)', 2: 'Acne',
-            38: 'Urinary tract infection', 35: 'Psoriasis', 27: 'Impetigo'
-        }
-        
-        # Disease to specialist mapping
-        self.disease_specialist = {
-            'Fungal infection': 'Dermatologist',
-            'Allergy': 'Allergist/Immunologist',
-            'GERD': 'Gastroenterologist',
-            'Chronic cholestasis': 'Hepatologist',
-            'Drug Reaction': 'Allergist/Immunologist',
-            'Peptic ulcer disease': 'Gastroenterologist',
-            'AIDS': 'Infectious Disease Specialist',
-            'Diabetes': 'Endocrinologist',
-            'Gastroenteritis': 'Gastroenterologist',
-            'Bronchial Asthma': 'Pulmonologist',
-            'Hypertension': 'Cardiologist',
-            'Migraine': 'Neurologist',
-            'Cervical spondylosis': 'Orthopedic Surgeon',
-            'Paralysis (brain hemorrhage)': 'Neurologist',
-            'Jaundice': 'Hepatologist',
-            'Malaria': 'Infectious Disease Specialist',
-            'Chicken pox': 'General Physician',
-            'Dengue': 'Infectious Disease Specialist',
-            'Typhoid': 'Infectious Disease Specialist',
-            'hepatitis A': 'Hepatologist',
-            'Hepatitis B': 'Hepatologist',
-            'Hepatitis C': 'Hepatologist',
-            'Hepatitis D': 'Hepatologist',
-            'Hepatitis E': 'Hepatologist',
-            'Alcoholic hepatitis': 'Hepatologist',
-            'Tuberculosis': 'Pulmonologist',
-            'Common Cold': 'General Physician',
-            'Pneumonia': 'Pulmonologist',
-            'Dimorphic hemmorhoids(piles)': 'Proctologist',
-            'Heart attack': 'Cardiologist',
-            'Varicose veins': 'Vascular Surgeon',
-            'Hypothyroidism': 'Endocrinologist',
-            'Hyperthyroidism': 'Endocrinologist',
-            'Hypoglycemia': 'Endocrinologist',
-            'Osteoarthritis': 'Rheumatologist',
-            'Arthritis': 'Rheumatologist',
-            'Vertigo (Paroxysmal Positional)': 'ENT Specialist',
-            'Acne': 'Dermatologist',
-            'Urinary tract infection': 'Urologist',
-            'Psoriasis': 'Dermatologist',
-            'Impetigo': 'Dermatologist'
-        }
-        
-        # Disease severity levels (for triage)
-        self.disease_severity = {
-            'Heart attack': 'emergency',
-            'Paralysis (brain hemorrhage)': 'emergency',
-            'AIDS': 'high',
-            'Tuberculosis': 'high',
-            'Pneumonia': 'high',
-            'Dengue': 'high',
-            'Malaria': 'high',
-            'Typhoid': 'high',
-            'Hepatitis B': 'high',
-            'Hepatitis C': 'high',
-            'Hepatitis D': 'high',
-            'Diabetes': 'moderate',
-            'Hypertension': 'moderate',
-            'Bronchial Asthma': 'moderate',
-            'GERD': 'moderate',
-            'Chronic cholestasis': 'moderate',
-            'Jaundice': 'moderate',
-            'hepatitis A': 'moderate',
-            'Hepatitis E': 'moderate',
-            'Alcoholic hepatitis': 'moderate',
-            'Peptic ulcer disease': 'moderate',
-            'Gastroenteritis': 'low',
-            'Common Cold': 'low',
-            'Allergy': 'low',
-            'Fungal infection': 'low',
-            'Acne': 'low',
-            'Migraine': 'low',
-            'Urinary tract infection': 'low',
-            'Psoriasis': 'low',
-            'Impetigo': 'low',
-            'Chicken pox': 'low',
-            'Drug Reaction': 'moderate',
-            'Cervical spondylosis': 'low',
-            'Dimorphic hemmorhoids(piles)': 'low',
-            'Varicose veins': 'low',
-            'Hypothyroidism': 'moderate',
-            'Hyperthyroidism': 'moderate',
-            'Hypoglycemia': 'moderate',
-            'Osteoarthritis': 'low',
-            'Arthritis': 'low',
-            'Vertigo (Paroxysmal Positional)': 'low'
-        }
+        # Disease knowledge materialized once per disease; names that only
+        # appear in the datasets are kept apart so they stay out of /diseases
+        frames = (self.description, self.precautions, self.medications, self.diets, self.workout)
+        self.disease_records = build_disease_records(
+            self.diseases_list.values(), self.disease_specialist, self.disease_severity, frames
+        )
+        self.other_records = build_disease_records(
+            sorted(knowledge_names(frames) - set(self.disease_records)),
+            self.disease_specialist, self.disease_severity, frames
+        )
+    
+    def _load_artifact(self, artifact_dir: str, forest_engine: str = 'sklearn'):
+        """Load model, lookup tables and disease records from a compiled artifact"""
+        artifact = load_artifact(artifact_dir, forest_engine)
+        self.artifact = artifact
+        self.model = artifact.model
+        self.version = artifact.version
         
-        # Create processed symptoms list for fuzzy matching
-        self.symptoms_list_processed = {
-            symptom.replace('_', ' ').lower(): value 
-            for symptom, value in self.symptoms_list.items()
-        }
+        # Lookup tables
+        self.symptoms_list = {name: idx for idx, name in enumerate(artifact.tables['symptoms'])}
+        self.diseases_list = {int(idx): name for idx, name in artifact.tables['diseases'].items()}
+        self.disease_specialist = artifact.tables['specialists']
+        self.disease_severity = artifact.tables['severities']
         
+        self.training_patterns = artifact.patterns
+        self.training_set = artifact.training
+        self.symptom_weights = artifact.tables.get('symptom_weights')
+        self.disease_records = {d['name']: DiseaseRecord(**d) for d in artifact.tables['records']}
+        self.other_records = {d['name']: DiseaseRecord(**d) for d in artifact.tables['other_records']}
+    
+    def load_training_set(self):
+        """Deduplicated training rows (train_model.TrainingSet) the model was fit on
+
+        Memory-mapped from the artifact; without one (or for artifacts built
+        before it held them) Training.csv is parsed on first use and kept.
+        """
+        with self._training_lock:
+            if self.training_set is None:
+                from train_model import TRAINING_FILE, read_training_set
+                self.training_set = read_training_set(TRAINING_FILE)
+            return self.training_set
+    
     def get_all_symptoms(self) -> List[Dict[str, str]]:
         """Get list of all available symptoms"""
-        symptoms = []
-        for symptom, idx in self.symptoms_list.items():
-            display_name = symptom.replace('_', ' ').title()
-            symptoms.append({
-                'id': symptom,
-                'name': display_name,
-                'index': idx
-            })
-        return sorted(symptoms, key=lambda x: x['name'])
+        return [dict(entry) for entry in self.symptom_search.entries]
     
     def correct_spelling(self, symptom: str) -> Optional[str]:
         """Correct misspelled symptoms using fuzzy matching"""
-        closest_match, score = process.extractOne(symptom, self.symptoms_list_processed.keys())
-        if score >= 70:  # Lowered threshold for better matching
-            return closest_match
-        return None
-    
-    def get_disease_info(self, disease: str) -> Dict[str, Any]:
-        """Get comprehensive information about a disease"""
-        # Description
-        desc_row = self.description[self.description['Disease'] == disease]
-        description = desc_row['Description'].values[0] if len(desc_row) > 0 else "No description available."
-        
-        # Precautions
-        prec_row = self.precautions[self.precautions['Disease'] == disease]
-        precautions = []
-        if len(prec_row) > 0:
-            for col in ['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']:
-                if col in prec_row.columns and pd.notna(prec_row[col].values[0]):
-                    precautions.append(prec_row[col].values[0])
-        
-        # Medications
-        med_row = self.medications[self.medications['Disease'] == disease]
-        medications = []
-        if len(med_row) > 0:
-            try:
-                med_list = ast.literal_eval(med_row['Medication'].values[0])
-                medications = med_list if isinstance(med_list, list) else [med_list]
-            except:
-                medications = []
-        
-        # Diet
-        diet_row = self.diets[self.diets['Disease'] == disease]
-        diet = []
-        if len(diet_row) > 0:
-            try:
-                diet_list = ast.literal_eval(diet_row['Diet'].values[0])
-                diet = diet_list if isinstance(diet_list, list) else [diet_list]
-            except:
-                diet = []
-        
-        # Workout
-        workout_row = self.workout[self.workout['disease'] == disease]
-        workout = workout_row['workout'].tolist() if len(workout_row) > 0 else []
-        
-        return {
-            'description': description,
-            'precautions': precautions,
-            'medications': medications,
-            'diet': diet,
-            'workout': workout
-        }
+        return self.resolver.match(symptom)
     
-    def predict(self, symptoms: List[str]) -> Dict[str, Any]:
-        """
-        Predict disease based on symptoms
-        
-        Args:
-            symptoms: List of symptom strings (can be user-friendly names)
-            
-        Returns:
-            Dictionary with prediction results
-        """
-        # Process and validate symptoms
+    def resolve_symptoms(self, symptoms: List[str]) -> Tuple[List[str], List[str]]:
+        """Match raw symptom strings, returning (matched, invalid)"""
         corrected_symptoms = []
         invalid_symptoms = []
-        
         for symptom in symptoms:
-            # Normalize the symptom
-            normalized = symptom.lower().strip().replace('_', ' ')
-            
-            # Try to find a match
-            corrected = self.correct_spelling(normalized)
+            # Normalize and match the symptom (cached per raw string)
+            corrected = self.resolver.resolve(symptom)
             if corrected:
                 corrected_symptoms.append(corrected)
             else:
                 invalid_symptoms.append(symptom)
-        
-        if not corrected_symptoms:
-            return {
-                'success': False,
-                'error': 'No valid symptoms found',
-                'invalid_symptoms': invalid_symptoms
-            }
-        
-        # Create feature vector
-        feature_vector = np.zeros(len(self.symptoms_list_processed))
-        for symptom in corrected_symptoms:
-            if symptom in self.symptoms_list_processed:
-                feature_vector[self.symptoms_list_processed[symptom]] = 1
-        
-        # Predict disease
-        prediction_idx = self.model.predict([feature_vector])[0]
-        predicted_disease = self.diseases_list.get(prediction_idx, 'Unknown')
-        
-        # Get prediction probabilities if available
-        confidence = 0.95  # Default high confidence for Random Forest
+        return corrected_symptoms, invalid_symptoms
+    
+    def _feature_buffer(self) -> np.ndarray:
+        """Zeroed 1 x 132 uint8 feature row, reused per thread"""
+        features = getattr(self._local, 'features', None)
+        if features is None:
+            features = np.zeros((1, len(self.symptom_names)), dtype=np.uint8)
+            self._local.features = features
+        else:
+            features.fill(0)
+        return features
+    
+    def _predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities, served from the pattern table in 'lookup' mode"""
+        if self.pattern_cache is not None:
+            return self.pattern_cache.predict_proba(features)
+        return self.model.predict_proba(features)
+    
+    def _row_proba(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities of a single feature row"""
+        return self._predict_proba(features)[0]
+    
+    def _infer(self, features: np.ndarray) -> Tuple[str, float]:
+        """Run the forest once, deriving the label and confidence from predict_proba"""
         if hasattr(self.model, 'predict_proba'):
-            proba = self.model.predict_proba([feature_vector])[0]
-            confidence = float(max(proba))
-        
+            proba = self._row_proba(features)
+            best = int(np.argmax(proba))
+            return self.class_diseases[best], float(proba[best])
+        prediction_idx = self.model.predict(features)[0]
+        # Default high confidence for Random Forest
+        return self.diseases_list.get(prediction_idx, 'Unknown'), 0.95
+    
+    def _infer_batch(self, features: np.ndarray) -> List[Tuple[str, float]]:
+        """Vectorized _infer over a feature matrix, one forest pass for all rows"""
+        if hasattr(self.model, 'predict_proba'):
+            return self._decide_batch(self._predict_proba(features))
+        return [(self.diseases_list.get(p, 'Unknown'), 0.95) for p in self.model.predict(features)]
+    
+    def _decide_batch(self, proba: np.ndarray) -> List[Tuple[str, float]]:
+        """Label and confidence of every row of a probability matrix"""
+        best = np.argmax(proba, axis=1)
+        confidence = proba[np.arange(len(best)), best]
+        return [(self.class_diseases[b], float(c)) for b, c in zip(best.tolist(), confidence.tolist())]
+    
+    def _differential(self, proba: np.ndarray, top_k: int) -> List[Dict[str, Any]]:
+        """The top_k most likely diseases of one probability vector, best first"""
+        k = min(top_k, len(proba))
+        # Partial selection of the k largest, then ordered by probability with
+        # ties broken by class index, the same way np.argmax picks the winner
+        top = np.argpartition(proba, len(proba) - k)[len(proba) - k:]
+        top = top[np.lexsort((top, -proba[top]))]
+        differential = []
+        for idx in top.tolist():
+            if proba[idx] <= 0:
+                break
+            disease, severity, specialist = self.class_summaries[idx]
+            differential.append({
+                'disease': disease,
+                'probability': round(float(proba[idx]) * 100, 1),
+                'severity': severity,
+                'specialist': specialist
+            })
+        return differential
+    
+    def _single_differential(self, disease: str, confidence: float) -> List[Dict[str, Any]]:
+        """Differential of a model without predict_proba: the prediction alone"""
+        return [{
+            'disease': disease,
+            'probability': round(confidence * 100, 1),
+            'severity': self.disease_severity.get(disease, 'moderate'),
+            'specialist': self.disease_specialist.get(disease, 'General Physician')
+        }]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics of the resolution and inference layers"""
+        resolver = self.resolver.cache_info()
+        search = self.symptom_search.cache_info()
+        lookups = resolver.hits + resolver.misses
+        return {
+            'model_version': self.version,
+            'inference_mode': self.inference_mode,
+            'forest_engine': self.forest_engine,
+            'symptom_resolution': {
+                'hits': resolver.hits,
+                'misses': resolver.misses,
+                'size': resolver.currsize,
+                'max_size': resolver.maxsize,
+                'hit_rate': round(resolver.hits / lookups, 4) if lookups else 0.0
+            },
+            'symptom_search': {
+                'hits': search.hits,
+                'misses': search.misses,
+                'size': search.currsize,
+                'max_size': search.maxsize
+            },
+            'pattern_cache': self.pattern_cache.stats() if self.pattern_cache else None
+        }
+    
+    def get_disease_info(self, disease: str) -> Dict[str, Any]:
+        """Get comprehensive information about a disease"""
+        record = self.disease_records.get(disease) or self.other_records.get(disease)
+        if record is not None:
+            return record.info()
+        return empty_record(disease).info()
+    
+    def _active_symptoms(self, symptoms: Optional[List[str]],
+                         symptom_indices: Optional[List[int]]) -> Tuple[List[int], List[str], List[str]]:
+        """Resolve one request to (active indices, matched symptoms, invalid symptoms)"""
+        if symptom_indices is not None:
+            active = [i for i in symptom_indices if 0 <= i < len(self.symptom_names)]
+            corrected_symptoms = [self.symptom_names[i] for i in active]
+            invalid_symptoms = [str(i) for i in symptom_indices if not 0 <= i < len(self.symptom_names)]
+        else:
+            corrected_symptoms, invalid_symptoms = self.resolve_symptoms(symptoms or [])
+            active = [self.symptoms_list_processed[s] for s in corrected_symptoms]
+        return active, corrected_symptoms, invalid_symptoms
+    
+    def _build_result(self, predicted_disease: str, confidence: float,
+                      corrected_symptoms: List[str], invalid_symptoms: List[str],
+                      differential: Optional[List[Dict[str, Any]]] = None,
+                      burden: float = 0.0, red_flags: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Assemble the prediction response for a predicted disease"""
         # Get disease information
         disease_info = self.get_disease_info(predicted_disease)
         
@@ -306,21 +493,13 @@ class SymptomPredictor:
         # Get severity level
         severity = self.disease_severity.get(predicted_disease, 'moderate')
         
-        # Determine triage recommendation
-        if severity == 'emergency':
-            triage = 'emergency'
-            triage_message = 'Seek emergency medical care immediately'
-        elif severity == 'high':
-            triage = 'consultation_24'
-            triage_message = 'Consult a doctor within 24 hours'
-        elif severity == 'moderate':
-            triage = 'consultation'
-            triage_message = 'Schedule an appointment with a doctor'
+        # Determine triage recommendation from the disease severity and symptom burden
+        if red_flags:
+            triage, triage_message = 'emergency', RED_FLAG_MESSAGE
         else:
-            triage = 'self_care'
-            triage_message = 'Self-care may be appropriate, but consult a doctor if symptoms persist'
+            triage, triage_message = self.triage.level(severity, burden)
         
-        return {
+        result = {
             'success': True,
             'disease': predicted_disease,
             'confidence': round(confidence * 100, 1),
@@ -336,26 +515,242 @@ class SymptomPredictor:
             'diet': disease_info['diet'],
             'workout': disease_info['workout'],
             'matched_symptoms': corrected_symptoms,
-            'invalid_symptoms': invalid_symptoms
+            'invalid_symptoms': invalid_symptoms,
+            'symptom_burden': burden,
+            'red_flags': red_flags or [],
+            'model_version': self.version
+        }
+        if differential is not None:
+            result['differential'] = differential
+        return result
+    
+    def predict(self, symptoms: Optional[List[str]] = None,
+                symptom_indices: Optional[List[int]] = None, top_k: int = 1,
+                timings: bool = False) -> Dict[str, Any]:
+        """
+        Predict disease based on symptoms
+        
+        Args:
+            symptoms: List of symptom strings (can be user-friendly names)
+            symptom_indices: Optional active symptom indices (0-131); when given,
+                the string matching path is skipped entirely
+            top_k: When above 1, the result also carries a 'differential' list
+                of the top_k most likely diseases (zero-probability ones omitted)
+            timings: Add 'stage_seconds', the duration of each PREDICT_STAGES
+                stage the request went through
+            
+        Returns:
+            Dictionary with prediction results
+        """
+        started = time.perf_counter()
+        # Process and validate symptoms
+        active, corrected_symptoms, invalid_symptoms = self._active_symptoms(symptoms, symptom_indices)
+        resolved = time.perf_counter()
+        
+        if not corrected_symptoms:
+            result = {
+                'success': False,
+                'error': 'No valid symptoms found',
+                'invalid_symptoms': invalid_symptoms
+            }
+            stages = {}
+        else:
+            stages = {} if timings else None
+            result = self._predict_active(active, corrected_symptoms, invalid_symptoms, top_k, stages)
+        if timings:
+            result['stage_seconds'] = {'resolve': resolved - started, **stages}
+        return result
+    
+    def _emergency_result(self, corrected_symptoms: List[str], invalid_symptoms: List[str],
+                          burden: float, red_flags: List[str], top_k: int) -> Dict[str, Any]:
+        """Response for red-flag symptoms, built without running the model"""
+        result = {
+            'success': True,
+            'disease': None,
+            'confidence': None,
+            'severity': 'emergency',
+            'specialist': 'Emergency Medicine',
+            'triage': {
+                'level': 'emergency',
+                'message': RED_FLAG_MESSAGE
+            },
+            'description': RED_FLAG_MESSAGE,
+            'precautions': [],
+            'medications': [],
+            'diet': [],
+            'workout': [],
+            'matched_symptoms': corrected_symptoms,
+            'invalid_symptoms': invalid_symptoms,
+            'symptom_burden': burden,
+            'red_flags': red_flags,
+            'model_version': self.version
         }
+        if top_k > 1:
+            result['differential'] = []
+        return result
+    
+    def _predict_active(self, active: List[int], corrected_symptoms: List[str],
+                        invalid_symptoms: List[str], top_k: int = 1,
+                        stages: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Prediction result for already resolved active symptom indices, timing stages into stages"""
+        started = time.perf_counter()
+        burden = self.triage.burden(active)
+        red_flags = self.triage.red_flags_for(active)
+        triaged = time.perf_counter()
+        if red_flags and self.red_flag_shortcut:
+            result = self._emergency_result(corrected_symptoms, invalid_symptoms, burden, red_flags, top_k)
+            if stages is not None:
+                stages.update(triage=triaged - started, info=time.perf_counter() - triaged)
+            return result
+        
+        # Create feature vector and predict disease with a single forest pass
+        features = self._feature_buffer()
+        features[0, active] = 1
+        built = time.perf_counter()
+        differential = None
+        if top_k > 1 and hasattr(self.model, 'predict_proba'):
+            proba = self._row_proba(features)
+            best = int(np.argmax(proba))
+            predicted_disease, confidence = self.class_diseases[best], float(proba[best])
+            differential = self._differential(proba, top_k)
+        else:
+            predicted_disease, confidence = self._infer(features)
+            if top_k > 1:
+                differential = self._single_differential(predicted_disease, confidence)
+        inferred = time.perf_counter()
+        
+        result = self._build_result(predicted_disease, confidence, corrected_symptoms, invalid_symptoms,
+                                    differential, burden, red_flags)
+        if stages is not None:
+            stages.update(triage=triaged - started, features=built - triaged,
+                          inference=inferred - built, info=time.perf_counter() - inferred)
+        return result
+    
+    def predict_batch(self, symptoms_batch: List[Optional[List[str]]],
+                      indices_batch: Optional[List[Optional[List[int]]]] = None,
+                      chunk_size: int = BATCH_CHUNK_SIZE,
+                      top_k_batch: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Predict diseases for many patients with one forest call per chunk
+        
+        Args:
+            symptoms_batch: One symptom list per patient
+            indices_batch: Optional active symptom indices per patient; an entry
+                that is not None replaces the symptom list of that patient
+            chunk_size: Maximum rows per model call
+            top_k_batch: Optional differential size per patient (see predict)
+            
+        Returns:
+            One result per patient, in input order; patients without valid
+            symptoms get their own error result
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(symptoms_batch)
+        pending = []
+        for pos, symptoms in enumerate(symptoms_batch):
+            symptom_indices = indices_batch[pos] if indices_batch is not None else None
+            active, corrected_symptoms, invalid_symptoms = self._active_symptoms(symptoms, symptom_indices)
+            if not corrected_symptoms:
+                results[pos] = {
+                    'success': False,
+                    'error': 'No valid symptoms found',
+                    'invalid_symptoms': invalid_symptoms
+                }
+            else:
+                top_k = top_k_batch[pos] if top_k_batch is not None else 1
+                pending.append((pos, active, corrected_symptoms, invalid_symptoms, top_k))
+        
+        # Stack the valid rows into feature matrices and run the forest once per chunk
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            features = np.zeros((len(chunk), len(self.symptom_names)), dtype=np.uint8)
+            for row, (_, active, _, _, _) in enumerate(chunk):
+                features[row, active] = 1
+            
+            # Symptom burden and red flags for the whole chunk; red-flag rows skip the forest
+            burdens = self.triage.burden_batch(features).tolist()
+            flagged = self.triage.red_flag_rows(features)
+            model_rows = np.flatnonzero(~flagged) if self.red_flag_shortcut else np.arange(len(chunk))
+            proba = None
+            decisions = []
+            if len(model_rows):
+                model_features = features if len(model_rows) == len(chunk) else features[model_rows]
+                proba = self._predict_proba(model_features) if hasattr(self.model, 'predict_proba') else None
+                decisions = self._decide_batch(proba) if proba is not None else self._infer_batch(model_features)
+            slots = {row: slot for slot, row in enumerate(model_rows.tolist())}
+            
+            for row, (pos, active, corrected_symptoms, invalid_symptoms, top_k) in enumerate(chunk):
+                red_flags = self.triage.red_flags_for(active) if flagged[row] else []
+                slot = slots.get(row)
+                if slot is None:
+                    results[pos] = self._emergency_result(corrected_symptoms, invalid_symptoms,
+                                                          burdens[row], red_flags, top_k)
+                    continue
+                disease, confidence = decisions[slot]
+                differential = None
+                if top_k > 1:
+                    differential = (self._differential(proba[slot], top_k) if proba is not None
+                                    else self._single_differential(disease, confidence))
+                results[pos] = self._build_result(disease, confidence, corrected_symptoms, invalid_symptoms,
+                                                  differential, burdens[row], red_flags)
+        
+        return results
+
+
+def create_predictor(artifact_dir: Optional[str] = None) -> SymptomPredictor:
+    """A predictor configured from the environment, loading artifact_dir (default: resolve_artifact_dir)"""
+    return SymptomPredictor(
+        artifact_dir=resolve_artifact_dir(artifact_dir),
+        inference_mode=os.environ.get('ML_INFERENCE_MODE', 'forest'),
+        lookup_cache_size=int(os.environ.get('ML_LOOKUP_CACHE_SIZE', DEFAULT_LRU_SIZE)),
+        red_flag_shortcut=os.environ.get('ML_RED_FLAG_SHORTCUT', '0') == '1',
+        forest_engine=os.environ.get('ML_FOREST_ENGINE', 'sklearn')
+    )
 
 
 # Create singleton instance
 _predictor = None
+_predictor_lock = threading.Lock()
 
 def get_predictor() -> SymptomPredictor:
     """Get or create the symptom predictor instance"""
     global _predictor
     if _predictor is None:
-        _predictor = SymptomPredictor()
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = create_predictor()
     return _predictor
 
 
+def swap_predictor(predictor: SymptomPredictor) -> Optional[SymptomPredictor]:
+    """Make predictor the shared instance, returning the one it replaces
+    
+    Calls that already fetched the previous instance finish on it, so
+    in-flight requests are answered by the version they started with.
+    """
+    global _predictor
+    with _predictor_lock:
+        previous, _predictor = _predictor, predictor
+    return previous
+
+
 # API functions for external use
 def get_symptoms() -> List[Dict[str, str]]:
     """Get all available symptoms"""
     return get_predictor().get_all_symptoms()
 
-def predict_disease(symptoms: List[str]) -> Dict[str, Any]:
-    """Predict disease from symptoms"""
-    return get_predictor().predict(symptoms)
+def resolve_request(symptoms: Optional[List[str]] = None,
+                    symptom_indices: Optional[List[int]] = None) -> Tuple[List[int], List[str], List[str]]:
+    """Resolve one request to (active indices, matched symptoms, invalid symptoms)"""
+    return get_predictor()._active_symptoms(symptoms, symptom_indices)
+
+def predict_disease(symptoms: Optional[List[str]] = None,
+                    symptom_indices: Optional[List[int]] = None, top_k: int = 1,
+                    timings: bool = False) -> Dict[str, Any]:
+    """Predict disease from symptoms or active symptom indices"""
+    return get_predictor().predict(symptoms, symptom_indices, top_k, timings)
+
+def predict_disease_batch(symptoms_batch: List[Optional[List[str]]],
+                          indices_batch: Optional[List[Optional[List[int]]]] = None,
+                          top_k_batch: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """Predict diseases for a batch of patients"""
+    return get_predictor().predict_batch(symptoms_batch, indices_batch, top_k_batch=top_k_batch)
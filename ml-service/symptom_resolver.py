@@ -0,0 +1,142 @@
+"""
+Symptom resolution layer for the ML service
+Maps free-text symptoms onto the model vocabulary with the same results as
+fuzzywuzzy's process.extractOne (WRatio scorer), but without scoring every
+symptom on every call
+"""
+
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from fuzzywuzzy import fuzz, utils
+
+# Default score threshold used by SymptomPredictor.correct_spelling
+MATCH_THRESHOLD = 70
+
+# Number of best trigram candidates scored before the bound-pruned scan
+CANDIDATE_LIMIT = 5
+
+
+def _query_form(text: str) -> str:
+    """Process a query exactly the way process.extractOne does"""
+    return utils.full_process(utils.full_process(text), force_ascii=True)
+
+
+def _choice_form(text: str) -> str:
+    """Process a choice exactly the way process.extractOne does"""
+    return utils.full_process(text, force_ascii=True)
+
+
+def _trigrams(processed: str) -> set:
+    """Space-padded character trigrams of every token"""
+    grams = set()
+    for token in processed.split():
+        padded = f' {token} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def _min_length(processed: str) -> int:
+    """Length of the shortest string any WRatio component derives from this one"""
+    return len(' '.join(sorted(set(processed.split()))))
+
+
+class SymptomResolver:
+    """
+    Resolve symptom strings against a fixed vocabulary
+
+    Lookups go through three layers, built once at startup:
+      1. an exact hash map of processed symptom names
+      2. a token / trigram index that picks a small candidate set to score first
+      3. a scan of the remaining symptoms that skips every symptom whose
+         character-overlap upper bound cannot reach the best score so far
+    Resolutions of raw strings are memoized in a bounded LRU cache.
+    """
+
+    def __init__(self, choices: Iterable[str], threshold: int = MATCH_THRESHOLD,
+                 cache_size: int = 4096):
+        self.choices: List[str] = list(choices)
+        self.threshold = threshold
+
+        self._processed: List[str] = [_choice_form(c) for c in self.choices]
+        self._counts: List[Counter] = [Counter(p) for p in self._processed]
+        self._min_lengths: List[int] = [_min_length(p) for p in self._processed]
+
+        # Exact matches always score 100 and only identical strings do,
+        # so the first choice with a given processed form wins outright
+        self._exact: Dict[str, int] = {}
+        self._token_index: Dict[str, List[int]] = defaultdict(list)
+        self._trigram_index: Dict[str, List[int]] = defaultdict(list)
+        for idx, processed in enumerate(self._processed):
+            self._exact.setdefault(processed, idx)
+            for token in set(processed.split()):
+                self._token_index[token].append(idx)
+            for gram in _trigrams(processed):
+                self._trigram_index[gram].append(idx)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, symptom: str) -> Optional[str]:
+        """Normalize a raw symptom the way predict() does and match it"""
+        return self.match(symptom.lower().strip().replace('_', ' '))
+
+    def cache_info(self):
+        """Hit/miss statistics of the raw-string resolution cache"""
+        return self.resolve.cache_info()
+
+    def match(self, symptom: str) -> Optional[str]:
+        """Best matching choice scoring at least the threshold, or None"""
+        idx = self._best(symptom)
+        return self.choices[idx] if idx is not None else None
+
+    def _best(self, symptom: str) -> Optional[int]:
+        """Index of the best choice at or above the threshold (first one wins ties)"""
+        query = _query_form(symptom)
+        if not query:
+            return None
+
+        exact = self._exact.get(query)
+        if exact is not None:
+            return exact
+
+        scores: Dict[int, int] = {}
+
+        def score(idx: int) -> int:
+            if idx not in scores:
+                scores[idx] = fuzz.WRatio(query, self._processed[idx], full_process=False)
+            return scores[idx]
+
+        # Choices sharing a whole token can score high through token_set_ratio,
+        # so they are always scored rather than bounded
+        tokens = set(query.split())
+        shared = set()
+        for token in tokens:
+            shared.update(self._token_index.get(token, ()))
+        hits: Counter = Counter()
+        for gram in _trigrams(query):
+            hits.update(self._trigram_index.get(gram, ()))
+        for idx in shared:
+            score(idx)
+        for idx, _ in hits.most_common(CANDIDATE_LIMIT):
+            score(idx)
+
+        floor = max(max(scores.values(), default=0), self.threshold)
+        query_counts = Counter(query)
+        query_min = _min_length(query)
+        for idx, counts in enumerate(self._counts):
+            if idx in scores:
+                continue
+            overlap = sum(min(n, counts[ch]) for ch, n in query_counts.items())
+            shortest = min(query_min, self._min_lengths[idx])
+            # Every WRatio component is a ratio over strings that contain at
+            # most `overlap` common characters and at least `shortest` chars
+            if 200 * overlap < (floor - 1) * (shortest + overlap):
+                continue
+            floor = max(floor, score(idx))
+
+        best_score = max(scores.values(), default=0)
+        if best_score < self.threshold:
+            return None
+        return min(idx for idx, s in scores.items() if s == best_score)
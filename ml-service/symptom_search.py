@@ -0,0 +1,168 @@
+"""
+Symptom autocomplete index for the ML service
+Built once at startup from the symptom vocabulary; answers /symptoms/search
+with prefix, token-prefix, substring and typo-tolerant matching, and holds
+the pre-serialized /symptoms listing with its ETag
+"""
+
+import bisect
+import hashlib
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from serialization import dumps
+
+# Default number of results returned by /symptoms/search
+SEARCH_LIMIT = 20
+
+# Match tiers, best first
+EXACT, PREFIX, TOKEN_PREFIX, SUBSTRING, FUZZY = range(5)
+
+# Query tokens shorter than this are never typo-corrected; the first letter
+# of a typo-corrected token must still match
+MIN_FUZZY_LENGTH = 3
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.lower().replace('_', ' ').split())
+
+
+def _leading_trigrams(token: str) -> Set[str]:
+    padded = f' {token}'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_distance(query: str, token: str, bound: int) -> int:
+    """Smallest edit distance between query and any prefix of token, or bound + 1 once it must exceed bound"""
+    # Only prefixes within bound characters of the query length can qualify
+    token = token[:len(query) + bound]
+    previous = list(range(len(token) + 1))
+    for i, q in enumerate(query, start=1):
+        current = [i]
+        for j, t in enumerate(token, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (q != t)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous)
+
+
+def _allowed_typos(token: str) -> int:
+    return 1 if len(token) <= 5 else 2
+
+
+class SymptomSearchIndex:
+    """
+    Ranked symptom lookup over precomputed response entries
+
+    Each entry is matched at its best tier: exact name, name prefix, every
+    query token a prefix of a name token, substring, then every query token
+    within a small edit distance of a name-token prefix. Ties keep the
+    alphabetical order of the /symptoms listing. Serialized results are
+    memoized per normalized query in a bounded LRU cache.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], cache_size: int = 4096):
+        # Entries in listing order (sorted by display name)
+        self.entries: List[Dict[str, Any]] = list(entries)
+        self._names: List[str] = [_normalize(e['name']) for e in self.entries]
+
+        self.listing_json = dumps(self.entries)
+        self.listing_etag = '"' + hashlib.sha256(self.listing_json).hexdigest()[:32] + '"'
+
+        # Sorted key arrays: bisecting them walks a prefix range like a trie
+        order = sorted(range(len(self._names)), key=self._names.__getitem__)
+        self._name_keys: List[str] = [self._names[pos] for pos in order]
+        self._name_positions: List[int] = order
+        tokens: Dict[str, Set[int]] = defaultdict(set)
+        substrings: Dict[str, Set[int]] = defaultdict(set)
+        for pos, name in enumerate(self._names):
+            for token in name.split():
+                tokens[token].add(pos)
+            for start in range(len(name)):
+                for end in range(start + 1, len(name) + 1):
+                    substrings[name[start:end]].add(pos)
+        self._token_keys: List[str] = sorted(tokens)
+        self._token_entries: Dict[str, Set[int]] = dict(tokens)
+        self._substrings: Dict[str, Set[int]] = dict(substrings)
+        self._token_trigrams: Dict[str, Set[str]] = defaultdict(set)
+        for token in self._token_keys:
+            for gram in _leading_trigrams(token):
+                self._token_trigrams[gram].add(token)
+
+        self._search_json = lru_cache(maxsize=cache_size)(self._serialize)
+
+    def cache_info(self):
+        """Hit/miss statistics of the serialized-result cache"""
+        return self._search_json.cache_info()
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> range:
+        """Index range of the sorted keys starting with prefix"""
+        start = bisect.bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def _token_prefix_entries(self, token: str) -> Set[int]:
+        matches: Set[int] = set()
+        for idx in self._prefix_range(self._token_keys, token):
+            matches |= self._token_entries[self._token_keys[idx]]
+        return matches
+
+    def _fuzzy_token_entries(self, token: str) -> Set[int]:
+        if len(token) < MIN_FUZZY_LENGTH:
+            return self._token_prefix_entries(token)
+        # Candidates share a trigram and the first letter with the query token
+        candidates: Set[str] = set()
+        for gram in _leading_trigrams(token):
+            candidates |= self._token_trigrams.get(gram, set())
+        allowed = _allowed_typos(token)
+        matches: Set[int] = set()
+        for name_token in candidates:
+            if name_token[0] == token[0] and _prefix_distance(token, name_token, allowed) <= allowed:
+                matches |= self._token_entries[name_token]
+        return matches
+
+    def _all_tokens(self, tokens: List[str], lookup) -> Set[int]:
+        matches = lookup(tokens[0])
+        for token in tokens[1:]:
+            if not matches:
+                break
+            matches = matches & lookup(token)
+        return matches
+
+    def rank(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(tier, position) of matching entries, best first; typo matching is skipped once limit is reached"""
+        query = _normalize(query)
+        if not query:
+            # Every name contains the empty string
+            return [(SUBSTRING, pos) for pos in range(len(self.entries))]
+        tiers: Dict[int, int] = {}
+
+        def add(positions: Iterable[int], tier: int):
+            for pos in positions:
+                tiers.setdefault(pos, tier)
+
+        prefixed = [self._name_positions[idx] for idx in self._prefix_range(self._name_keys, query)]
+        add((pos for pos in prefixed if self._names[pos] == query), EXACT)
+        add(prefixed, PREFIX)
+        tokens = query.split()
+        add(self._all_tokens(tokens, self._token_prefix_entries), TOKEN_PREFIX)
+        add(self._substrings.get(query, ()), SUBSTRING)
+        if limit is None or len(tiers) < limit:
+            add(self._all_tokens(tokens, self._fuzzy_token_entries), FUZZY)
+        return sorted((tier, pos) for pos, tier in tiers.items())
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """Best matching entries for an autocomplete query"""
+        return [self.entries[pos] for _, pos in self.rank(query, limit)[:limit]]
+
+    def search_json(self, query: str) -> bytes:
+        """Serialized search() result, memoized per normalized query"""
+        return self._search_json(_normalize(query))
+
+    def _serialize(self, query: str) -> bytes:
+        return dumps(self.search(query))
@@ -0,0 +1,302 @@
+"""
+Training pipeline for the disease prediction model
+Streams data/Training.csv, deduplicates the repeated symptom patterns, trains
+the Random Forest and writes model/RandomForest.pkl with a manifest
+
+The manifest records the feature order (checked against SYMPTOMS_LIST), the
+class order (checked against DISEASES_LIST), the training parameters and the
+held-out accuracy. With --sweep, every listed forest size is also trained on
+the same split and reported with its accuracy and inference latency.
+
+Usage:
+    python train_model.py [--trees 100] [--max-depth D] [--sweep 10,25,50,100]
+                          [--build-artifact]
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from symptom_predictor import DATA_DIR, DISEASES_LIST, MODEL_DIR, SYMPTOMS_LIST
+
+TRAINING_FILE = os.path.join(DATA_DIR, 'Training.csv')
+MODEL_FILE = 'RandomForest.pkl'
+MANIFEST_FILE = 'manifest.json'
+LABEL_COLUMN = 'prognosis'
+
+# Training.csv labels spelled differently from their DISEASES_LIST name
+# (compared after normalize_label); every other label must match exactly
+CLASS_LABEL_ALIASES = {
+    '(vertigo) paroymsal positional vertigo': 'vertigo (paroxysmal positional)',
+    'osteoarthristis': 'osteoarthritis',
+    'peptic ulcer diseae': 'peptic ulcer disease',
+}
+
+
+class TrainingSet:
+    """Deduplicated symptom patterns with their occurrence counts"""
+
+    def __init__(self, features: List[str], X: np.ndarray, y: np.ndarray,
+                 counts: np.ndarray, labels: List[str], rows: int, digest: str):
+        self.features = features
+        self.X = X
+        self.y = y
+        self.counts = counts
+        self.labels = labels
+        self.rows = rows
+        self.digest = digest
+
+
+def mangle_duplicates(columns: List[str]) -> List[str]:
+    """Rename repeated column names the way pandas does ('x', 'x.1', ...)"""
+    seen: Dict[str, int] = {}
+    names = []
+    for column in columns:
+        if column in seen:
+            seen[column] += 1
+            names.append(f"{column}.{seen[column]}")
+        else:
+            seen[column] = 0
+            names.append(column)
+    return names
+
+
+def read_training_set(path: str = TRAINING_FILE) -> TrainingSet:
+    """Stream the CSV row by row, keeping one entry per distinct (pattern, label)"""
+    patterns: Dict[Tuple[bytes, str], int] = {}
+    digest = hashlib.sha256()
+    rows = 0
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        digest.update(','.join(header).encode())
+        if header[-1] != LABEL_COLUMN:
+            raise ValueError(f"Last column of {path} must be '{LABEL_COLUMN}'")
+        features = mangle_duplicates(header[:-1])
+        for line, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"{path}:{line}: expected {len(header)} columns, got {len(row)}")
+            digest.update(','.join(row).encode())
+            bits = bytes(int(v) for v in row[:-1])
+            if max(bits, default=0) > 1:
+                raise ValueError(f"{path}:{line}: symptom columns must be 0 or 1")
+            key = (bits, row[-1].strip())
+            patterns[key] = patterns.get(key, 0) + 1
+            rows += 1
+
+    # Class codes follow LabelEncoder: sorted unique labels
+    labels = sorted({label for _, label in patterns})
+    codes = {label: code for code, label in enumerate(labels)}
+    X = np.array([np.frombuffer(bits, dtype=np.uint8) for bits, _ in patterns], dtype=np.uint8)
+    y = np.array([codes[label] for _, label in patterns], dtype=np.int64)
+    counts = np.array(list(patterns.values()), dtype=np.float64)
+    return TrainingSet(features, X, y, counts, labels, rows, digest.hexdigest())
+
+
+def check_feature_order(features: List[str]) -> List[str]:
+    """Mismatches between the CSV columns and SYMPTOMS_LIST indices"""
+    expected = sorted(SYMPTOMS_LIST, key=SYMPTOMS_LIST.get)
+    problems = []
+    if len(features) != len(expected):
+        problems.append(f"{len(features)} feature columns, SYMPTOMS_LIST has {len(expected)}")
+    for idx, (column, name) in enumerate(zip(features, expected)):
+        if column != name:
+            problems.append(f"feature {idx}: column '{column}' != SYMPTOMS_LIST '{name}'")
+    return problems
+
+
+def normalize_label(label: str) -> str:
+    """Lower case with runs of whitespace collapsed"""
+    return ' '.join(label.lower().split())
+
+
+def check_class_order(labels: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Pair every class code with its DISEASES_LIST name, reporting mismatches"""
+    classes = []
+    problems = []
+    if len(labels) != len(DISEASES_LIST):
+        problems.append(f"{len(labels)} classes, DISEASES_LIST has {len(DISEASES_LIST)}")
+    for code, label in enumerate(labels):
+        name = DISEASES_LIST.get(code)
+        normalized = normalize_label(label)
+        expected = CLASS_LABEL_ALIASES.get(normalized, normalized)
+        classes.append({'code': code, 'label': label, 'disease': name})
+        if name is None or normalize_label(name) != expected:
+            problems.append(f"class {code}: label '{label}' does not match DISEASES_LIST '{name}'")
+    return classes, problems
+
+
+def split_patterns(data: TrainingSet, test_size: float, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Stratified split over distinct patterns, so no held-out row is seen in training"""
+    from sklearn.model_selection import train_test_split
+
+    indices = np.arange(len(data.y))
+    _, per_class = np.unique(data.y, return_counts=True)
+    stratify = data.y if per_class.min() >= 2 else None
+    return train_test_split(indices, test_size=test_size, random_state=seed, stratify=stratify)
+
+
+def make_forest(trees: int, max_depth: Optional[int], seed: int):
+    from sklearn.ensemble import RandomForestClassifier
+
+    return RandomForestClassifier(n_estimators=trees, max_depth=max_depth, random_state=seed, n_jobs=-1)
+
+
+def fit(model, data: TrainingSet, idx: np.ndarray, weighted: bool):
+    weights = data.counts[idx] if weighted else None
+    model.fit(data.X[idx], data.y[idx], sample_weight=weights)
+    # Serve with single-threaded prediction; joblib dispatch costs more than it saves per row
+    model.set_params(n_jobs=None)
+    return model
+
+
+def measure_latency(model, X: np.ndarray, repeat: int = 200) -> Dict[str, float]:
+    """Median single-row predict_proba latency and batch throughput"""
+    rows = X[np.arange(repeat) % len(X)]
+    timings = []
+    for row in rows:
+        started = time.perf_counter()
+        model.predict_proba(row[np.newaxis, :])
+        timings.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    model.predict_proba(rows)
+    batch = time.perf_counter() - started
+    return {
+        'single_row_ms': round(float(np.median(timings)) * 1000, 3),
+        'batch_rows_per_s': round(len(rows) / batch, 1),
+    }
+
+
+def file_sha256(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def accuracy(model, data: TrainingSet, idx: np.ndarray) -> float:
+    return round(float(np.mean(model.predict(data.X[idx]) == data.y[idx])), 4)
+
+
+def train(trees: int = 100, max_depth: Optional[int] = None, seed: int = 42, test_size: float = 0.2,
+          weighted: bool = True, sweep: Optional[List[int]] = None, output_dir: str = MODEL_DIR,
+          training_file: str = TRAINING_FILE) -> Dict[str, Any]:
+    """Train, evaluate and write the model and its manifest; returns the manifest"""
+    started = time.perf_counter()
+    data = read_training_set(training_file)
+    problems = check_feature_order(data.features)
+    classes, class_problems = check_class_order(data.labels)
+    problems += class_problems
+    if problems:
+        raise ValueError("Training data does not match the service tables:\n  " + "\n  ".join(problems))
+
+    train_idx, test_idx = split_patterns(data, test_size, seed)
+    all_idx = np.arange(len(data.y))
+
+    results = []
+    for size in sorted(set(sweep or []) | {trees}):
+        model = fit(make_forest(size, max_depth, seed), data, train_idx, weighted)
+        result = {'trees': size, 'held_out_accuracy': accuracy(model, data, test_idx)}
+        result.update(measure_latency(model, data.X[test_idx]))
+        result['nodes'] = int(sum(e.tree_.node_count for e in model.estimators_))
+        results.append(result)
+    evaluation = next(r for r in results if r['trees'] == trees)
+
+    # The shipped model is refit on every distinct pattern
+    model = fit(make_forest(trees, max_depth, seed), data, all_idx, weighted)
+
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+
+    import sklearn
+    manifest = {
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'training_file': os.path.basename(training_file),
+        'training_sha256': data.digest,
+        'rows': data.rows,
+        'distinct_patterns': int(len(data.y)),
+        'params': {
+            'n_estimators': trees,
+            'max_depth': max_depth,
+            'random_state': seed,
+            'test_size': test_size,
+            'sample_weight': 'pattern_count' if weighted else None,
+        },
+        'sklearn': sklearn.__version__,
+        'numpy': np.__version__,
+        'features': data.features,
+        'classes': classes,
+        'held_out_patterns': int(len(test_idx)),
+        'held_out_accuracy': evaluation['held_out_accuracy'],
+        'training_accuracy': accuracy(model, data, all_idx),
+        'latency': {k: evaluation[k] for k in ('single_row_ms', 'batch_rows_per_s')},
+        'sweep': results if sweep else [],
+        'model_sha256': file_sha256(model_path),
+        'train_seconds': round(time.perf_counter() - started, 2),
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def print_report(manifest: Dict[str, Any]):
+    print(f"Rows read: {manifest['rows']}  distinct patterns: {manifest['distinct_patterns']}")
+    print(f"Features: {len(manifest['features'])} (match SYMPTOMS_LIST)  "
+          f"classes: {len(manifest['classes'])} (match DISEASES_LIST)")
+    print(f"Held-out accuracy ({manifest['held_out_patterns']} unseen patterns): "
+          f"{manifest['held_out_accuracy']:.4f}")
+    print(f"Training accuracy: {manifest['training_accuracy']:.4f}")
+    if manifest['sweep']:
+        print()
+        print(f"{'trees':>6} {'nodes':>8} {'held-out acc':>13} {'1-row ms':>9} {'batch rows/s':>13}")
+        for r in manifest['sweep']:
+            print(f"{r['trees']:>6} {r['nodes']:>8} {r['held_out_accuracy']:>13.4f} "
+                  f"{r['single_row_ms']:>9.3f} {r['batch_rows_per_s']:>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Random Forest from data/Training.csv")
+    parser.add_argument('--trees', type=int, default=100, help="forest size of the shipped model")
+    parser.add_argument('--max-depth', type=int, default=None, help="maximum tree depth (default: unlimited)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--test-size', type=float, default=0.2, help="fraction of distinct patterns held out")
+    parser.add_argument('--unweighted', action='store_true',
+                        help="train on distinct patterns without occurrence-count weights")
+    parser.add_argument('--sweep', help="comma-separated forest sizes to compare, e.g. 10,25,50,100")
+    parser.add_argument('--output', default=MODEL_DIR, help="directory for RandomForest.pkl and manifest.json")
+    parser.add_argument('--build-artifact', action='store_true',
+                        help="compile a new service artifact from the trained model")
+    args = parser.parse_args()
+
+    sweep = [int(n) for n in args.sweep.split(',')] if args.sweep else None
+    try:
+        manifest = train(args.trees, args.max_depth, args.seed, args.test_size,
+                         not args.unweighted, sweep, args.output)
+    except ValueError as e:
+        print(e)
+        return 1
+    print_report(manifest)
+    print(f"\nWrote {os.path.join(args.output, MODEL_FILE)} and {MANIFEST_FILE}")
+
+    if args.build_artifact:
+        if os.path.abspath(args.output) != os.path.abspath(MODEL_DIR):
+            print("--build-artifact compiles model/RandomForest.pkl; use the default --output")
+            return 1
+        from model_artifact import build_artifact
+        print(f"Built artifact {build_artifact()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
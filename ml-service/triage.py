@@ -0,0 +1,124 @@
+"""
+Symptom-based triage for the ML service
+data/Symptom-severity.csv is compiled once into a weight vector aligned with
+the SYMPTOMS_LIST indices, so the symptom burden of a request is a dot
+product with its feature row. Red-flag symptoms (or combinations) escalate
+straight to emergency, letting predict() skip the forest for them.
+"""
+
+import csv
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Triage levels from least to most urgent, with the advice shown to the patient
+TRIAGE_LEVELS = ('self_care', 'consultation', 'consultation_24', 'emergency')
+TRIAGE_MESSAGES = {
+    'self_care': 'Self-care may be appropriate, but consult a doctor if symptoms persist',
+    'consultation': 'Schedule an appointment with a doctor',
+    'consultation_24': 'Consult a doctor within 24 hours',
+    'emergency': 'Seek emergency medical care immediately',
+}
+
+# Triage level implied by the predicted disease's severity label
+SEVERITY_TRIAGE = {
+    'emergency': 'emergency',
+    'high': 'consultation_24',
+    'moderate': 'consultation',
+    'low': 'self_care',
+}
+
+# Symptom burden (sum of severity weights, 1-7 each) from which triage is
+# raised to at least the given level; full Training.csv patterns have a
+# median burden of 27 and a 95th percentile of 62
+BURDEN_THRESHOLDS = ((55.0, 'consultation_24'), (30.0, 'consultation'))
+
+# Symptoms that on their own, or together, call for emergency care
+RED_FLAG_SYMPTOMS = (
+    'coma',
+    'altered_sensorium',
+    'slurred_speech',
+    'weakness_of_one_body_side',
+    'stomach_bleeding',
+    'acute_liver_failure',
+)
+RED_FLAG_COMBINATIONS = (
+    ('chest_pain', 'breathlessness'),
+    ('chest_pain', 'sweating'),
+)
+
+RED_FLAG_MESSAGE = 'Red-flag symptoms reported: seek emergency medical care immediately'
+
+
+def _normalize(name: str) -> str:
+    return name.split('.')[0].replace('_', '').replace(' ', '').lower()
+
+
+def load_severity_weights(path: str, symptoms_list: Dict[str, int]) -> np.ndarray:
+    """Symptom-severity.csv weights indexed like symptoms_list (0 for unlisted symptoms)"""
+    # Repeated names (fluid_overload) are paired with their columns in order
+    slots: Dict[str, List[int]] = {}
+    for symptom, idx in sorted(symptoms_list.items(), key=lambda item: item[1]):
+        slots.setdefault(_normalize(symptom), []).append(idx)
+    weights = np.zeros(len(symptoms_list), dtype=np.float64)
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if len(row) < 2:
+                continue
+            free = slots.get(_normalize(row[0]))
+            if free:
+                weights[free.pop(0)] = float(row[1])
+    return weights
+
+
+class TriageScorer:
+    """Precomputed severity weights and red-flag masks over the feature indices"""
+
+    def __init__(self, weights: Sequence[float], symptoms_list: Dict[str, int]):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.symptom_ids = sorted(symptoms_list, key=symptoms_list.get)
+        self.red_flags = np.array([symptoms_list[s] for s in RED_FLAG_SYMPTOMS if s in symptoms_list],
+                                  dtype=np.intp)
+        self.red_flag_combinations = [
+            np.array([symptoms_list[s] for s in combination], dtype=np.intp)
+            for combination in RED_FLAG_COMBINATIONS
+            if all(s in symptoms_list for s in combination)
+        ]
+
+    def burden(self, active: Iterable[int]) -> float:
+        """Symptom burden of one request's active feature indices (a symptom counts once)"""
+        return float(self.weights[list(set(active))].sum())
+
+    def burden_batch(self, features: np.ndarray) -> np.ndarray:
+        """Symptom burden of every row of a 0/1 feature matrix"""
+        return features @ self.weights
+
+    def red_flags_for(self, active: Iterable[int]) -> List[str]:
+        """Ids of the red-flag symptoms (and combinations) among the active indices"""
+        present = np.zeros(len(self.weights), dtype=np.bool_)
+        present[list(active)] = True
+        flags = [self.symptom_ids[i] for i in self.red_flags.tolist() if present[i]]
+        for combination in self.red_flag_combinations:
+            if present[combination].all():
+                flags.extend(self.symptom_ids[i] for i in combination.tolist() if self.symptom_ids[i] not in flags)
+        return flags
+
+    def red_flag_rows(self, features: np.ndarray) -> np.ndarray:
+        """Boolean mask of the feature rows that contain a red flag"""
+        flagged = features[:, self.red_flags].any(axis=1)
+        for combination in self.red_flag_combinations:
+            flagged |= features[:, combination].all(axis=1)
+        return flagged
+
+    @staticmethod
+    def level(severity: str, burden: float) -> Tuple[str, str]:
+        """(triage level, message) from the disease severity, raised by a high symptom burden"""
+        level = SEVERITY_TRIAGE.get(severity, 'self_care')
+        for threshold, floor in BURDEN_THRESHOLDS:
+            if burden >= threshold:
+                if TRIAGE_LEVELS.index(floor) > TRIAGE_LEVELS.index(level):
+                    level = floor
+                break
+        return level, TRIAGE_MESSAGES[level]
@@ -89,8 +89,10 @@ async function callMLService<T>(endpoint: string, options?: RequestInit): Promis
 // Types
 interface MLPredictionResult {
   success: boolean;
-  disease: string;
-  confidence: number;
+  // null only when the service runs with ML_RED_FLAG_SHORTCUT=1 and red-flag
+  // symptoms short-circuit the model to an emergency triage
+  disease: string | null;
+  confidence: number | null;
   severity: "emergency" | "high" | "moderate" | "low";
   specialist: string;
   triage: { level: string; message: string };
@@ -101,8 +103,21 @@ interface MLPredictionResult {
   workout: string[];
   matched_symptoms: string[];
   invalid_symptoms: string[];
+  symptom_burden: number;
+  red_flags: string[];
+  differential?: MLDifferentialEntry[];
 }
 
+interface MLDifferentialEntry {
+  disease: string;
+  probability: number;
+  severity: "emergency" | "high" | "moderate" | "low";
+  specialist: string;
+}
+
+// Number of alternative conditions requested from the ML service in one /predict call
+const ML_DIFFERENTIAL_SIZE = 5;
+
 const BODY_LOCATIONS = [
   { id: "head", name: "Head & Face", icon: "🧠" },
   { id: "chest", name: "Chest & Heart", icon: "❤️" },
@@ -375,18 +390,14 @@ export const symptomCheckerRouter = router({
               symptoms: presentSymptoms,
               age: input.age,
               gender: input.sex,
+              top_k: ML_DIFFERENTIAL_SIZE,
             }),
           });
 
           return {
             source: "ml",
             question: null,
-            conditions: [{
-              id: result.disease.toLowerCase().replace(/\s+/g, "_"),
-              name: result.disease,
-              common_name: result.disease,
-              probability: result.confidence,
-            }],
+            conditions: toMLConditions(result),
             should_stop: true,
             extras: {
               triage_level: result.triage.level,
@@ -475,10 +486,14 @@ export const symptomCheckerRouter = router({
           return {
             source: "ml",
             triage_level: result.triage.level,
-            serious: result.severity === "emergency" || result.severity === "high"
-              ? [{ id: result.disease, name: result.disease }]
-              : [],
-            root_cause: { id: result.disease, name: result.disease, probability: result.confidence / 100 },
+            serious: result.disease === null
+              ? result.red_flags.map(id => ({ id, name: id.replace(/_/g, " ") }))
+              : result.severity === "emergency" || result.severity === "high"
+                ? [{ id: result.disease, name: result.disease }]
+                : [],
+            root_cause: result.disease === null
+              ? null
+              : { id: result.disease, name: result.disease, probability: (result.confidence ?? 0) / 100 },
             display: {
               level: result.triage.level,
               color: getTriageColor(result.triage.level),
@@ -724,17 +739,13 @@ export const symptomCheckerRouter = router({
               symptoms: presentSymptoms,
               age: input.age,
               gender: input.sex,
+              top_k: ML_DIFFERENTIAL_SIZE,
             }),
           });
 
           return {
             source: "ml",
-            conditions: [{
-              id: result.disease.toLowerCase().replace(/\s+/g, "_"),
-              name: result.disease,
-              common_name: result.disease,
-              probability: result.confidence,
-            }],
+            conditions: toMLConditions(result),
             question: null,
             should_stop: true,
             triage: {
@@ -865,6 +876,19 @@ export const symptomCheckerRouter = router({
 });
 
 // Helper functions
+function toMLConditions(result: MLPredictionResult) {
+  if (result.disease === null) return [];
+  const entries = result.differential?.length
+    ? result.differential
+    : [{ disease: result.disease, probability: result.confidence ?? 0, severity: result.severity, specialist: result.specialist }];
+  return entries.map(entry => ({
+    id: entry.disease.toLowerCase().replace(/\s+/g, "_"),
+    name: entry.disease,
+    common_name: entry.disease,
+    probability: entry.probability,
+  }));
+}
+
 function getTriageRecommendation(level: string): string {
   const recommendations: Record<string, string> = {
     emergency: "Call emergency services (999) immediately. This may be a life-threatening condition.",